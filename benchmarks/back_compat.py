@@ -0,0 +1,37 @@
+"""Benchmarks for reading the files written with earlier ndx-pose versions in src/pynwb/tests/back_compat."""
+
+import warnings
+from pathlib import Path
+
+from pynwb import NWBHDF5IO
+
+BACK_COMPAT_DIR = Path(__file__).parent.parent / "src" / "pynwb" / "tests" / "back_compat"
+
+
+def read_back_compat_file(file_name):
+    """Read a back-compat file and the data of its PoseEstimation objects.
+
+    Files that an ndx-pose version can no longer read, e.g., a PoseEstimation object that links two cameras, raise;
+    the benchmark then measures the time to raise.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # warnings about cached namespaces and deprecated fields
+        with NWBHDF5IO(str(BACK_COMPAT_DIR / file_name), mode="r") as io:
+            try:
+                nwbfile = io.read()
+            except ValueError:
+                return
+            for pose_estimation in nwbfile.processing["behavior"].data_interfaces.values():
+                for series in getattr(pose_estimation, "pose_estimation_series", dict()).values():
+                    series.data[:]
+
+
+class BackCompatReadSuite:
+    params = sorted(path.name for path in BACK_COMPAT_DIR.glob("*.nwb"))
+    param_names = ["file_name"]
+
+    def time_read(self, file_name):
+        read_back_compat_file(file_name)
+
+    def peakmem_read(self, file_name):
+        read_back_compat_file(file_name)
@@ -0,0 +1,115 @@
+"""Helpers shared by the benchmarks: synthetic pose data, NWBFile construction, and cached input files.
+
+asv measures peak memory as the peak resident set size of the process that runs the benchmark, which also runs the
+``setup`` method. The helpers therefore never hold a whole synthetic dataset in memory: series data is generated on
+the fly, in blocks, while it is written, and input files for the read benchmarks are written once per asv run into
+the directory returned by ``setup_cache``.
+"""
+
+import datetime
+import os
+
+import numpy as np
+from hdmf.data_utils import GenericDataChunkIterator
+from pynwb import NWBHDF5IO, NWBFile
+
+from ndx_pose import PoseEstimation, PoseEstimationSeries, Skeleton, Skeletons
+
+RATE = 30.0
+
+# The largest num_nodes * num_frames of a PoseEstimation benchmark. Larger parameter combinations are skipped. The
+# default keeps the largest input file at about 1.2 GB. Set NDX_POSE_BENCHMARK_MAX_NODE_FRAMES to, e.g., 1e9 to run
+# all combinations on a machine with enough disk space.
+MAX_NODE_FRAMES = int(float(os.environ.get("NDX_POSE_BENCHMARK_MAX_NODE_FRAMES", 1e8)))
+
+
+class SyntheticSeriesIterator(GenericDataChunkIterator):
+    """Generate the (num_frames, num_dims) positions or (num_frames,) confidence values of one node in blocks.
+
+    The values are a smooth function of the frame index, so that compression behaves roughly as on real pose data.
+    """
+
+    def __init__(self, num_frames, num_dims=None, seed=0, **kwargs):
+        self.num_frames = num_frames
+        self.num_dims = num_dims
+        self.seed = seed
+        kwargs.setdefault("buffer_gb", 0.05)
+        super().__init__(**kwargs)
+
+    def _get_data(self, selection):
+        frames = np.arange(self.num_frames)[selection[0]].astype(np.float32)
+        phase = np.float32(self.seed)
+        if self.num_dims is None:
+            return 0.5 + 0.5 * np.sin(frames / 50.0 + phase)
+        dims = np.arange(self.num_dims, dtype=np.float32)[selection[1]]
+        return 320.0 + 100.0 * np.sin(frames[:, np.newaxis] / (20.0 + dims) + phase)
+
+    def _get_maxshape(self):
+        return (self.num_frames,) if self.num_dims is None else (self.num_frames, self.num_dims)
+
+    def _get_dtype(self):
+        return np.dtype(np.float32)
+
+
+def create_nwbfile():
+    return NWBFile(
+        session_description="ndx-pose benchmark",
+        identifier="ndx-pose-benchmark",
+        session_start_time=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+
+
+def create_skeleton(num_nodes, name="subject"):
+    nodes = ["node%d" % i for i in range(num_nodes)]
+    # edges are stored as uint8, so they can connect only the first 256 nodes
+    edges = np.array([[i, i + 1] for i in range(min(num_nodes, 256) - 1)], dtype=np.uint8).reshape((-1, 2))
+    return Skeleton(name=name, nodes=nodes, edges=edges)
+
+
+def create_pose_estimation(skeleton, num_frames, num_dims=2, name="PoseEstimation", device=None):
+    """Create a PoseEstimation object whose series generate their data while they are written."""
+    pose_estimation_series = [
+        PoseEstimationSeries(
+            name=node,
+            data=SyntheticSeriesIterator(num_frames, num_dims, seed=i),
+            confidence=SyntheticSeriesIterator(num_frames, seed=i),
+            unit="pixels" if num_dims == 2 else "mm",
+            reference_frame="(0,0) corresponds to the top-left corner of the video frame.",
+            rate=RATE,
+        )
+        for i, node in enumerate(skeleton.nodes)
+    ]
+    return PoseEstimation(
+        name=name,
+        pose_estimation_series=pose_estimation_series,
+        description="Synthetic pose estimates.",
+        skeleton=skeleton,
+        device=device,
+    )
+
+
+def write_pose_estimation_file(path, num_nodes, num_frames):
+    nwbfile = create_nwbfile()
+    skeleton = create_skeleton(num_nodes)
+    behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+    behavior_pm.add(Skeletons(skeletons=[skeleton]))
+    behavior_pm.add(create_pose_estimation(skeleton, num_frames))
+    write_nwbfile(path, nwbfile)
+
+
+def write_nwbfile(path, nwbfile):
+    with NWBHDF5IO(path, mode="w") as io:
+        io.write(nwbfile)
+
+
+def get_input_file(cache_dir, name, write_file, *args):
+    """Get the path of an input file in the asv cache directory, writing it with write_file(path, *args) if needed.
+
+    The file is written to a temporary path and renamed, so that an interrupted run does not leave a partial file.
+    """
+    path = os.path.join(cache_dir, name)
+    if not os.path.exists(path):
+        temp_path = os.path.join(cache_dir, "partial_" + name)
+        write_file(temp_path, *args)
+        os.replace(temp_path, path)
+    return path
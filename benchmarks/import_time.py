@@ -0,0 +1,7 @@
+"""Benchmarks for the time to import ndx_pose in a new interpreter."""
+
+
+class ImportSuite:
+    def timeraw_import(self):
+        """Import ndx_pose, which loads the ndx-pose namespace from the YAML files."""
+        return "import ndx_pose", "import pynwb"
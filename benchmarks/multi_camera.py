@@ -0,0 +1,108 @@
+"""Benchmarks for writing and reading MultiCameraPoseEstimation objects with many cameras."""
+
+import os
+import tempfile
+
+import numpy as np
+from pynwb import NWBHDF5IO
+
+from ndx_pose import CalibratedCamera, MultiCameraPoseEstimation, PoseEstimationSeries, Skeletons
+
+from .common import (
+    RATE,
+    SyntheticSeriesIterator,
+    create_nwbfile,
+    create_pose_estimation,
+    create_skeleton,
+    get_input_file,
+    write_nwbfile,
+)
+
+NUM_NODES = 20
+NUM_FRAMES = 10**5
+
+
+def write_multi_camera_file(path, num_cameras):
+    """Write a MultiCameraPoseEstimation with 3D series and one 2D PoseEstimation per CalibratedCamera."""
+    nwbfile = create_nwbfile()
+    skeleton = create_skeleton(NUM_NODES)
+    pose_estimations = []
+    for i in range(num_cameras):
+        camera = CalibratedCamera(
+            name="camera%d" % i,
+            intrinsic_matrix=np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]], dtype=np.float32),
+            rotation_matrix=np.eye(3, dtype=np.float32),
+            translation_vector=np.array([i * 100.0, 0.0, 1000.0], dtype=np.float32),
+            distortion_coefficients=np.zeros(5, dtype=np.float32),
+        )
+        nwbfile.add_device(camera)
+        pose_estimations.append(
+            create_pose_estimation(skeleton, NUM_FRAMES, name="PoseEstimation_camera%d" % i, device=camera)
+        )
+    pose_estimation_series = [
+        PoseEstimationSeries(
+            name=node,
+            data=SyntheticSeriesIterator(NUM_FRAMES, 3, seed=i),
+            confidence=SyntheticSeriesIterator(NUM_FRAMES, seed=i),
+            unit="mm",
+            reference_frame="(0,0,0) is the midpoint of the camera rig.",
+            rate=RATE,
+        )
+        for i, node in enumerate(skeleton.nodes)
+    ]
+    behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+    behavior_pm.add(Skeletons(skeletons=[skeleton]))
+    behavior_pm.add(
+        MultiCameraPoseEstimation(
+            name="MultiCameraPoseEstimation",
+            pose_estimation_series=pose_estimation_series,
+            pose_estimations=pose_estimations,
+            description="Synthetic 3D pose estimates.",
+            skeleton=skeleton,
+        )
+    )
+    write_nwbfile(path, nwbfile)
+
+
+class MultiCameraPoseEstimationSuite:
+    params = [2, 4, 8, 16]
+    param_names = ["num_cameras"]
+    timeout = 1800
+
+    def setup_cache(self):
+        return os.path.abspath(".")
+
+    def setup(self, cache_dir, num_cameras):
+        self.read_path = get_input_file(
+            cache_dir, "multi_camera_%d_cameras.nwb" % num_cameras, write_multi_camera_file, num_cameras
+        )
+        self.write_dir = tempfile.TemporaryDirectory()
+        self.write_path = os.path.join(self.write_dir.name, "multi_camera.nwb")
+
+    def teardown(self, cache_dir, num_cameras):
+        self.write_dir.cleanup()
+
+    def time_write(self, cache_dir, num_cameras):
+        write_multi_camera_file(self.write_path, num_cameras)
+
+    def peakmem_write(self, cache_dir, num_cameras):
+        write_multi_camera_file(self.write_path, num_cameras)
+
+    def time_open(self, cache_dir, num_cameras):
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            io.read().processing["behavior"]["MultiCameraPoseEstimation"]
+
+    def _read_all(self):
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            mcpe = io.read().processing["behavior"]["MultiCameraPoseEstimation"]
+            for series in mcpe.pose_estimation_series.values():
+                series.data[:]
+            for pose_estimation in mcpe.pose_estimations.values():
+                pose_estimation.get_stacked_view().data[:]
+
+    def time_read_all(self, cache_dir, num_cameras):
+        """Read the 3D series and the 2D series of every camera view."""
+        self._read_all()
+
+    def peakmem_read_all(self, cache_dir, num_cameras):
+        self._read_all()
@@ -0,0 +1,76 @@
+"""Benchmarks for writing and reading PoseEstimation objects with many nodes and long recordings."""
+
+import os
+import tempfile
+
+from pynwb import NWBHDF5IO
+
+from .common import MAX_NODE_FRAMES, RATE, get_input_file, write_pose_estimation_file
+
+
+class PoseEstimationSuite:
+    params = ([10, 100, 500], [10**4, 10**6, 10**8])
+    param_names = ["num_nodes", "num_frames"]
+    timeout = 3600
+
+    def setup_cache(self):
+        return os.path.abspath(".")
+
+    def setup(self, cache_dir, num_nodes, num_frames):
+        if num_nodes * num_frames > MAX_NODE_FRAMES:
+            raise NotImplementedError("Skipped: num_nodes * num_frames > %d." % MAX_NODE_FRAMES)
+        self.read_path = get_input_file(
+            cache_dir,
+            "pose_estimation_%d_nodes_%d_frames.nwb" % (num_nodes, num_frames),
+            write_pose_estimation_file,
+            num_nodes,
+            num_frames,
+        )
+        self.write_dir = tempfile.TemporaryDirectory()
+        self.write_path = os.path.join(self.write_dir.name, "pose_estimation.nwb")
+        # read the middle 10 seconds of the recording
+        self.window = (num_frames / RATE / 2, num_frames / RATE / 2 + 10.0)
+
+    def teardown(self, cache_dir, num_nodes, num_frames):
+        self.write_dir.cleanup()
+
+    def time_write(self, cache_dir, num_nodes, num_frames):
+        write_pose_estimation_file(self.write_path, num_nodes, num_frames)
+
+    def peakmem_write(self, cache_dir, num_nodes, num_frames):
+        write_pose_estimation_file(self.write_path, num_nodes, num_frames)
+
+    def time_open(self, cache_dir, num_nodes, num_frames):
+        """Open the file and construct the PoseEstimation object without reading series data."""
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            io.read().processing["behavior"]["PoseEstimation"]
+
+    def _read_all(self):
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            view = io.read().processing["behavior"]["PoseEstimation"].get_stacked_view()
+            view.data[:]
+            view.confidence[:]
+
+    def time_read_all(self, cache_dir, num_nodes, num_frames):
+        self._read_all()
+
+    def peakmem_read_all(self, cache_dir, num_nodes, num_frames):
+        self._read_all()
+
+    def time_read_window(self, cache_dir, num_nodes, num_frames):
+        """Read 10 seconds of all nodes from the middle of the recording."""
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            io.read().processing["behavior"]["PoseEstimation"].get_time_slice(*self.window)
+
+    def _iter_chunks(self):
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            view = io.read().processing["behavior"]["PoseEstimation"].get_stacked_view()
+            for _ in view.data.iter_chunks(65536):
+                pass
+
+    def time_iter_chunks(self, cache_dir, num_nodes, num_frames):
+        """Read all nodes in blocks of frames, as a streaming analysis would."""
+        self._iter_chunks()
+
+    def peakmem_iter_chunks(self, cache_dir, num_nodes, num_frames):
+        self._iter_chunks()
@@ -0,0 +1,147 @@
+"""Benchmarks for building, writing, and reading PoseTraining objects with many TrainingFrame objects."""
+
+import os
+import tempfile
+
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.image import ImageSeries
+
+from ndx_pose import (
+    PoseTraining,
+    SkeletonInstance,
+    SkeletonInstances,
+    Skeletons,
+    SourceVideos,
+    TrainingFrame,
+    TrainingFrames,
+)
+from ndx_pose.io import lazy_pose_training
+
+from .common import create_nwbfile, create_skeleton, get_input_file, write_nwbfile
+
+NUM_NODES = 10
+INSTANCES_PER_FRAME = 2
+NUM_SAMPLED_FRAMES = 256
+
+
+def create_pose_training(skeleton, num_training_frames):
+    """Create a PoseTraining object with one SkeletonInstance per animal in each TrainingFrame."""
+    source_video = ImageSeries(
+        name="source_video",
+        description="Video used for training.",
+        unit="NA",
+        format="external",
+        external_file=["camera1.mp4"],
+        starting_frame=[0],
+        rate=30.0,
+        num_samples=num_training_frames * 10,
+    )
+    rng = np.random.default_rng(0)
+    training_frames = []
+    for i in range(num_training_frames):
+        skeleton_instances = [
+            SkeletonInstance(
+                name="instance_%d" % j,
+                id=np.uint8(j),
+                node_locations=rng.random((len(skeleton.nodes), 2)) * 640.0,
+                node_visibility=np.ones(len(skeleton.nodes), dtype=bool),
+                skeleton=skeleton,
+            )
+            for j in range(INSTANCES_PER_FRAME)
+        ]
+        training_frames.append(
+            TrainingFrame(
+                name="frame_%d" % i,
+                annotator="annotator",
+                skeleton_instances=SkeletonInstances(skeleton_instances=skeleton_instances),
+                source_video=source_video,
+                source_video_frame_index=np.uint64(i * 10),
+            )
+        )
+    return PoseTraining(
+        training_frames=TrainingFrames(training_frames=training_frames),
+        source_videos=SourceVideos(image_series=[source_video]),
+    )
+
+
+def write_pose_training_file(path, num_training_frames):
+    nwbfile = create_nwbfile()
+    skeleton = create_skeleton(NUM_NODES)
+    behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+    behavior_pm.add(Skeletons(skeletons=[skeleton]))
+    behavior_pm.add(create_pose_training(skeleton, num_training_frames))
+    write_nwbfile(path, nwbfile)
+
+
+class PoseTrainingSuite:
+    params = [10**3, 10**4, 10**5]
+    param_names = ["num_training_frames"]
+    timeout = 7200
+
+    def setup_cache(self):
+        return os.path.abspath(".")
+
+    def setup(self, cache_dir, num_training_frames):
+        self.read_path = get_input_file(
+            cache_dir,
+            "pose_training_%d_frames.nwb" % num_training_frames,
+            write_pose_training_file,
+            num_training_frames,
+        )
+        self.write_dir = tempfile.TemporaryDirectory()
+        self.write_path = os.path.join(self.write_dir.name, "pose_training.nwb")
+
+    def teardown(self, cache_dir, num_training_frames):
+        self.write_dir.cleanup()
+
+    def time_build(self, cache_dir, num_training_frames):
+        """Create the TrainingFrame and SkeletonInstance objects without writing them."""
+        create_pose_training(create_skeleton(NUM_NODES), num_training_frames)
+
+    def time_write(self, cache_dir, num_training_frames):
+        write_pose_training_file(self.write_path, num_training_frames)
+
+    def peakmem_write(self, cache_dir, num_training_frames):
+        write_pose_training_file(self.write_path, num_training_frames)
+
+    def time_open(self, cache_dir, num_training_frames):
+        """Open the file and construct all TrainingFrame and SkeletonInstance objects."""
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            io.read().processing["behavior"]["PoseTraining"]
+
+    def _read_all(self):
+        with NWBHDF5IO(self.read_path, mode="r") as io:
+            pose_training = io.read().processing["behavior"]["PoseTraining"]
+            for training_frame in pose_training.training_frames.training_frames.values():
+                for instance in training_frame.skeleton_instances.skeleton_instances.values():
+                    instance.node_locations[:]
+
+    def time_read_all(self, cache_dir, num_training_frames):
+        """Read the node locations of all SkeletonInstance objects."""
+        self._read_all()
+
+    def peakmem_read_all(self, cache_dir, num_training_frames):
+        self._read_all()
+
+    def time_open_lazy(self, cache_dir, num_training_frames):
+        """Open the file without constructing the TrainingFrame and SkeletonInstance objects."""
+        with NWBHDF5IO(self.read_path, mode="r") as io, lazy_pose_training():
+            io.read().processing["behavior"]["PoseTraining"]
+
+    def _read_sample_lazy(self):
+        with NWBHDF5IO(self.read_path, mode="r") as io, lazy_pose_training():
+            pose_training = io.read().processing["behavior"]["PoseTraining"]
+            training_frames = pose_training.training_frames.training_frames
+            rng = np.random.default_rng(0)
+            for i in rng.choice(len(training_frames), NUM_SAMPLED_FRAMES, replace=False):
+                training_frame = training_frames["frame_%d" % i]
+                for instance in training_frame.skeleton_instances.skeleton_instances.values():
+                    instance.node_locations[:]
+
+    def time_read_sample_lazy(self, cache_dir, num_training_frames):
+        """Read the node locations of a random sample of TrainingFrame objects, constructing only those."""
+        self._read_sample_lazy()
+
+    def peakmem_read_sample_lazy(self, cache_dir, num_training_frames):
+        self._read_sample_lazy()
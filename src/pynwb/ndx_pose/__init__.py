@@ -26,6 +26,8 @@ from .pose import (
     TrainingFrames,
     SkeletonInstance,
     SkeletonInstances,
+    SkeletonInstancesTable,
+    TrainingFramesTable,
     SourceVideos,
     PoseTraining,
 )
@@ -41,6 +43,8 @@ __all__ = [
     "TrainingFrames",
     "SkeletonInstance",
     "SkeletonInstances",
+    "SkeletonInstancesTable",
+    "TrainingFramesTable",
     "SourceVideos",
     "PoseTraining",
 ]
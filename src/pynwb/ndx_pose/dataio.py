@@ -0,0 +1,334 @@
+"""Storage settings for the datasets of PoseEstimationSeries objects: named presets for HDF5 chunking and compression,
+and reduced-precision storage of positions and confidence values."""
+
+from typing import Optional
+
+import h5py
+import numpy as np
+from hdmf.backends.hdf5.h5_utils import H5DataIO
+from hdmf.data_utils import AbstractDataChunkIterator, DataChunk, DataIO, GenericDataChunkIterator
+from hdmf.query import HDMFDataset
+from hdmf.utils import get_data_shape
+from pynwb import TimeSeries
+
+DATASET_IO_PRESETS = {
+    # large chunks for reading full sessions front to back, gzip with shuffle for a good compression ratio
+    "sequential-scan": dict(chunk_frames=32768, compression="gzip", compression_opts=4, shuffle=True),
+    # small chunks so that a short time window touches few chunks, the fastest gzip level to decompress them quickly
+    "random-window": dict(chunk_frames=1024, compression="gzip", compression_opts=1, shuffle=True),
+    # the largest chunks and the strongest gzip level, for files that are written once and rarely read
+    "archive": dict(chunk_frames=131072, compression="gzip", compression_opts=9, shuffle=True),
+}
+
+# the datasets of a PoseEstimationSeries that are chunked along time
+SERIES_DATASETS = ("data", "confidence", "timestamps")
+
+# settings passed through to h5py.Group.create_dataset that the H5DataIO constructor does not accept
+EXTRA_IO_SETTINGS = ("scaleoffset",)
+
+# number of frames read at a time when a dataset read from an HDF5 file is rewritten
+BUFFER_FRAMES = 65536
+
+# the value that replaces missing (NaN) positions in a 'data' dataset stored with the HDF5 scale-offset filter, which
+# does not preserve NaN values. It is the HDF5 fill value of the dataset, for which the filter reserves a code, so it
+# does not widen the range of the stored values. Positions equal to it are decoded as NaN on read.
+MISSING_POSITION = float(np.finfo(np.float32).max)
+
+# the integer types of quantized confidence values. The largest value of the type marks a missing (NaN) confidence
+# value, and the other values are multiplied by the 'scale' attribute of the dataset on read.
+CONFIDENCE_DTYPES = ("uint8", "uint16")
+
+
+def get_dataset_io_kwargs(preset: str, shape: tuple, resizable: bool = False) -> dict:
+    """Get the H5DataIO keyword arguments of a named preset for a dataset with the given shape.
+
+    Chunks span 'chunk_frames' frames of the preset and the full extent of the other dimensions. The chunk length is
+    reduced to the number of frames of a fixed-size dataset with fewer frames, so small datasets are stored in one
+    chunk.
+    """
+    if preset not in DATASET_IO_PRESETS:
+        raise ValueError("Unknown dataset I/O preset '%s'. Available presets: %s." % (preset, list(DATASET_IO_PRESETS)))
+    settings = dict(DATASET_IO_PRESETS[preset])
+    chunk_frames = settings.pop("chunk_frames")
+    num_frames = shape[0]
+    if not resizable and num_frames is not None:
+        chunk_frames = max(min(chunk_frames, num_frames), 1)
+    settings["chunks"] = (chunk_frames,) + tuple(shape[1:])
+    return {key: value for key, value in settings.items() if value is not None}
+
+
+def make_h5dataio(data, **kwargs) -> H5DataIO:
+    """Create an H5DataIO object, including the settings in EXTRA_IO_SETTINGS that its constructor does not accept."""
+    extra_io_settings = {key: kwargs.pop(key) for key in EXTRA_IO_SETTINGS if key in kwargs}
+    dataio = H5DataIO(data=data, **kwargs)
+    dataio.io_settings.update({key: value for key, value in extra_io_settings.items() if value is not None})
+    return dataio
+
+
+def wrap_dataset(value, dataset_io_kwargs: dict, dtype: Optional[np.dtype] = None, encode=None):
+    """Wrap an array in an H5DataIO with the given settings, merging them into the settings of an existing H5DataIO.
+
+    If 'encode' is given, the values are passed through it, e.g., to replace NaN values, and it must return values of
+    type 'dtype'. Otherwise, if 'dtype' is given, the values are converted to it. A dataset read from an HDF5 file is
+    wrapped in a data chunk iterator so that it is rewritten, e.g., on export, with the new settings instead of being
+    linked or copied as is. Datasets and data chunk iterators are converted one buffer at a time.
+    """
+    if encode is None and dtype is not None:
+
+        def encode(values):
+            return np.asarray(values, dtype=dtype)
+
+    kwargs = dict()
+    if isinstance(value, DecodedArray):  # stored with reduced precision before, so the decoded values are re-encoded
+        if isinstance(value.stored, AbstractDataChunkIterator):
+            raise ValueError("Values that are stored with reduced precision from a data chunk iterator cannot be read.")
+        if isinstance(value.dataset, H5DataIO):
+            kwargs.update(value.dataset.io_settings)
+        for key in value.io_settings:
+            kwargs.pop(key, None)
+        if not isinstance(value.stored, h5py.Dataset):
+            value = value[()]
+    elif isinstance(value, DataIO):
+        if isinstance(value, H5DataIO):
+            kwargs.update(value.io_settings)
+        if value.data is None:  # an empty dataset to be filled in after writing
+            kwargs["dtype"] = value.dtype if dtype is None else dtype
+            kwargs.setdefault("shape", value.shape)
+        value = value.data
+    kwargs.update(dataset_io_kwargs)
+    if isinstance(value, (h5py.Dataset, DecodedArray)):
+        value = LazyArrayDataChunkIterator(value, chunk_size=kwargs.get("chunks", (BUFFER_FRAMES,))[0])
+    if encode is not None and isinstance(value, AbstractDataChunkIterator):
+        value = MappedDataChunkIterator(value, encode, dtype=value.dtype if dtype is None else dtype)
+    elif encode is not None and value is not None:
+        value = encode(value)
+    return make_h5dataio(value, **kwargs)
+
+
+class DecodedArray(HDMFDataset):
+    """Lazy floating point view of a 'data' or 'confidence' dataset stored with reduced precision.
+
+    'dataset' holds the stored values, e.g., an h5py Dataset read from a file or an H5DataIO to be written. Stored
+    values equal to 'missing_value' are decoded as NaN, and the other values are multiplied by 'scale', if given.
+    'scaleoffset' is the number of decimals of the HDF5 scale-offset filter of the dataset, if any.
+    """
+
+    def __init__(self, dataset, dtype, missing_value, scale=None, scaleoffset=None):
+        # not the HDMFDataset constructor, which does not accept the H5DataIO objects of datasets to be written
+        self.__dataset = dataset
+        self.__dtype = np.dtype(dtype)
+        self.missing_value = missing_value
+        self.scale = scale
+        self.scaleoffset = scaleoffset
+
+    @property
+    def dataset(self):
+        return self.__dataset
+
+    @property
+    def stored(self):
+        """The array, dataset, or data chunk iterator of the stored values."""
+        return self.__dataset.data if isinstance(self.__dataset, DataIO) else self.__dataset
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def shape(self):
+        return tuple(get_data_shape(self.__dataset))
+
+    @property
+    def io_settings(self):
+        """The H5DataIO settings that the stored values must be written with to be decoded correctly."""
+        return dict(fillvalue=self.missing_value, scaleoffset=self.scaleoffset)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __iter__(self):
+        return iter(self[()])
+
+    def __getitem__(self, key):
+        stored = np.asarray(self.stored[key])
+        values = stored.astype(self.__dtype)
+        if self.scale is not None:
+            values *= self.scale
+        values[stored == self.missing_value] = np.nan
+        return values
+
+    def __array__(self, dtype=None, copy=None):
+        return self[()] if dtype is None else self[()].astype(dtype)
+
+    def with_dataset_io(self, dataset_io_kwargs: dict):
+        """Get a DecodedArray of the same stored values, to be written with the given H5DataIO settings."""
+        dataset = wrap_dataset(self.dataset, dict(dataset_io_kwargs, **self.io_settings))
+        return DecodedArray(dataset, self.dtype, self.missing_value, scale=self.scale, scaleoffset=self.scaleoffset)
+
+
+def apply_dataset_io_preset(series, preset: str):
+    """Wrap the 'data', 'confidence', and 'timestamps' of a PoseEstimationSeries in H5DataIO objects with a preset.
+
+    Timestamps that link to the timestamps of another series are left as links. Datasets stored with reduced precision
+    keep their encoding.
+    """
+    for field in SERIES_DATASETS:
+        value = series.fields.get(field)
+        if value is None or isinstance(value, TimeSeries):
+            continue  # not set, or a link to another TimeSeries
+        if isinstance(value, DataIO):
+            shape = value.shape if value.data is None else get_data_shape(value.data)
+            maxshape = value.io_settings.get("maxshape") if isinstance(value, H5DataIO) else None
+        else:
+            shape = get_data_shape(value)
+            maxshape = getattr(value, "maxshape", None)
+        resizable = maxshape is not None and maxshape[0] is None
+        dataset_io_kwargs = get_dataset_io_kwargs(preset, shape, resizable=resizable)
+        if isinstance(value, DecodedArray):
+            series.fields[field] = value.with_dataset_io(dataset_io_kwargs)
+        else:
+            series.fields[field] = wrap_dataset(value, dataset_io_kwargs)
+    series.set_modified()  # so that the series is rebuilt with the new settings on export
+
+
+def encode_positions(values, dtype) -> np.ndarray:
+    """Convert positions to the floating point type 'dtype', replacing NaN values with MISSING_POSITION."""
+    values = np.array(values, dtype=dtype)
+    values[np.isnan(values)] = MISSING_POSITION
+    return values
+
+
+def get_confidence_scale(dtype) -> float:
+    """Get the scale of confidence values in [0, 1] quantized to the integer type 'dtype'."""
+    return 1.0 / (np.iinfo(dtype).max - 1)  # the largest value of the type marks missing values
+
+
+def encode_confidence(values, dtype) -> np.ndarray:
+    """Quantize confidence values in [0, 1] to the integer type 'dtype', with NaN values set to its largest value."""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    if np.any(values[~missing] < 0) or np.any(values[~missing] > 1):
+        raise ValueError("Confidence values must be between 0 and 1 to be stored as %s." % np.dtype(dtype))
+    codes = np.rint(np.where(missing, 0.0, values) / get_confidence_scale(dtype)).astype(dtype)
+    codes[missing] = np.iinfo(dtype).max
+    return codes
+
+
+def _check_not_empty(series, field, value):
+    """Check that a dataset has values to encode, i.e., that it is not an empty dataset to be appended to."""
+    if isinstance(value, DataIO) and value.data is None:
+        raise ValueError(
+            "Cannot encode the '%s' of PoseEstimationSeries '%s' with reduced precision because it is an empty dataset "
+            "to be appended to after writing." % (field, series.name)
+        )
+    return value
+
+
+def apply_storage_precision(
+    series, dtype: str = "float32", data_decimals: Optional[int] = None, confidence_dtype: Optional[str] = None
+):
+    """Store the 'data' and 'confidence' of a PoseEstimationSeries with reduced precision.
+
+    'data' is stored with the floating point type 'dtype'. If 'data_decimals' is given, it is also stored with the
+    HDF5 scale-offset filter, which quantizes each value to that many decimal places, with an error of less than
+    10**-decimals, and stores it as an integer with the minimum number of bits needed for the values of each chunk.
+    Missing (NaN) positions are stored as the fill value MISSING_POSITION, for which the filter reserves a code.
+
+    'confidence' is stored with the floating point type 'dtype' or, if 'confidence_dtype' is "uint8" or "uint16",
+    quantized to that integer type, with the scale in the 'scale' attribute of the dataset and the largest value of
+    the type marking missing (NaN) values.
+
+    Encoded datasets are wrapped in DecodedArray objects, which read as floats with NaN values, before writing and
+    after reading the file again.
+    """
+    if dtype not in ("float32", "float64"):
+        raise ValueError("'dtype' must be 'float32' or 'float64', got '%s'." % dtype)
+    if data_decimals is not None and (not isinstance(data_decimals, (int, np.integer)) or data_decimals < 0):
+        raise ValueError("'data_decimals' must be a non-negative integer, got %s." % data_decimals)
+    if confidence_dtype is not None and confidence_dtype not in CONFIDENCE_DTYPES:
+        raise ValueError("'confidence_dtype' must be 'uint8' or 'uint16', got '%s'." % confidence_dtype)
+
+    data = series.fields.get("data")
+    if data is not None and not isinstance(data, TimeSeries):
+        if data_decimals is None:
+            series.fields["data"] = wrap_dataset(data, dict(), dtype=np.dtype(dtype))
+        else:
+            stored = wrap_dataset(
+                _check_not_empty(series, "data", data),
+                dict(fillvalue=MISSING_POSITION, scaleoffset=int(data_decimals)),
+                dtype=np.dtype(dtype),
+                encode=lambda values: encode_positions(values, dtype),
+            )
+            series.fields["data"] = DecodedArray(stored, dtype, MISSING_POSITION, scaleoffset=int(data_decimals))
+
+    confidence = series.fields.get("confidence")
+    if confidence is not None:
+        if confidence_dtype is None:
+            series.fields["confidence"] = wrap_dataset(confidence, dict(), dtype=np.dtype(dtype))
+        else:
+            missing_value = np.iinfo(confidence_dtype).max
+            stored = wrap_dataset(
+                _check_not_empty(series, "confidence", confidence),
+                dict(fillvalue=missing_value),
+                dtype=np.dtype(confidence_dtype),
+                encode=lambda values: encode_confidence(values, confidence_dtype),
+            )
+            series.fields["confidence"] = DecodedArray(
+                stored, dtype, missing_value, scale=get_confidence_scale(confidence_dtype)
+            )
+    series.set_modified()  # so that the series is rebuilt with the new settings on export
+
+
+class MappedDataChunkIterator(AbstractDataChunkIterator):
+    """Data chunk iterator that applies a function to the values of each chunk of another data chunk iterator."""
+
+    def __init__(self, iterator, func, dtype):
+        self.iterator = iterator
+        self.func = func
+        self._dtype = np.dtype(dtype)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = next(self.iterator)
+        return DataChunk(data=self.func(chunk.data), selection=chunk.selection)
+
+    def recommended_chunk_shape(self):
+        return self.iterator.recommended_chunk_shape()
+
+    def recommended_data_shape(self):
+        return self.iterator.recommended_data_shape()
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def maxshape(self):
+        return self.iterator.maxshape
+
+
+class LazyArrayDataChunkIterator(GenericDataChunkIterator):
+    """Data chunk iterator that writes a lazy array view to a dataset one buffer of frames at a time.
+
+    'array' is any object with 'shape', 'dtype', and numpy-style indexing, such as the lazy views of ndx_pose, which
+    compute only the frames they are indexed with. Buffers and chunks span at most 'chunk_size' frames and the full
+    extent of the other dimensions.
+    """
+
+    def __init__(self, array, chunk_size=BUFFER_FRAMES, **kwargs):
+        self._array = array
+        num_frames = max(min(chunk_size, len(array)), 1)
+        kwargs.setdefault("buffer_shape", (num_frames,) + tuple(array.shape[1:]))
+        kwargs.setdefault("chunk_shape", (num_frames,) + tuple(array.shape[1:]))
+        super().__init__(**kwargs)
+
+    def _get_data(self, selection):
+        return self._array[selection]
+
+    def _get_maxshape(self):
+        return tuple(self._array.shape)
+
+    def _get_dtype(self):
+        return self._array.dtype
@@ -0,0 +1,129 @@
+"""Graph indexes over the nodes and edges of a Skeleton: node lookup, adjacency, components, and traversal order."""
+
+import numpy as np
+
+
+def validate_skeleton(nodes, edges):
+    """Check the nodes and edges of a Skeleton and return the edges as an (num_edges, 2) array of node indices.
+
+    Raises a ValueError if node names are not unique, if the edges do not have shape (num_edges, 2), or if an edge
+    refers to a node index that does not exist or connects a node to itself. All edges are checked at once.
+    """
+    nodes = [str(node) for node in nodes]
+    if len(set(nodes)) != len(nodes):
+        unique_nodes, counts = np.unique(nodes, return_counts=True)
+        duplicates = unique_nodes[counts > 1].tolist()
+        raise ValueError("Skeleton nodes must be unique, but these nodes appear more than once: %s" % duplicates)
+    if edges is None:
+        return np.zeros((0, 2), dtype=np.intp)
+    edges = np.asarray(edges)
+    if edges.size == 0:
+        return np.zeros((0, 2), dtype=np.intp)
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError("Skeleton edges must have shape (num_edges, 2), but have shape %s." % (edges.shape,))
+    if not np.issubdtype(edges.dtype, np.integer):
+        raise ValueError("Skeleton edges must be integer node indices, but have dtype %s." % edges.dtype)
+    bad_edges = np.flatnonzero(((edges < 0) | (edges >= len(nodes))).any(axis=1))
+    if len(bad_edges):
+        raise ValueError(
+            "Skeleton edges must refer to node indices between 0 and %d, but edges %s do not: %s"
+            % (len(nodes) - 1, bad_edges.tolist(), edges[bad_edges].tolist())
+        )
+    self_loops = np.flatnonzero(edges[:, 0] == edges[:, 1])
+    if len(self_loops):
+        raise ValueError(
+            "Skeleton edges must connect two different nodes, but edges %s connect a node to itself."
+            % self_loops.tolist()
+        )
+    return edges.astype(np.intp)
+
+
+def _concatenate_ranges(starts, stops):
+    """Get the concatenation of np.arange(start, stop) for each pair of 'starts' and 'stops'."""
+    counts = stops - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(counts.sum()) + offsets
+
+
+class SkeletonGraph:
+    """Indexes over the graph of the nodes and edges of a Skeleton.
+
+    Edges are treated as undirected. The indexes are computed once, with one vectorized pass per index (or per level
+    of the graph), and hold:
+
+    - 'node_index': a dict from node name to node index
+    - 'indptr' and 'indices': the adjacency of the nodes in compressed sparse row (CSR) form, where the neighbors of
+      node i are ``indices[indptr[i]:indptr[i + 1]]``, in increasing order
+    - 'degree': the number of neighbors of each node
+    - 'component' and 'num_components': the connected component of each node, numbered in the order of the lowest
+      node index in each component
+    - 'roots': the lowest node index in each connected component
+    - 'traversal_order': the nodes in breadth-first order from the roots, so every node comes after its parent
+    - 'parents' and 'depth': the parent of each node in that breadth-first traversal (-1 for roots) and its number of
+      edges from its root
+    - 'joints': each pair of edges that share a node, as (num_joints, 3) node indices (node, vertex, node), sorted by
+      vertex and then by the other two nodes
+
+    Use Skeleton.graph to get the SkeletonGraph of a Skeleton, which is built on first use and cached.
+    """
+
+    def __init__(self, nodes, edges):
+        self.nodes = tuple(str(node) for node in nodes)
+        self.edges = validate_skeleton(self.nodes, edges)
+        num_nodes = len(self.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+
+        # both directions of each edge, without duplicates, sorted by source and then by target node
+        directed_edges = np.unique(np.concatenate([self.edges, self.edges[:, ::-1]]), axis=0)
+        self.degree = np.bincount(directed_edges[:, 0], minlength=num_nodes)
+        self.indptr = np.concatenate([[0], np.cumsum(self.degree)]).astype(np.intp)
+        self.indices = directed_edges[:, 1]
+
+        # propagate the lowest node index of each component until no label changes
+        labels = np.arange(num_nodes)
+        while True:
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, directed_edges[:, 0], labels[directed_edges[:, 1]])
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+        self.roots, self.component = np.unique(labels, return_inverse=True)
+        self.num_components = len(self.roots)
+
+        # breadth-first traversal from all roots at once, one level at a time
+        self.parents = np.full(num_nodes, -1, dtype=np.intp)
+        self.depth = np.full(num_nodes, -1, dtype=np.intp)
+        self.depth[self.roots] = 0
+        levels = [self.roots]
+        frontier = self.roots
+        while len(frontier):
+            sources = np.repeat(frontier, self.degree[frontier])
+            targets = self.indices[_concatenate_ranges(self.indptr[frontier], self.indptr[frontier + 1])]
+            unvisited = self.depth[targets] < 0
+            targets, first = np.unique(targets[unvisited], return_index=True)
+            self.parents[targets] = sources[unvisited][first]
+            self.depth[targets] = len(levels)
+            frontier = targets[np.argsort(first)]
+            levels.append(frontier)
+        self.traversal_order = np.concatenate(levels)
+
+        # every pair of neighbors (a, c) with a < c of each vertex with at least two neighbors
+        joints = [np.zeros((0, 3), dtype=np.intp)]
+        for vertex in np.flatnonzero(self.degree > 1):
+            neighbors = self.indices[self.indptr[vertex] : self.indptr[vertex + 1]]
+            first, second = np.triu_indices(len(neighbors), k=1)
+            joints.append(np.column_stack([neighbors[first], np.full(len(first), vertex), neighbors[second]]))
+        self.joints = np.concatenate(joints).astype(np.intp)
+
+    def get_node_indices(self, nodes):
+        """Get the indices of the nodes with the given names as an array."""
+        missing = [node for node in nodes if node not in self.node_index]
+        if missing:
+            raise ValueError("The skeleton has no node(s) named %s. Its nodes are %s." % (missing, list(self.nodes)))
+        return np.array([self.node_index[node] for node in nodes], dtype=np.intp)
+
+    def get_neighbors(self, node):
+        """Get the indices of the neighbors of a node, given by name or index, in increasing order."""
+        if isinstance(node, str):
+            node = self.get_node_indices([node])[0]
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
@@ -0,0 +1,9 @@
+from .common import PoseImport
+from .deeplabcut import read_dlc
+from .sleap import read_sleap
+
+__all__ = [
+    "PoseImport",
+    "read_dlc",
+    "read_sleap",
+]
@@ -0,0 +1,93 @@
+"""Objects and helpers shared by the importers of the outputs of pose estimation tools."""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ..pose import PoseEstimation, PoseEstimationSeries, PoseTraining, Skeleton, Skeletons
+
+
+class PoseImport(NamedTuple):
+    """The objects created by an importer.
+
+    Add them to a processing module of an NWBFile with ``result.add_to(behavior_pm)``.
+    """
+
+    skeletons: Skeletons
+    pose_estimations: list
+    pose_training: Optional[PoseTraining] = None
+
+    def add_to(self, processing_module):
+        """Add the Skeletons, PoseEstimation, and PoseTraining objects to a processing module."""
+        processing_module.add(self.skeletons)
+        for pose_estimation in self.pose_estimations:
+            processing_module.add(pose_estimation)
+        if self.pose_training is not None:
+            processing_module.add(self.pose_training)
+
+
+def get_edge_indices(nodes, edges):
+    """Convert edges given as pairs of node names to an (num_edges, 2) array of node indices.
+
+    The Skeleton stores the indices as uint8, so the edges can refer only to the first 256 nodes.
+
+    Edges between nodes that are not in 'nodes' are skipped, so one list of edges can be used for skeletons that have
+    different subsets of the nodes.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    edge_indices = [(index[a], index[b]) for a, b in edges or () if a in index and b in index]
+    return np.array(edge_indices, dtype=np.intp).reshape((len(edge_indices), 2))
+
+
+def get_skeleton(name, nodes, edges=None, subject=None):
+    """Create a Skeleton with the given nodes and edges, given as pairs of node names."""
+    return Skeleton(name=name, nodes=list(nodes), edges=get_edge_indices(nodes, edges), subject=subject)
+
+
+def check_timing(num_frames, timestamps, rate):
+    """Check that exactly one of 'timestamps' and 'rate' is given and that there is one timestamp per frame."""
+    if (timestamps is None) == (rate is None):
+        raise ValueError("Exactly one of 'timestamps' and 'rate' must be given.")
+    if timestamps is not None and len(timestamps) != num_frames:
+        raise ValueError("There are %d timestamps but %d frames." % (len(timestamps), num_frames))
+
+
+def build_pose_estimation(
+    *,
+    skeleton,
+    data,
+    confidence,
+    timestamps=None,
+    rate=None,
+    starting_time=None,
+    reference_frame,
+    unit="pixels",
+    confidence_definition=None,
+    **kwargs,
+):
+    """Create a PoseEstimation object with one PoseEstimationSeries per skeleton node.
+
+    'data' and 'confidence' are lists with one (num_frames, num_dims) and one (num_frames,) array per node, in
+    skeleton node order. A confidence array may be None. The first series owns the timestamps and the other series
+    link to them. Additional keyword arguments are passed to the PoseEstimation constructor.
+    """
+    pose_estimation_series = []
+    for node, node_data, node_confidence in zip(skeleton.nodes, data, confidence):
+        if rate is not None:
+            timing = dict(rate=float(rate), starting_time=float(starting_time or 0.0))
+        elif pose_estimation_series:
+            timing = dict(timestamps=pose_estimation_series[0])  # link to the timestamps of the first series
+        else:
+            timing = dict(timestamps=np.asarray(timestamps, dtype=np.float64))
+        pose_estimation_series.append(
+            PoseEstimationSeries(
+                name=node,
+                data=node_data,
+                confidence=node_confidence,
+                reference_frame=reference_frame,
+                unit=unit,
+                confidence_definition=confidence_definition if node_confidence is not None else None,
+                **timing,
+            )
+        )
+    return PoseEstimation(pose_estimation_series=pose_estimation_series, skeleton=skeleton, **kwargs)
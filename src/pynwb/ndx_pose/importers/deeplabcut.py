@@ -0,0 +1,190 @@
+"""Import the pose estimates that DeepLabCut writes for a video, as a .h5 or .csv file, into ndx-pose objects.
+
+DeepLabCut stores one row per video frame and one column per (scorer, bodypart, coordinate) or, for multi-animal
+projects, per (scorer, individual, bodypart, coordinate), with the coordinates "x", "y", and "likelihood". The file is
+read in blocks of rows, which are copied into the preallocated arrays of each bodypart, so besides the output only one
+block of the file is held in memory.
+"""
+
+import csv
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..pose import Skeletons
+from .common import PoseImport, build_pose_estimation, check_timing, get_skeleton
+
+DLC_CONFIDENCE_DEFINITION = "Likelihood of the estimated position, as computed by DeepLabCut."
+DLC_COORDINATES = ("x", "y", "z")
+
+
+def _count_csv_header_rows(file_path):
+    """Count the header rows of a DeepLabCut .csv file, which end with the "coords" row."""
+    with open(file_path, newline="") as f:
+        for i, row in enumerate(csv.reader(f)):
+            if row and row[0] == "coords":
+                return i + 1
+            if i >= 4:
+                break
+    raise ValueError("'%s' is not a DeepLabCut output file: no 'coords' header row was found." % file_path)
+
+
+def _count_csv_rows(file_path, num_header_rows):
+    """Count the non-empty rows after the header of a .csv file, without holding more than one row in memory."""
+    with open(file_path, newline="") as f:
+        return sum(1 for i, row in enumerate(csv.reader(f)) if i >= num_header_rows and row)
+
+
+def _iter_blocks(file_path, chunk_size):
+    """Read a DeepLabCut output file in blocks of at most 'chunk_size' rows.
+
+    Yields a tuple (columns, num_rows) with the column MultiIndex and the number of rows first, and then the values of
+    each block as a float64 array, so the caller can allocate the output before reading any block.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix in (".h5", ".hdf5"):
+        with pd.HDFStore(file_path, mode="r") as store:
+            key = store.keys()[0]
+            num_rows = getattr(store.get_storer(key), "nrows", None)
+            if num_rows is None:  # a dataframe in the "fixed" format can only be read at once
+                frame = store.select(key)
+                yield frame.columns, len(frame)
+                yield frame.to_numpy(dtype=np.float64)
+                return
+            yield store.select(key, start=0, stop=0).columns, num_rows
+            for start in range(0, num_rows, chunk_size):
+                yield store.select(key, start=start, stop=start + chunk_size).to_numpy(dtype=np.float64)
+    elif suffix == ".csv":
+        header = list(range(_count_csv_header_rows(file_path)))
+        columns = pd.read_csv(file_path, header=header, index_col=0, nrows=0).columns
+        yield columns, _count_csv_rows(file_path, len(header))
+        reader = pd.read_csv(file_path, header=header, index_col=0, chunksize=chunk_size, float_precision="round_trip")
+        with reader:
+            for block in reader:
+                yield block.to_numpy(dtype=np.float64)
+    else:
+        raise ValueError("Unsupported DeepLabCut output file '%s'. The file must be a .h5 or .csv file." % file_path)
+
+
+def _get_column_layout(columns):
+    """Map each individual to its bodyparts and the column positions of their coordinates and likelihood.
+
+    Returns the scorer and a dict {individual: {bodypart: {coordinate: position}}}. The individual is None for a
+    single-animal file.
+    """
+    if columns.nlevels not in (3, 4):
+        raise ValueError(
+            "A DeepLabCut output file must have 3 column levels (scorer, bodyparts, coords) or 4 column levels "
+            "(scorer, individuals, bodyparts, coords), got %d."
+            % columns.nlevels
+        )
+    layout = dict()
+    for position, column in enumerate(columns):
+        if columns.nlevels == 3:
+            _, bodypart, coordinate = column
+            individual = None
+        else:
+            _, individual, bodypart, coordinate = column
+        layout.setdefault(individual, dict()).setdefault(bodypart, dict())[coordinate] = position
+    return columns.get_level_values(0)[0], layout
+
+
+def read_dlc(
+    file_path,
+    *,
+    timestamps=None,
+    rate=None,
+    starting_time=None,
+    edges=None,
+    individuals=None,
+    name="PoseEstimation",
+    reference_frame="(0,0) corresponds to the top-left corner of the video frame.",
+    source_software_version=None,
+    chunk_size=65536,
+    **kwargs,
+):
+    """Read a DeepLabCut .h5 or .csv output file into Skeleton, PoseEstimation, and PoseEstimationSeries objects.
+
+    One Skeleton and one PoseEstimation object are created per individual of a multi-animal file, named after the
+    individual and "<name>_<individual>", respectively. For a single-animal file, a Skeleton named "subject" and a
+    PoseEstimation named 'name' are created. Each bodypart becomes a PoseEstimationSeries, with the likelihood as
+    confidence. The 'scorer' and 'source_software' of each PoseEstimation are set from the file.
+
+    Exactly one of 'timestamps', with one timestamp per frame, and 'rate' must be given, as DeepLabCut does not store
+    frame times. 'edges' is an optional list of (bodypart, bodypart) pairs, e.g., from the "skeleton" entry of the
+    DeepLabCut project config.yaml, and 'individuals' an optional list of the individuals to import. Additional keyword
+    arguments, e.g., 'description', 'device', and 'source_video', are passed to each PoseEstimation constructor.
+
+    Returns a PoseImport with the Skeletons object and the list of PoseEstimation objects.
+    """
+    if chunk_size < 1:
+        raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+    with closing(_iter_blocks(file_path, chunk_size)) as blocks:
+        columns, num_rows = next(blocks)
+        scorer, layout = _get_column_layout(columns)
+        if individuals is not None:
+            missing = [individual for individual in individuals if individual not in layout]
+            if missing:
+                raise ValueError(
+                    "The individuals %s are not in '%s'. Available individuals: %s."
+                    % (missing, file_path, [individual for individual in layout if individual is not None])
+                )
+            layout = {individual: layout[individual] for individual in individuals}
+        check_timing(num_rows, timestamps, rate)
+
+        # allocate the arrays of each node and the column positions that fill them, then fill them block by block, so
+        # only one block of the file is held in memory besides the output
+        arrays = dict()
+        targets = []
+        for individual, bodyparts in layout.items():
+            data, confidence = [], []
+            for bodypart, positions in bodyparts.items():
+                coordinates = [coordinate for coordinate in DLC_COORDINATES if coordinate in positions]
+                if coordinates not in (["x", "y"], ["x", "y", "z"]):
+                    raise ValueError(
+                        "Bodypart '%s' in '%s' must have 'x' and 'y' coordinates and may have a 'z' coordinate, got %s."
+                        % (bodypart, file_path, list(positions))
+                    )
+                data.append(np.empty((num_rows, len(coordinates))))
+                targets.append((data[-1], [positions[coordinate] for coordinate in coordinates]))
+                confidence.append(np.empty(num_rows) if "likelihood" in positions else None)
+                if confidence[-1] is not None:
+                    targets.append((confidence[-1], positions["likelihood"]))
+            arrays[individual] = (data, confidence)
+        start = 0
+        for block in blocks:
+            stop = start + len(block)
+            if stop > num_rows:
+                raise ValueError("'%s' has more rows than the %d rows that were counted." % (file_path, num_rows))
+            for array, positions in targets:
+                array[start:stop] = block[:, positions]
+            start = stop
+        if start != num_rows:
+            raise ValueError("'%s' has %d rows, but %d rows were counted." % (file_path, start, num_rows))
+
+    skeletons = []
+    pose_estimations = []
+    for individual, bodyparts in layout.items():
+        data, confidence = arrays[individual]
+        skeleton = get_skeleton(name="subject" if individual is None else individual, nodes=bodyparts, edges=edges)
+        skeletons.append(skeleton)
+        pose_estimations.append(
+            build_pose_estimation(
+                name=name if individual is None else "%s_%s" % (name, individual),
+                skeleton=skeleton,
+                data=data,
+                confidence=confidence,
+                timestamps=timestamps,
+                rate=rate,
+                starting_time=starting_time,
+                reference_frame=reference_frame,
+                confidence_definition=DLC_CONFIDENCE_DEFINITION,
+                scorer=scorer,
+                source_software="DeepLabCut",
+                source_software_version=source_software_version,
+                **kwargs,
+            )
+        )
+    return PoseImport(skeletons=Skeletons(skeletons=skeletons), pose_estimations=pose_estimations)
@@ -0,0 +1,253 @@
+"""Import a SLEAP labels file (.slp) into ndx-pose objects.
+
+A .slp file is an HDF5 file with one row per labeled frame in the "frames" dataset, one row per instance in the
+"instances" dataset, and one row per node of each instance in the "points" (user-labeled) and "pred_points"
+(predicted) datasets. Skeletons, videos, and tracks are stored as JSON. Each of these datasets is read with a single
+vectorized read, and the node locations of all instances are gathered with array indexing, so that only the creation
+of the TrainingFrame and SkeletonInstance objects is done per frame and per instance.
+"""
+
+import json
+
+import h5py
+import numpy as np
+from pynwb.image import ImageSeries
+
+from ..pose import (
+    PoseTraining,
+    SkeletonInstance,
+    SkeletonInstances,
+    Skeletons,
+    SourceVideos,
+    TrainingFrame,
+    TrainingFrames,
+)
+from .common import PoseImport, build_pose_estimation, get_skeleton
+
+SLEAP_CONFIDENCE_DEFINITION = "Point-wise confidence score of the SLEAP model for each predicted node."
+USER_INSTANCE, PREDICTED_INSTANCE = 0, 1
+EDGE_TYPE_BODY = 1  # SLEAP also stores symmetry edges, with type 2, which are not skeleton edges
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _read_skeletons(metadata):
+    """Create one Skeleton per SLEAP skeleton in the metadata, with its nodes in SLEAP order."""
+    node_names = [node["name"] for node in metadata["nodes"]]
+    skeletons = []
+    for i, skeleton in enumerate(metadata["skeletons"]):
+        node_ids = [node["id"] for node in skeleton["nodes"]]
+        nodes = [node_names[node_id] for node_id in node_ids]
+        edges = []
+        for link in skeleton["links"]:
+            edge_type = link["type"]
+            edge_type = edge_type["py/reduce"][1]["py/tuple"][0] if "py/reduce" in edge_type else edge_type["py/id"]
+            if edge_type == EDGE_TYPE_BODY:
+                edges.append((node_names[link["source"]], node_names[link["target"]]))
+        name = skeleton.get("graph", dict()).get("name") or "skeleton"
+        if name in [skeleton.name for skeleton in skeletons]:
+            name = "%s_%d" % (name, i)
+        skeletons.append(get_skeleton(name=name, nodes=nodes, edges=edges))
+    return skeletons
+
+
+def _read_videos(f, frames, rate, timestamps):
+    """Create one ImageSeries per SLEAP video, pointing to the external video file.
+
+    The number of frames of a video is read from the shape that SLEAP stores for it, if any, and otherwise set to one
+    more than the highest labeled frame index.
+    """
+    videos = []
+    for i, video_json in enumerate(f["videos_json"][:]):
+        backend = json.loads(_decode(video_json)).get("backend", dict())
+        video_timestamps = None if timestamps is None else timestamps.get(i)
+        if video_timestamps is None and rate is None:
+            raise ValueError("Either 'rate' or the timestamps of video %d in 'timestamps' must be given." % i)
+        if video_timestamps is not None:
+            timing = dict(timestamps=np.asarray(video_timestamps, dtype=np.float64))
+        elif backend.get("shape"):
+            timing = dict(rate=float(rate), num_samples=int(backend["shape"][0]))
+        else:
+            frame_indices = frames["frame_idx"][frames["video"] == i]
+            timing = dict(rate=float(rate), num_samples=int(frame_indices.max()) + 1 if len(frame_indices) else 0)
+        videos.append(
+            ImageSeries(
+                name="video_%d" % i,
+                description="Video used for pose estimation with SLEAP.",
+                unit="NA",
+                format="external",
+                external_file=[backend.get("filename", "")],
+                starting_frame=[0],
+                **timing,
+            )
+        )
+    return videos
+
+
+def _get_frame_rows(frames, frame_ids):
+    """Get the rows of the "frames" dataset of the given frame IDs."""
+    order = np.argsort(frames["frame_id"], kind="stable")
+    return order[np.searchsorted(frames["frame_id"], frame_ids, sorter=order)]
+
+
+def _gather_points(points, instances, num_nodes):
+    """Gather the (num_instances, num_nodes) points of instances with the same skeleton from a points dataset."""
+    return points[instances["point_id_start"].astype(np.int64)[:, np.newaxis] + np.arange(num_nodes)]
+
+
+def _read_training_frames(instances, frame_rows, frames, points, skeletons, videos):
+    """Create one TrainingFrame per frame with user-labeled instances, holding one SkeletonInstance per instance."""
+    user = np.flatnonzero(instances["instance_type"] == USER_INSTANCE)
+    user = user[np.argsort(frame_rows[user], kind="stable")]
+    node_locations = dict()  # node locations and visibility of the user-labeled instances, by instance row
+    for skeleton_index, skeleton in enumerate(skeletons):
+        rows = user[instances["skeleton"][user] == skeleton_index]
+        skeleton_points = _gather_points(points, instances[rows], len(skeleton.nodes))
+        locations = np.stack([skeleton_points["x"], skeleton_points["y"]], axis=-1).astype(np.float64)
+        visibility = skeleton_points["visible"].astype(bool)
+        locations[~visibility] = np.nan
+        node_locations.update((row, (locations[k], visibility[k])) for k, row in enumerate(rows))
+
+    training_frames = []
+    starts = np.flatnonzero(np.r_[True, np.diff(frame_rows[user]) != 0])
+    for frame_instances in np.split(user, starts[1:]) if len(user) else []:
+        frame = frames[frame_rows[frame_instances[0]]]
+        skeleton_instances = []
+        for k, row in enumerate(frame_instances):
+            locations, visibility = node_locations[row]
+            skeleton_instances.append(
+                SkeletonInstance(
+                    name="instance_%d" % k,
+                    id=np.uint(k),
+                    node_locations=locations,
+                    node_visibility=visibility,
+                    skeleton=skeletons[instances["skeleton"][row]],
+                )
+            )
+        training_frames.append(
+            TrainingFrame(
+                name="video_%d_frame_%d" % (frame["video"], frame["frame_idx"]),
+                skeleton_instances=SkeletonInstances(skeleton_instances=skeleton_instances),
+                source_video=videos[frame["video"]],
+                source_video_frame_index=np.uint(frame["frame_idx"]),
+            )
+        )
+    return training_frames
+
+
+def _read_pose_estimations(
+    instances, frame_rows, frames, pred_points, skeletons, videos, tracks, rate, timestamps, name, kwargs
+):
+    """Create one PoseEstimation per video and track from the predicted instances.
+
+    Each PoseEstimation holds the frames of its video with at least one predicted instance, with NaN where the track
+    has no instance. Untracked instances are grouped together and, where a frame has several of them, only the one
+    with the highest score is kept.
+    """
+    predicted = np.flatnonzero(instances["instance_type"] == PREDICTED_INSTANCE)
+    predicted = predicted[np.argsort(instances["score"][predicted], kind="stable")]  # the best instance is set last
+    video_indices = frames["video"][frame_rows[predicted]]
+    frame_indices = frames["frame_idx"][frame_rows[predicted]]
+    pose_estimations = []
+    for video_index in np.unique(video_indices):
+        in_video = video_indices == video_index
+        video_frames = np.unique(frame_indices[in_video])
+        if timestamps is not None and timestamps.get(int(video_index)) is not None:
+            video_timestamps = np.asarray(timestamps[int(video_index)], dtype=np.float64)[video_frames]
+        else:
+            video_timestamps = video_frames / float(rate)
+        video_tracks = np.unique(instances["track"][predicted[in_video]])
+        for track in video_tracks:
+            in_track = in_video & (instances["track"][predicted] == track)
+            rows = predicted[in_track]
+            skeleton_indices = np.unique(instances["skeleton"][rows])
+            if len(skeleton_indices) > 1:
+                raise ValueError(
+                    "The predicted instances of track %s in video %d have different skeletons." % (track, video_index)
+                )
+            skeleton = skeletons[skeleton_indices[0]]
+            skeleton_points = _gather_points(pred_points, instances[rows], len(skeleton.nodes))
+            visible = skeleton_points["visible"].astype(bool)
+            frame_positions = np.searchsorted(video_frames, frame_indices[in_track])
+            data = np.full((len(video_frames), len(skeleton.nodes), 2), np.nan)
+            confidence = np.full((len(video_frames), len(skeleton.nodes)), np.nan)
+            data[frame_positions, :, 0] = np.where(visible, skeleton_points["x"], np.nan)
+            data[frame_positions, :, 1] = np.where(visible, skeleton_points["y"], np.nan)
+            confidence[frame_positions] = np.where(visible, skeleton_points["score"], np.nan)
+
+            name_parts = [name]
+            if len(videos) > 1:
+                name_parts.append("video_%d" % video_index)
+            if len(video_tracks) > 1 or track >= 0:
+                name_parts.append(tracks[track] if track >= 0 else "untracked")
+            pose_estimations.append(
+                build_pose_estimation(
+                    name="_".join(name_parts),
+                    skeleton=skeleton,
+                    data=[np.ascontiguousarray(data[:, j]) for j in range(len(skeleton.nodes))],
+                    confidence=[confidence[:, j].copy() for j in range(len(skeleton.nodes))],
+                    timestamps=video_timestamps,
+                    reference_frame="(0,0) corresponds to the center of the top-left pixel of the video frame.",
+                    confidence_definition=SLEAP_CONFIDENCE_DEFINITION,
+                    source_video=videos[video_index],
+                    **kwargs,
+                )
+            )
+    return pose_estimations
+
+
+def read_sleap(file_path, *, rate=None, timestamps=None, name="PoseEstimation", **kwargs):
+    """Read a SLEAP labels file (.slp) into Skeletons, PoseTraining, and PoseEstimation objects.
+
+    Each SLEAP skeleton becomes a Skeleton. Each video becomes an ImageSeries in the SourceVideos of the PoseTraining
+    object, named "video_<index>" and pointing to the external video file. Each frame with user-labeled instances
+    becomes a TrainingFrame, named "video_<index>_frame_<frame index>", with one SkeletonInstance per instance.
+    Predicted instances become one PoseEstimation per video and track, named "<name>_<track name>", with
+    "_video_<index>" inserted before the track name if the file has several videos. The track name is left out for
+    the untracked instances of a video without tracks. See _read_pose_estimations for how frames are aligned.
+
+    The frame times of the videos are given either by 'rate', in frames per second, or by 'timestamps', a dict that
+    maps video indices to arrays with one timestamp per frame of the video. Additional keyword arguments, e.g.,
+    'description' and 'device', are passed to each PoseEstimation constructor.
+
+    Returns a PoseImport with the Skeletons, the list of PoseEstimation objects, and the PoseTraining object.
+    """
+    with h5py.File(file_path, mode="r") as f:
+        metadata = json.loads(_decode(f["metadata"].attrs["json"]))
+        format_id = float(f["metadata"].attrs.get("format_id", 1.0))
+        skeletons = _read_skeletons(metadata)
+        frames = f["frames"][:]
+        videos = _read_videos(f, frames, rate, timestamps)
+        tracks = [json.loads(_decode(track))[1] for track in f["tracks_json"][:]] if "tracks_json" in f else []
+        instances = f["instances"][:]
+        points = f["points"][:] if "points" in f else None
+        pred_points = f["pred_points"][:] if "pred_points" in f else None
+
+    if format_id < 1.1:
+        # files written by SLEAP < 1.1 place (0,0) at the top-left corner, not the center, of the top-left pixel
+        for array in (points, pred_points):
+            if array is not None:
+                array["x"] -= 0.5
+                array["y"] -= 0.5
+
+    frame_rows = _get_frame_rows(frames, instances["frame_id"])
+    training_frames = []
+    if points is not None:
+        training_frames = _read_training_frames(instances, frame_rows, frames, points, skeletons, videos)
+    pose_estimations = []
+    if pred_points is not None:
+        kwargs.setdefault("source_software", "SLEAP")
+        kwargs.setdefault("source_software_version", metadata.get("provenance", dict()).get("sleap_version"))
+        pose_estimations = _read_pose_estimations(
+            instances, frame_rows, frames, pred_points, skeletons, videos, tracks, rate, timestamps, name, kwargs
+        )
+
+    pose_training = PoseTraining(
+        training_frames=TrainingFrames(training_frames=training_frames) if training_frames else None,
+        source_videos=SourceVideos(image_series=videos) if videos else None,
+    )
+    return PoseImport(
+        skeletons=Skeletons(skeletons=skeletons), pose_estimations=pose_estimations, pose_training=pose_training
+    )
@@ -1 +1,2 @@
 from . import pose as __pose
+from .lazy import LazyContainerDict, lazy_pose_training
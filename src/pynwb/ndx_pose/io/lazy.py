@@ -0,0 +1,168 @@
+"""Lazy construction of the children of TrainingFrames and SkeletonInstances containers read from a file."""
+
+import warnings
+from collections.abc import ItemsView, ValuesView
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import hdmf
+from hdmf.build import Builder, ObjectMapper
+from hdmf.container import AbstractContainer
+from hdmf.utils import LabelledDict, docval, get_docval, getargs
+from pynwb.io.core import NWBContainerMapper
+
+_lazy_read = ContextVar("ndx_pose_lazy_read", default=False)
+
+# Lazy construction relies on two HDMF internals that have no public equivalent, which are used only by the two
+# functions below: ObjectMapper.__new_container__, which creates a container in construct mode, as the BuildManager
+# does when it reads a file, and AbstractContainer._remove_child, which detaches a child from its parent. They are
+# used only with the major versions of HDMF in which they are known to exist. With other versions, or if they are
+# missing, LAZY_READ_SUPPORTED is False and lazy_pose_training() reads containers eagerly, as outside of it.
+LAZY_READ_HDMF_MAJOR_VERSIONS = (6,)
+LAZY_READ_SUPPORTED = (
+    hdmf.__version__.split(".")[0].isdigit()
+    and int(hdmf.__version__.split(".")[0]) in LAZY_READ_HDMF_MAJOR_VERSIONS
+    and callable(getattr(ObjectMapper, "__new_container__", None))
+    and callable(getattr(AbstractContainer, "_remove_child", None))
+)
+
+
+def _new_container(mapper, cls, builder, parent, **kwargs):
+    """Create a container of class 'cls' for a builder in construct mode, without constructing its children."""
+    return mapper.__new_container__(
+        cls, builder.source, parent, builder.attributes.get(mapper.spec.id_key()), name=builder.name, **kwargs
+    )
+
+
+def _remove_child(container, child):
+    """Detach a child container from its parent container."""
+    container._remove_child(child)
+
+
+@contextmanager
+def lazy_pose_training():
+    """Read the TrainingFrame and SkeletonInstance objects of a file lazily within this context.
+
+    Within this context, the 'training_frames' of each TrainingFrames object and the 'skeleton_instances' of each
+    SkeletonInstances object read from a file are LazyContainerDict objects. A TrainingFrame or SkeletonInstance is
+    constructed from the file when it is first accessed, so the time and memory used to read a PoseTraining object
+    grow with the number of training frames that are used, not the number in the file. For example::
+
+        with NWBHDF5IO(path, mode="r") as io, lazy_pose_training():
+            nwbfile = io.read()
+            training_frames = nwbfile.processing["behavior"]["PoseTraining"].training_frames.training_frames
+            batch = [training_frames[name] for name in random.sample(list(training_frames), 256)]
+
+    The file must stay open until the last training frame is accessed. Containers that have not been accessed are
+    not in the 'children' of their parent. Building a container to write or export it constructs all of its pending
+    children first, so that no training frame is dropped from the new file. If the installed HDMF version is not
+    supported, see LAZY_READ_SUPPORTED, a warning is raised and the containers are read eagerly.
+    """
+    if not LAZY_READ_SUPPORTED:
+        warnings.warn(
+            "Lazy reading of PoseTraining objects is not supported with HDMF %s. The TrainingFrame and "
+            "SkeletonInstance objects are read eagerly."
+            % hdmf.__version__,
+            stacklevel=3,  # the caller of the context manager, past contextlib
+        )
+    token = _lazy_read.set(True)
+    try:
+        yield
+    finally:
+        _lazy_read.reset(token)
+
+
+class LazyContainerDict(LabelledDict):
+    """A LabelledDict of containers, keyed by name, that are constructed from their builders on first access.
+
+    Until a container is accessed, the dict holds its builder. Getting the length of the dict, checking whether a
+    name is in it, and iterating over its keys construct no containers. Iterating over its values or items constructs
+    each container as it is reached.
+    """
+
+    def __init__(self, label, builders, construct, remove_callable=None):
+        super().__init__(label=label, key_attr="name", remove_callable=remove_callable)
+        self.__construct = construct
+        for name, builder in builders.items():
+            dict.__setitem__(self, name, builder)
+
+    def __getitem__(self, args):
+        value = super().__getitem__(args)
+        if isinstance(value, Builder):
+            value = self.__construct(value)
+            dict.__setitem__(self, value.name, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def pop(self, k):
+        self[k]  # construct the container so that the remove callable receives it
+        return super().pop(k)
+
+    def popitem(self):
+        self[next(reversed(self))]
+        return super().popitem()
+
+    def construct_all(self):
+        """Construct every container in this dict that has not been constructed yet."""
+        for name in list(self):
+            self[name]
+
+    @property
+    def num_constructed(self):
+        """The number of containers in this dict that have been constructed."""
+        return sum(not isinstance(value, Builder) for value in dict.values(self))
+
+
+class LazyMultiContainerMapper(NWBContainerMapper):
+    """Base ObjectMapper for a MultiContainerInterface that holds a single kind of child group.
+
+    Within the lazy_pose_training() context, the children of the container are held in a LazyContainerDict instead
+    of being constructed with the container. Outside of that context, or if LAZY_READ_SUPPORTED is False, this mapper
+    constructs containers as usual. Building the container constructs its pending children first.
+    Subclasses set 'lazy_attr' to the name of the attribute that holds the children.
+    """
+
+    lazy_attr = None
+
+    @docval(*get_docval(ObjectMapper.build))
+    def build(self, **kwargs):
+        container = kwargs["container"]
+        lazy_children = container.fields.get(self.lazy_attr)
+        # construct the pending children so that they are written and are in the 'children' of the container
+        if isinstance(lazy_children, LazyContainerDict):
+            lazy_children.construct_all()
+        return super().build(**kwargs)
+
+    @docval(*get_docval(ObjectMapper.construct))
+    def construct(self, **kwargs):
+        builder, manager, parent = getargs("builder", "manager", "parent", kwargs)
+        # links and datasets are resolved by the usual construction, which handles them in the context of the file
+        if not _lazy_read.get() or not LAZY_READ_SUPPORTED or builder.links or builder.datasets:
+            return super().construct(**kwargs)
+        container = _new_container(self, manager.get_cls(builder), builder, parent)
+
+        def construct_child(child_builder):
+            modified = container.modified
+            with lazy_pose_training():  # the children of the child are lazy too, even outside of the context
+                child = manager.construct(child_builder)
+            child.parent = container  # replaces the Proxy parent that the BuildManager gave the child
+            if not modified:
+                container.set_modified(False)
+            return child
+
+        def remove_child(child):
+            if child.parent is container:
+                _remove_child(container, child)
+
+        container.fields[self.lazy_attr] = LazyContainerDict(
+            label=self.lazy_attr, builders=builder.groups, construct=construct_child, remove_callable=remove_child
+        )
+        return container
@@ -1,10 +1,14 @@
-from hdmf.build import ObjectMapper
+import h5py
+import numpy as np
+from hdmf.build import LinkBuilder, ObjectMapper
 from pynwb import register_map
 from pynwb.device import Device
 from pynwb.io.base import TimeSeriesMap
 from pynwb.io.core import NWBContainerMapper
 
-from ..pose import MultiCameraPoseEstimation, PoseEstimation, PoseEstimationSeries
+from ..dataio import MISSING_POSITION, DecodedArray
+from ..pose import MultiCameraPoseEstimation, PoseEstimation, PoseEstimationSeries, SkeletonInstances, TrainingFrames
+from .lazy import LazyMultiContainerMapper
 
 # ObjectMapper.NO_OVERRIDE is the sentinel a constructor_arg override function returns to fall through to
 # the value built from the file. hdmf < 6.2.0 has no sentinel and uses a None return for that.
@@ -15,10 +19,48 @@ NO_OVERRIDE = getattr(ObjectMapper, "NO_OVERRIDE", None)
 class PoseEstimationSeriesMap(TimeSeriesMap):
 
     def __init__(self, spec):
-        """Map attribute spec "definition" to Python instance attribute "confidence_definition"."""
+        """Map attribute spec "definition" to Python instance attribute "confidence_definition" and attribute spec
+        "scale" to "confidence_scale"."""
         super().__init__(spec)
         confidence_spec = self.spec.get_dataset("confidence")
         self.map_spec("confidence_definition", confidence_spec.get_attribute("definition"))
+        self.map_spec("confidence_scale", confidence_spec.get_attribute("scale"))
+
+    @TimeSeriesMap.object_attr("data")
+    def data_attr(self, container, manager):
+        """Write the stored values of 'data' that set_storage_precision encoded."""
+        data = super().data_attr(container, manager)
+        return data.dataset if isinstance(data, DecodedArray) else data
+
+    @TimeSeriesMap.constructor_arg("data")
+    def data_carg(self, builder, manager):
+        """Decode the positions of a 'data' dataset that set_storage_precision stored with the HDF5 scale-offset
+        filter, in which missing (NaN) positions are stored as the fill value MISSING_POSITION."""
+        data = super().data_carg(builder, manager)
+        if isinstance(data, h5py.Dataset) and data.dtype.kind == "f" and data.fillvalue == MISSING_POSITION:
+            return DecodedArray(data, data.dtype, MISSING_POSITION, scaleoffset=data.scaleoffset)
+        return data
+
+    @TimeSeriesMap.object_attr("confidence")
+    def confidence_attr(self, container, manager):
+        """Write the stored values of 'confidence' that set_storage_precision encoded."""
+        confidence = container.fields.get("confidence")
+        return confidence.dataset if isinstance(confidence, DecodedArray) else confidence
+
+    @TimeSeriesMap.constructor_arg("confidence")
+    def confidence_carg(self, builder, manager):
+        """Decode 'confidence' values stored as integers with a 'scale' attribute, in which the largest value of the
+        integer type marks missing (NaN) values."""
+        confidence_builder = builder.get("confidence")
+        if confidence_builder is None:
+            return None
+        if isinstance(confidence_builder, LinkBuilder):  # e.g., the confidence of another series
+            confidence_builder = confidence_builder.builder
+        scale = confidence_builder.attributes.get("scale")
+        if scale is None:
+            return confidence_builder.data
+        missing_value = np.iinfo(confidence_builder.data.dtype).max
+        return DecodedArray(confidence_builder.data, np.float32, missing_value, scale=float(scale))
 
 
 @register_map(PoseEstimation)
@@ -101,3 +143,17 @@ class MultiCameraPoseEstimationMap(NWBContainerMapper):
         super().__init__(spec)
         source_software_spec = self.spec.get_dataset("source_software")
         self.map_spec("source_software_version", source_software_spec.get_attribute("version"))
+
+
+@register_map(TrainingFrames)
+class TrainingFramesMap(LazyMultiContainerMapper):
+    """Construct the TrainingFrame objects on first access within the lazy_pose_training() context."""
+
+    lazy_attr = "training_frames"
+
+
+@register_map(SkeletonInstances)
+class SkeletonInstancesMap(LazyMultiContainerMapper):
+    """Construct the SkeletonInstance objects on first access within the lazy_pose_training() context."""
+
+    lazy_attr = "skeleton_instances"
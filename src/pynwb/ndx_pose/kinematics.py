@@ -0,0 +1,69 @@
+"""Bone lengths and joint angles computed from pose estimates, block by block over the frames of a recording."""
+
+import numpy as np
+
+from .views import unwrap_array
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def compute_bone_lengths(positions, edges):
+    """Compute the length of each edge in each frame.
+
+    'positions' has shape (num_frames, num_nodes, num_dims) and 'edges' has shape (num_edges, 2). Returns an array of
+    shape (num_frames, num_edges). The length of an edge is NaN in the frames where either of its nodes is NaN.
+    """
+    positions = np.asarray(positions)
+    edges = np.asarray(edges, dtype=np.intp).reshape((-1, 2))
+    return np.linalg.norm(positions[:, edges[:, 1]] - positions[:, edges[:, 0]], axis=-1)
+
+
+def compute_joint_angles(positions, joints):
+    """Compute the angle at the vertex of each joint in each frame, in radians between 0 and pi.
+
+    'positions' has shape (num_frames, num_nodes, num_dims) and 'joints' has shape (num_joints, 3), where each row
+    holds the indices of the nodes (a, vertex, c) and the angle is the one between the vectors from the vertex to a
+    and from the vertex to c. Returns an array of shape (num_frames, num_joints). The angle is computed as
+    arctan2(|u x v|, u . v), which stays accurate for angles near 0 and pi. The angle of a joint is NaN in the frames
+    where any of its nodes is NaN and is 0 where a vector has zero length.
+    """
+    positions = np.asarray(positions)
+    joints = np.asarray(joints, dtype=np.intp).reshape((-1, 3))
+    vertices = positions[:, joints[:, 1]]
+    u = positions[:, joints[:, 0]] - vertices
+    v = positions[:, joints[:, 2]] - vertices
+    dot = np.einsum("...i,...i->...", u, v)
+    if positions.shape[-1] == 2:
+        cross = np.abs(u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0])
+    else:
+        cross = np.linalg.norm(np.cross(u, v), axis=-1)
+    return np.arctan2(cross, dot)
+
+
+def _select_nodes(node_indices):
+    """Get the sorted nodes used by an array of node indices and the indices remapped to positions in that list."""
+    used = np.unique(node_indices)
+    return used, np.searchsorted(used, node_indices)
+
+
+def compute_in_chunks(pose_estimation, node_indices, compute, min_confidence=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Apply 'compute' to the positions of a PoseEstimation object in blocks of at most 'chunk_size' frames.
+
+    'node_indices' is an integer array of skeleton node indices, e.g., the edges or joints of the skeleton, and
+    'compute' is compute_bone_lengths or compute_joint_angles. Only the series of the nodes in 'node_indices' are
+    read, one block of frames at a time, and each result is written into one preallocated array of shape
+    (num_frames, len(node_indices)). If 'min_confidence' is given, positions with confidence below it are NaN.
+    """
+    if chunk_size < 1:
+        raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+    skeleton_nodes = pose_estimation.skeleton.graph.nodes
+    used, remapped = _select_nodes(node_indices)
+    if not len(used):
+        num_frames = len(unwrap_array(next(iter(pose_estimation.pose_estimation_series.values())).data))
+        return np.zeros((num_frames, 0))
+    view = pose_estimation.get_stacked_view(nodes=[skeleton_nodes[i] for i in used])
+    positions = view.data if min_confidence is None else view.masked(min_confidence)
+    out = np.empty((len(positions), len(remapped)), dtype=np.result_type(positions.dtype, np.float32))
+    for frame_slice, block in positions.iter_chunks(chunk_size):
+        out[frame_slice] = compute(block, remapped)
+    return out
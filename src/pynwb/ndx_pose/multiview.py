@@ -0,0 +1,636 @@
+"""Multi-camera geometry: triangulating 3D positions from the calibrated 2D pose estimates of several camera views,
+and projecting 3D positions back into each camera view."""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .dataio import LazyArrayDataChunkIterator
+from .parallel import iter_frame_blocks
+from .views import _read_frames, unwrap_array
+
+DEFAULT_CHUNK_SIZE = 16384
+
+# scale, in pixels, of the root mean square reprojection error at which the confidence of a triangulated point is 1/e
+DEFAULT_ERROR_SCALE = 10.0
+
+
+class Triangulation(NamedTuple):
+    """3D positions triangulated from the 2D positions of several camera views.
+
+    'data' has shape (num_frames, num_nodes, 3). 'reprojection_error' holds the root mean square distance, in
+    pixels, between the projection of each 3D position into the camera views used to triangulate it and the 2D
+    positions in those views, and 'confidence' is exp(-reprojection_error / error_scale). 'num_views' holds the number
+    of camera views used for each position. All have shape (num_frames, num_nodes). Positions seen by fewer than two
+    camera views, or whose camera views do not determine a unique 3D position, are NaN, and so are their reprojection
+    error and confidence.
+    """
+
+    data: np.ndarray
+    confidence: np.ndarray
+    reprojection_error: np.ndarray
+    num_views: np.ndarray
+
+
+class Reprojection(NamedTuple):
+    """3D positions projected into one camera view and their distance to the 2D positions of that view.
+
+    'data' has shape (num_frames, num_nodes, 2) and holds pixel coordinates, including lens distortion. 'error' has
+    shape (num_frames, num_nodes) and holds the distance, in pixels, between 'data' and the 2D positions of the
+    camera view. It is NaN where either position is NaN.
+    """
+
+    data: np.ndarray
+    error: np.ndarray
+
+
+class CameraGeometry:
+    """The calibration of a camera as float64 arrays, and the matrices derived from it, computed once.
+
+    'distortion_coefficients' is None if there are no distortion coefficients or all of them are 0. If the rotation
+    matrix and the translation vector are given, the (3, 4) matrices [R|t] ('extrinsic_matrix') and K[R|t]
+    ('projection_matrix'), the (4, 3) pseudo-inverse of K[R|t] ('projection_matrix_pinv'), and the camera center in
+    world coordinates ('center') are computed as well. Otherwise, they are None. The arrays are read-only, so that a
+    CameraGeometry can be cached and shared.
+    """
+
+    def __init__(self, intrinsic_matrix, rotation_matrix=None, translation_vector=None, distortion_coefficients=None):
+        self.intrinsic_matrix = _read_only(intrinsic_matrix)
+        self.rotation_matrix = self.translation_vector = None
+        self.extrinsic_matrix = self.projection_matrix = self.projection_matrix_pinv = self.center = None
+        if rotation_matrix is not None and translation_vector is not None:
+            self.rotation_matrix = _read_only(rotation_matrix)
+            self.translation_vector = _read_only(translation_vector)
+            self.extrinsic_matrix = _read_only(np.column_stack([self.rotation_matrix, self.translation_vector]))
+            self.projection_matrix = _read_only(self.intrinsic_matrix @ self.extrinsic_matrix)
+            self.projection_matrix_pinv = _read_only(np.linalg.pinv(self.projection_matrix))
+            self.center = _read_only(-self.rotation_matrix.T @ self.translation_vector)
+        self.distortion_coefficients = None
+        if distortion_coefficients is not None:
+            distortion_coefficients = np.asarray(distortion_coefficients, dtype=np.float64).ravel()
+            if distortion_coefficients.any():
+                _pad_distortion_coefficients(distortion_coefficients)  # check the number of coefficients
+                self.distortion_coefficients = _read_only(distortion_coefficients)
+
+    @property
+    def is_posed(self):
+        """Whether the rotation matrix and the translation vector of the camera are known."""
+        return self.extrinsic_matrix is not None
+
+
+def _read_only(array):
+    """Get a read-only float64 copy of an array."""
+    array = np.array(array, dtype=np.float64)
+    array.setflags(write=False)
+    return array
+
+
+def _cross_product_matrix(vector):
+    """Get the (3, 3) matrix [v]x such that [v]x @ u is the cross product of v and u."""
+    x, y, z = vector
+    return np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+
+
+class CameraRig:
+    """The cameras of a multi-camera rig and the matrices between each pair of them, computed once.
+
+    'cameras' holds the posed CameraGeometry of each camera, in order. 'essential_matrices' and
+    'fundamental_matrices' have shape (num_cameras, num_cameras, 3, 3). For cameras i and j, the essential matrix
+    E = [t]x R relates the normalized coordinates, and the fundamental matrix F = K_j^-T E K_i^-1 the pixel
+    coordinates, of the projections x_i and x_j of one 3D point, as homogeneous vectors: x_j^T F[i, j] x_i = 0. R and
+    t are the rotation and translation from camera i to camera j. The matrices of a camera with itself are 0. The
+    arrays are read-only.
+    """
+
+    def __init__(self, names, cameras):
+        self.names = [str(name) for name in names]
+        self.cameras = list(cameras)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        num_cameras = len(self.cameras)
+        essential_matrices = np.zeros((num_cameras, num_cameras, 3, 3))
+        fundamental_matrices = np.zeros((num_cameras, num_cameras, 3, 3))
+        inverse_intrinsic_matrices = [np.linalg.inv(camera.intrinsic_matrix) for camera in self.cameras]
+        for i, first in enumerate(self.cameras):
+            for j, second in enumerate(self.cameras):
+                if i == j:
+                    continue
+                rotation = second.rotation_matrix @ first.rotation_matrix.T
+                translation = second.translation_vector - rotation @ first.translation_vector
+                essential_matrices[i, j] = _cross_product_matrix(translation) @ rotation
+                fundamental_matrices[i, j] = (
+                    inverse_intrinsic_matrices[j].T @ essential_matrices[i, j] @ inverse_intrinsic_matrices[i]
+                )
+        self.essential_matrices = _read_only(essential_matrices)
+        self.fundamental_matrices = _read_only(fundamental_matrices)
+
+    def _get_index(self, camera):
+        """Get the index of a camera given by name or index."""
+        if isinstance(camera, str):
+            if camera not in self.index:
+                raise ValueError("The camera rig has no camera named '%s'. Its cameras are %s." % (camera, self.names))
+            return self.index[camera]
+        return camera
+
+    def get_essential_matrix(self, first, second):
+        """Get the essential matrix from camera 'first' to camera 'second', given by name or index."""
+        return self.essential_matrices[self._get_index(first), self._get_index(second)]
+
+    def get_fundamental_matrix(self, first, second):
+        """Get the fundamental matrix from camera 'first' to camera 'second', given by name or index."""
+        return self.fundamental_matrices[self._get_index(first), self._get_index(second)]
+
+
+def get_view_weights(points, confidence=None, min_confidence=None):
+    """Get the weight of each 2D position for triangulation: its confidence, clipped to [0, 1].
+
+    Positions without a confidence value, i.e., if 'confidence' is None or NaN, have weight 1. Positions that are NaN,
+    or whose confidence is below 'min_confidence' or NaN if 'min_confidence' is given, have weight 0.
+    """
+    weights = np.ones(points.shape[:-1])
+    if confidence is not None:
+        confidence = np.asarray(confidence, dtype=np.float64)
+        weights = np.where(np.isnan(confidence), weights, np.clip(confidence, 0.0, 1.0))
+        if min_confidence is not None:
+            weights[~(confidence >= min_confidence)] = 0.0
+    weights[np.isnan(points).any(axis=-1)] = 0.0
+    return weights
+
+
+def normalize_points(points, intrinsic_matrix):
+    """Convert pixel coordinates of shape (..., 2) to normalized image coordinates with the inverse of K."""
+    intrinsic_matrix = np.asarray(intrinsic_matrix, dtype=np.float64)
+    homogeneous = np.concatenate([points, np.ones(points.shape[:-1] + (1,))], axis=-1)
+    normalized = homogeneous @ np.linalg.inv(intrinsic_matrix).T
+    return normalized[..., :2] / normalized[..., 2:]
+
+
+def project_points(points, projection_matrix):
+    """Project 3D points of shape (..., 3) with a (3, 4) projection matrix to 2D points of shape (..., 2)."""
+    projection_matrix = np.asarray(projection_matrix, dtype=np.float64)
+    projected = points @ projection_matrix[:, :3].T + projection_matrix[:, 3]
+    return projected[..., :2] / projected[..., 2:]
+
+
+def _get_normal_matrix_terms(extrinsic_matrices):
+    """Get the four 4x4 terms of the normal matrix of each camera for triangulate_points().
+
+    The two DLT equations of a camera view with rows P[0], P[1], P[2] of its [R|t] matrix and point (x, y) add
+    (x^2 + y^2) P[2]P[2]' - x (P[2]P[0]' + P[0]P[2]') - y (P[2]P[1]' + P[1]P[2]') + P[0]P[0]' + P[1]P[1]' to the
+    normal matrix, so each camera contributes a fixed set of four terms scaled by the coefficients of each point.
+    Returns an array of shape (num_cameras * 4, 16).
+    """
+    p0, p1, p2 = (extrinsic_matrices[:, i] for i in range(3))
+
+    def outer(a, b):
+        return a[:, :, None] * b[:, None, :]
+
+    terms = [outer(p2, p2), outer(p2, p0) + outer(p0, p2), outer(p2, p1) + outer(p1, p2), outer(p0, p0) + outer(p1, p1)]
+    return np.stack(terms, axis=1).reshape((len(extrinsic_matrices) * 4, 16))
+
+
+def distort_points(points, distortion_coefficients):
+    """Apply the radial-tangential lens distortion model to normalized image coordinates of shape (..., 2).
+
+    'distortion_coefficients' holds 4 (k1, k2, p1, p2), 5 (k1, k2, p1, p2, k3), or 8 (k1, k2, p1, p2, k3, k4, k5, k6)
+    coefficients, in the order and with the meaning of the OpenCV camera model, or is None for no distortion.
+    """
+    if distortion_coefficients is None:
+        return points
+    k1, k2, p1, p2, k3, k4, k5, k6 = _pad_distortion_coefficients(distortion_coefficients)
+    x, y = points[..., 0], points[..., 1]
+    r2 = x * x + y * y
+    radial = (1.0 + r2 * (k1 + r2 * (k2 + r2 * k3))) / (1.0 + r2 * (k4 + r2 * (k5 + r2 * k6)))
+    xy = 2.0 * x * y
+    distorted = np.empty(points.shape, dtype=np.result_type(points.dtype, np.float64))
+    distorted[..., 0] = x * radial + p1 * xy + p2 * (r2 + 2.0 * x * x)
+    distorted[..., 1] = y * radial + p1 * (r2 + 2.0 * y * y) + p2 * xy
+    return distorted
+
+
+def _pad_distortion_coefficients(distortion_coefficients):
+    """Get the 8 coefficients (k1, k2, p1, p2, k3, k4, k5, k6) from 4, 5, or 8 coefficients, padded with zeros."""
+    coefficients = np.asarray(distortion_coefficients, dtype=np.float64).ravel()
+    if len(coefficients) not in (4, 5, 8):
+        raise ValueError(
+            "The radial-tangential distortion model takes 4, 5, or 8 distortion coefficients, got %d."
+            % len(coefficients)
+        )
+    return np.concatenate([coefficients, np.zeros(8 - len(coefficients))])
+
+
+def project_to_camera(points, camera):
+    """Project 3D world points of shape (..., 3) into the pixel coordinates of a camera, with lens distortion.
+
+    'camera' is a posed CameraGeometry. Returns an array of shape (..., 2).
+    """
+    camera_points = points @ camera.rotation_matrix.T + camera.translation_vector
+    normalized = distort_points(camera_points[..., :2] / camera_points[..., 2:], camera.distortion_coefficients)
+    return normalized @ camera.intrinsic_matrix[:2, :2].T + camera.intrinsic_matrix[:2, 2]
+
+
+def _get_distortion_jacobian(points, coefficients):
+    """Get the distorted points and the 2x2 Jacobian of distort_points() at normalized points of shape (..., 2)."""
+    k1, k2, p1, p2, k3, k4, k5, k6 = coefficients
+    x, y = points[..., 0], points[..., 1]
+    r2 = x * x + y * y
+    numerator = 1.0 + r2 * (k1 + r2 * (k2 + r2 * k3))
+    denominator = 1.0 + r2 * (k4 + r2 * (k5 + r2 * k6))
+    radial = numerator / denominator
+    # derivative of the radial factor with respect to r^2
+    radial_derivative = (
+        (k1 + r2 * (2.0 * k2 + 3.0 * r2 * k3)) * denominator - numerator * (k4 + r2 * (2.0 * k5 + 3.0 * r2 * k6))
+    ) / denominator**2
+    distorted = np.stack(
+        [
+            x * radial + 2.0 * p1 * x * y + p2 * (r2 + 2.0 * x * x),
+            y * radial + p1 * (r2 + 2.0 * y * y) + 2.0 * p2 * x * y,
+        ],
+        axis=-1,
+    )
+    jacobian = np.empty(points.shape + (2,))
+    jacobian[..., 0, 0] = radial + 2.0 * x * x * radial_derivative + 2.0 * p1 * y + 6.0 * p2 * x
+    jacobian[..., 0, 1] = 2.0 * x * y * radial_derivative + 2.0 * p1 * x + 2.0 * p2 * y
+    jacobian[..., 1, 0] = 2.0 * x * y * radial_derivative + 2.0 * p1 * x + 2.0 * p2 * y
+    jacobian[..., 1, 1] = radial + 2.0 * y * y * radial_derivative + 6.0 * p1 * y + 2.0 * p2 * x
+    return distorted, jacobian
+
+
+def undistort_normalized_points(points, distortion_coefficients, max_iterations=20, tolerance=1e-12):
+    """Invert distort_points() for normalized image coordinates of shape (..., 2) by Newton's method.
+
+    All points are solved together: each iteration evaluates the distortion model and its 2x2 Jacobian for every
+    point that has not converged yet and takes one Newton step. A point has converged when its distorted position is
+    within 'tolerance' of the given one. A point is NaN if it is NaN, if it does not converge within 'max_iterations'
+    iterations, or if it converges to a solution past the fold of the distortion model, where the model is no longer
+    one-to-one, i.e., where the Jacobian has a negative determinant or the point is on the other side of the center.
+    """
+    if distortion_coefficients is None:
+        return points
+    coefficients = _pad_distortion_coefficients(distortion_coefficients)
+    points = np.asarray(points, dtype=np.float64)
+    flat_points = points.reshape((-1, 2))
+    undistorted = points.copy()
+    flat_undistorted = undistorted.reshape((-1, 2))
+    finite = np.flatnonzero(~np.isnan(flat_points).any(axis=-1))
+    flat_undistorted[np.isnan(flat_points).any(axis=-1)] = np.nan
+    active = finite
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iterations):
+            if not len(active):
+                break
+            distorted, jacobian = _get_distortion_jacobian(flat_undistorted[active], coefficients)
+            residual = distorted - flat_points[active]
+            converged = np.all(np.abs(residual) <= tolerance, axis=-1)
+            active = active[~converged]
+            residual, jacobian = residual[~converged], jacobian[~converged]
+            # Newton step: solve the 2x2 systems J * step = residual in closed form
+            determinant = jacobian[:, 0, 0] * jacobian[:, 1, 1] - jacobian[:, 0, 1] * jacobian[:, 1, 0]
+            step_x = (jacobian[:, 1, 1] * residual[:, 0] - jacobian[:, 0, 1] * residual[:, 1]) / determinant
+            step_y = (jacobian[:, 0, 0] * residual[:, 1] - jacobian[:, 1, 0] * residual[:, 0]) / determinant
+            flat_undistorted[active, 0] -= step_x
+            flat_undistorted[active, 1] -= step_y
+
+        distorted, jacobian = _get_distortion_jacobian(flat_undistorted[finite], coefficients)
+        valid = (
+            np.all(np.abs(distorted - flat_points[finite]) <= tolerance, axis=-1)
+            & (np.linalg.det(jacobian) > 0)
+            & (np.sum(flat_undistorted[finite] * flat_points[finite], axis=-1) >= 0)
+        )
+    flat_undistorted[finite[~valid]] = np.nan
+    return undistorted
+
+
+def undistort_points(points, intrinsic_matrix, distortion_coefficients, max_iterations=20, tolerance=1e-12):
+    """Remove lens distortion from pixel coordinates of shape (..., 2) and return them as pixel coordinates.
+
+    The points are converted to normalized image coordinates with the inverse of the intrinsic matrix K, undistorted
+    with undistort_normalized_points(), and converted back to pixels with K, i.e., to the positions at which an ideal
+    pinhole camera with the same K would have seen them. 'tolerance' is in normalized image coordinates.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if distortion_coefficients is None:
+        return points
+    intrinsic_matrix = np.asarray(intrinsic_matrix, dtype=np.float64)
+    normalized = undistort_normalized_points(
+        normalize_points(points, intrinsic_matrix),
+        distortion_coefficients,
+        max_iterations=max_iterations,
+        tolerance=tolerance,
+    )
+    return normalized @ intrinsic_matrix[:2, :2].T + intrinsic_matrix[:2, 2]
+
+
+class UndistortedPoseArray:
+    """Lazy, read-only view of 2D pixel positions with the lens distortion of a camera removed.
+
+    The view has the shape of the positions, e.g., (num_frames, 2) for a PoseEstimationSeries or (num_frames,
+    num_nodes, 2) for a stacked PoseEstimation. Indexing reads only the selected frames and undistorts that block
+    with undistort_points(), so ``iter_chunks`` processes a full recording block by block.
+    """
+
+    def __init__(self, data, intrinsic_matrix, distortion_coefficients, max_iterations=20, tolerance=1e-12):
+        self._data = unwrap_array(data)
+        if self._data.shape[-1] != 2:
+            raise ValueError("Only 2D positions can be undistorted, but the positions have shape %s." % (self.shape,))
+        self.intrinsic_matrix = np.asarray(intrinsic_matrix, dtype=np.float64)
+        self.distortion_coefficients = distortion_coefficients
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    @property
+    def shape(self):
+        return tuple(self._data.shape)
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1 :]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        # both coordinates are needed to undistort a position, so the coordinate axis is selected afterward
+        positions = _read_frames(self._data, key[:-1] + (slice(None),))
+        undistorted = undistort_points(
+            positions,
+            self.intrinsic_matrix,
+            self.distortion_coefficients,
+            max_iterations=self.max_iterations,
+            tolerance=self.tolerance,
+        )
+        return undistorted[..., key[-1]]
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over the undistorted positions in blocks of at most ``chunk_size`` frames.
+
+        Yields a tuple (frame_slice, block) for each block, where ``block`` equals ``self[frame_slice]``.
+        """
+        if chunk_size < 1:
+            raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+        for start in range(0, len(self), chunk_size):
+            frame_slice = slice(start, min(start + chunk_size, len(self)))
+            yield frame_slice, self[frame_slice]
+
+
+class UndistortedDataChunkIterator(LazyArrayDataChunkIterator):
+    """Data chunk iterator that writes an UndistortedPoseArray to a dataset one buffer of frames at a time.
+
+    Use it as the 'data' of a PoseEstimationSeries to write undistorted positions without holding all of them in
+    memory. Only the frames of the buffer being written are read from the source positions.
+    """
+
+
+def triangulate_points(points, extrinsic_matrices, weights):
+    """Triangulate 3D points from the 2D points of several camera views by weighted linear least squares (DLT).
+
+    'points' has shape (num_cameras, ..., 2) and holds normalized image coordinates, 'extrinsic_matrices' has shape
+    (num_cameras, 3, 4) and holds the [R|t] matrix of each camera, and 'weights' has shape (num_cameras, ...), with 0
+    for a camera view in which the point is missing. Each camera view contributes the two equations
+    w * (x * P[2] - P[0]) . X = 0 and w * (y * P[2] - P[1]) . X = 0 for the homogeneous point X = (X, Y, Z, 1), and
+    the point that minimizes the sum of their squares solves the 3x3 normal equations. The normal matrices of all
+    points are built with one matrix product over all cameras and solved in one batched call.
+
+    Returns the 3D points, with shape (..., 3), and the number of camera views used for each point. Points seen by
+    fewer than two camera views are NaN, and so are points whose normal matrix is singular to working precision.
+    """
+    extrinsic_matrices = np.asarray(extrinsic_matrices, dtype=np.float64)
+    present = weights > 0
+    x = np.where(present, points[..., 0], 0.0)
+    y = np.where(present, points[..., 1], 0.0)
+    squared_weights = np.where(present, weights, 0.0) ** 2
+    coefficients = np.stack([x**2 + y**2, -x, -y, np.ones_like(x)], axis=-1) * squared_weights[..., None]
+    coefficients = np.moveaxis(coefficients, 0, -2).reshape(points.shape[1:-1] + (-1,))  # (..., num_cameras * 4)
+    normal_matrices = (coefficients @ _get_normal_matrix_terms(extrinsic_matrices)).reshape(points.shape[1:-1] + (4, 4))
+
+    num_views = np.count_nonzero(present, axis=0)
+    # normal matrices that are singular to working precision, e.g., because the squares of tiny weights underflow or
+    # the rays of the camera views are parallel, have no unique solution. Their rank is found by the tolerance of
+    # np.linalg.matrix_rank.
+    singular_values = np.linalg.svd(normal_matrices[..., :3, :3], compute_uv=False)
+    singular = ~(singular_values[..., -1] > singular_values[..., 0] * 3 * np.finfo(np.float64).eps)
+    unsolvable = (num_views < 2) | singular
+    normal_matrices[unsolvable] = np.eye(4)  # solved, then replaced with NaN
+    triangulated = np.linalg.solve(normal_matrices[..., :3, :3], -normal_matrices[..., :3, 3:])[..., 0]
+    triangulated[unsolvable] = np.nan
+    return triangulated, num_views
+
+
+def get_reprojection_error(triangulated, points, cameras, weights):
+    """Get the root mean square distance, in pixels, between the projections of 3D points and the 2D points.
+
+    'points' has shape (num_cameras, ..., 2) and holds pixel coordinates, 'cameras' holds the CameraGeometry of each
+    camera, and only camera views with a weight above 0 are included. The projections include lens distortion.
+    """
+    squared_errors = np.zeros(triangulated.shape[:-1])
+    for camera_points, camera, camera_weights in zip(points, cameras, weights):
+        squared_error = np.sum((project_to_camera(triangulated, camera) - camera_points) ** 2, axis=-1)
+        squared_errors += np.where(camera_weights > 0, squared_error, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sqrt(squared_errors / np.count_nonzero(weights > 0, axis=0))
+
+
+def get_camera_geometry(pose_estimation, action="triangulate 3D positions"):
+    """Get the cached CameraGeometry of the CalibratedCamera of a PoseEstimation object.
+
+    Raises a ValueError that names 'action' if the PoseEstimation object does not link to a CalibratedCamera or the
+    camera has no rotation matrix or translation vector.
+    """
+    camera = pose_estimation.device
+    geometry = getattr(camera, "geometry", None)
+    if geometry is None:
+        raise ValueError("PoseEstimation '%s' must link to a CalibratedCamera to %s." % (pose_estimation.name, action))
+    if not geometry.is_posed:
+        raise ValueError(
+            "CalibratedCamera '%s' must have a rotation matrix and a translation vector to %s." % (camera.name, action)
+        )
+    return geometry
+
+
+def _get_num_frames(views, message):
+    """Get the number of frames of stacked views, which must all have the same number of frames."""
+    num_frames = {len(view) for view in views}
+    if len(num_frames) > 1:
+        raise ValueError("%s must have the same number of frames, but have %s." % (message, sorted(num_frames)))
+    return num_frames.pop()
+
+
+def get_camera_views(pose_estimations, nodes, positions=None):
+    """Check the camera views of synchronized PoseEstimation objects and get their cameras, views, and frame count.
+
+    Without 'positions', the views are checked for triangulation: there must be at least two 2D views. With
+    'positions', a stacked view of 3D positions, the views are checked for reprojection and must have as many frames
+    as 'positions'. Returns a tuple (cameras, views, num_frames) with the CameraGeometry and the stacked view of
+    each PoseEstimation object.
+    """
+    if positions is None:
+        action = "triangulate 3D positions"
+        if len(pose_estimations) < 2:
+            raise ValueError("At least two camera views are needed to triangulate 3D positions.")
+    else:
+        action = "reproject 3D positions"
+    cameras = [get_camera_geometry(pose_estimation, action) for pose_estimation in pose_estimations]
+    views = [pose_estimation.get_stacked_view(nodes=nodes) for pose_estimation in pose_estimations]
+    if positions is None:
+        for view in views:
+            if view.shape[2] != 2:
+                raise ValueError("The PoseEstimation objects of the camera views must hold 2D positions.")
+        num_frames = _get_num_frames(views, "The PoseEstimation objects of the camera views")
+    else:
+        num_frames = _get_num_frames([positions.data] + views, "The 3D series and the 2D series of the camera views")
+    return cameras, views, num_frames
+
+
+def _get_frame_range(frames, num_frames):
+    """Get 'frames', a slice of frames or None for all frames, as a slice with a start and a stop and step 1."""
+    start, stop, step = (slice(None) if frames is None else frames).indices(num_frames)
+    if step != 1:
+        raise ValueError("'frames' must be a slice with step 1, got %s." % frames)
+    return slice(start, max(start, stop))
+
+
+def _empty_triangulation(num_frames, num_nodes, num_cameras):
+    """Get a Triangulation of uninitialized arrays for 'num_frames' frames."""
+    shape = (num_frames, num_nodes)
+    return Triangulation(
+        data=np.empty(shape + (3,)),
+        confidence=np.empty(shape),
+        reprojection_error=np.empty(shape),
+        num_views=np.empty(shape, dtype=np.min_scalar_type(num_cameras)),
+    )
+
+
+def gather_triangulations(blocks, num_frames, num_nodes, num_cameras):
+    """Write the Triangulation of each (frame_slice, triangulation) block into one Triangulation of all frames."""
+    result = _empty_triangulation(num_frames, num_nodes, num_cameras)
+    for frames, block in blocks:
+        for field, values in zip(result, block):
+            field[frames] = values
+    return result
+
+
+def _triangulate_block(cameras, views, frames, min_confidence, error_scale):
+    """Triangulate the positions of the camera views in the frames of the slice 'frames'."""
+    points = np.stack([np.asarray(view.data[frames], dtype=np.float64) for view in views])
+    confidences = [None if view.confidence is None else view.confidence[frames] for view in views]
+    weights = np.stack([get_view_weights(p, c, min_confidence) for p, c in zip(points, confidences)])
+    normalized = np.stack(
+        [
+            undistort_normalized_points(normalize_points(p, camera.intrinsic_matrix), camera.distortion_coefficients)
+            for p, camera in zip(points, cameras)
+        ]
+    )
+    weights[np.isnan(normalized).any(axis=-1)] = 0.0  # positions that could not be undistorted
+    extrinsic_matrices = np.stack([camera.extrinsic_matrix for camera in cameras])
+    triangulated, num_views = triangulate_points(normalized, extrinsic_matrices, weights)
+    error = get_reprojection_error(triangulated, points, cameras, weights)
+    return Triangulation(
+        data=triangulated,
+        confidence=np.exp(-error / error_scale),
+        reprojection_error=error,
+        num_views=num_views.astype(np.min_scalar_type(len(views))),
+    )
+
+
+def triangulate(
+    pose_estimations,
+    nodes,
+    min_confidence=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    error_scale=DEFAULT_ERROR_SCALE,
+    frames=None,
+):
+    """Triangulate the 3D positions of 'nodes' from the 2D positions of synchronized PoseEstimation objects.
+
+    Each PoseEstimation object must link to a CalibratedCamera and have the same number of frames. The frames are
+    processed in blocks of at most 'chunk_size' frames, with all nodes of a block triangulated at once. The 2D
+    positions are undistorted with the distortion coefficients of each camera before they are triangulated, and the
+    reprojection error includes the distortion. Only the frames in the slice 'frames' are triangulated, if given. See
+    triangulate_points() and the Triangulation class.
+    """
+    cameras, views, num_frames = get_camera_views(pose_estimations, nodes)
+    frames = _get_frame_range(frames, num_frames)
+    blocks = (
+        (slice(block.start - frames.start, block.stop - frames.start), block)
+        for block in iter_frame_blocks(frames.stop, chunk_size, start=frames.start)
+    )
+    return gather_triangulations(
+        ((offset, _triangulate_block(cameras, views, block, min_confidence, error_scale)) for offset, block in blocks),
+        frames.stop - frames.start,
+        len(nodes),
+        len(views),
+    )
+
+
+def _reproject_block(positions, cameras, views, frames):
+    """Project the 3D positions in the frames of the slice 'frames' into each camera view."""
+    points = np.asarray(positions.data[frames], dtype=np.float64)
+    reprojections = []
+    for camera, view in zip(cameras, views):
+        projected = project_to_camera(points, camera)
+        error = np.linalg.norm(projected - np.asarray(view.data[frames], dtype=np.float64), axis=-1)
+        reprojections.append(Reprojection(data=projected, error=error))
+    return reprojections
+
+
+def reproject_frames(positions, pose_estimations, nodes, frames):
+    """Project the 3D positions in the frames of the slice 'frames' into each camera view.
+
+    See iter_reprojections(). Returns a list with one Reprojection per PoseEstimation object.
+    """
+    cameras, views, num_frames = get_camera_views(pose_estimations, nodes, positions=positions)
+    return _reproject_block(positions, cameras, views, _get_frame_range(frames, num_frames))
+
+
+def iter_reprojections(positions, pose_estimations, nodes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Project 3D positions into each camera view in blocks of at most 'chunk_size' frames.
+
+    'positions' is a stacked view of the 3D PoseEstimationSeries, with nodes in the order of 'nodes'. Each
+    PoseEstimation object must link to a CalibratedCamera and have the same number of frames as 'positions'. Yields a
+    tuple (frame_slice, reprojections) for each block, where 'reprojections' is a list with one Reprojection per
+    PoseEstimation object for the frames in 'frame_slice'.
+    """
+    cameras, views, num_frames = get_camera_views(pose_estimations, nodes, positions=positions)
+    for frames in iter_frame_blocks(num_frames, chunk_size):
+        yield frames, _reproject_block(positions, cameras, views, frames)
+
+
+def gather_reprojections(blocks, names, num_frames, num_nodes):
+    """Write the reprojections of each (frame_slice, reprojections) block into one Reprojection of all frames per
+    camera view, and return a dict from each name in 'names' to its Reprojection."""
+    results = {
+        name: Reprojection(data=np.empty((num_frames, num_nodes, 2)), error=np.empty((num_frames, num_nodes)))
+        for name in names
+    }
+    for frames, reprojections in blocks:
+        for result, reprojection in zip(results.values(), reprojections):
+            result.data[frames] = reprojection.data
+            result.error[frames] = reprojection.error
+    return results
+
+
+def reproject(positions, pose_estimations, nodes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Project 3D positions into each camera view and get the reprojection error of each camera, node, and frame.
+
+    See iter_reprojections(). Returns a dict from the name of each PoseEstimation object to a Reprojection of all
+    frames, assembled into arrays preallocated for the full recording.
+    """
+    return gather_reprojections(
+        iter_reprojections(positions, pose_estimations, nodes, chunk_size=chunk_size),
+        [pose_estimation.name for pose_estimation in pose_estimations],
+        len(positions),
+        len(nodes),
+    )
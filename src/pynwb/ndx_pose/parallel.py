@@ -0,0 +1,91 @@
+"""Run a computation over blocks of frames of a container read from an NWB file, in a pool of worker processes.
+
+Each worker process opens the file for reading once, when it starts, and looks up the container by its object ID.
+Blocks are sent to the workers as frame slices and their results are returned in order, with at most two blocks per
+worker in flight, so the memory used by each worker and by the results waiting to be consumed is bounded by the block
+size, not by the length of the recording.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import h5py
+from pynwb import NWBHDF5IO
+
+# the NWBHDF5IO object and NWBFile opened by a worker process, keyed by path
+_worker_files = dict()
+
+
+def _open_file(path):
+    """Open the NWB file at 'path' for reading in a worker process."""
+    # the parent process may hold the file open for writing, e.g., to add the results of the computation
+    file = h5py.File(path, mode="r", locking=False)
+    io = NWBHDF5IO(file=file, mode="r")
+    _worker_files[path] = (io, io.read())
+
+
+def _run_block(path, object_id, method, frames, kwargs):
+    """Call a method of the container with the given object ID for a block of frames, in a worker process."""
+    _, nwbfile = _worker_files[path]
+    return getattr(nwbfile.objects[object_id], method)(frames, **kwargs)
+
+
+def get_num_workers(num_workers):
+    """Check 'num_workers' and get the number of worker processes to use: all CPUs if it is None."""
+    if num_workers is None:
+        return os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError("'num_workers' must be a positive integer or None, got %s." % num_workers)
+    return num_workers
+
+
+def iter_frame_blocks(num_frames, chunk_size, start=0):
+    """Iterate over slices of at most 'chunk_size' frames that cover the frames from 'start' to 'num_frames'."""
+    if chunk_size < 1:
+        raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+    for block_start in range(start, num_frames, chunk_size):
+        yield slice(block_start, min(block_start + chunk_size, num_frames))
+
+
+def map_frame_blocks(container, method, num_frames, chunk_size, num_workers=1, **kwargs):
+    """Call ``container.<method>(frames, **kwargs)`` for each block of at most 'chunk_size' frames.
+
+    Yields a tuple (frames, result) for each block, in order. With one worker, the blocks are computed in this
+    process. With more workers, they are computed in a pool of 'num_workers' processes, or one per CPU if
+    'num_workers' is None. Each worker opens the file that the container was read from, so the container must have
+    been read from an NWB file, and the workers see the file as it was last written. The method, its arguments, and
+    its results must be picklable.
+    """
+    num_workers = get_num_workers(num_workers)
+    blocks = iter_frame_blocks(num_frames, chunk_size)
+    if num_workers == 1:
+        for frames in blocks:
+            yield frames, getattr(container, method)(frames, **kwargs)
+        return
+
+    path = container.container_source
+    if path is None or not os.path.isfile(path):
+        raise ValueError(
+            "%s '%s' must be read from an NWB file to be processed by more than one worker. Set 'num_workers' to 1 "
+            "to process it in this process." % (container.__class__.__name__, container.name)
+        )
+    executor = ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context("spawn"),  # forking a process with open HDF5 files is not safe
+        initializer=_open_file,
+        initargs=(path,),
+    )
+    pending = deque()
+    try:
+        for frames in blocks:
+            pending.append((frames, executor.submit(_run_block, path, container.object_id, method, frames, kwargs)))
+            if len(pending) >= 2 * num_workers:
+                frames, future = pending.popleft()
+                yield frames, future.result()
+        while pending:
+            frames, future = pending.popleft()
+            yield frames, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
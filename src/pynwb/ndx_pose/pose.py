@@ -1,20 +1,530 @@
 import warnings
+
+import numpy as np
+from hdmf.common import DynamicTable, DynamicTableRegion, VectorData, VectorIndex
 from hdmf.utils import docval, popargs, get_docval, AllowPositional
 from pynwb import register_class, TimeSeries, get_class
 from pynwb.behavior import SpatialSeries
-from pynwb.core import MultiContainerInterface
+from pynwb.core import MultiContainerInterface, NWBDataInterface
 from pynwb.device import Device
+from pynwb.file import Subject
 from pynwb.image import ImageSeries
 
-# TODO validate Skeleton nodes and edges correspondence, convert edges to uint
-# TODO validate that all Skeleton nodes are used in edges
-Skeleton = get_class("Skeleton", "ndx-pose")
+from .dataio import (
+    BUFFER_FRAMES,
+    DecodedArray,
+    LazyArrayDataChunkIterator,
+    apply_dataset_io_preset,
+    apply_storage_precision,
+)
+from .graph import SkeletonGraph, validate_skeleton
+from .kinematics import DEFAULT_CHUNK_SIZE, compute_bone_lengths, compute_in_chunks, compute_joint_angles
+from . import multiview, parallel, qc, resample, video
+from .views import (
+    MaskedPoseArray,
+    StackedPoseEstimationView,
+    TimeSlice,
+    get_time_index_bounds,
+    get_timestamps_slice,
+    unwrap_array,
+)
+
+
+@register_class("Skeleton", "ndx-pose")
+class Skeleton(NWBDataInterface):
+    """Node and edge data for defining parts of a pose and their connections to one another."""
+
+    __nwbfields__ = ("nodes", "edges", "subject")
+
+    @docval(
+        {"name": "name", "type": str, "doc": "Name of this Skeleton. Names should be unique in a file."},
+        {
+            "name": "nodes",
+            "type": ("array_data", "data"),
+            "shape": (None,),
+            "doc": (
+                "Array of body part names corresponding to the names of the PoseEstimationSeries objects or "
+                "PoseTraining objects."
+            ),
+        },
+        {
+            "name": "edges",
+            "type": ("array_data", "data"),
+            "shape": (None, 2),
+            "doc": (
+                "Array of pairs of indices corresponding to edges between nodes. Index values correspond to row "
+                "indices of the 'nodes' dataset. Index values use 0-indexing."
+            ),
+            "default": None,
+        },
+        {
+            "name": "subject",
+            "type": Subject,
+            "doc": "The Subject object in the NWB file, if this Skeleton corresponds to the Subject.",
+            "default": None,
+        },
+        allow_positional=AllowPositional.WARNING,
+    )
+    def __init__(self, **kwargs):
+        nodes, edges, subject = popargs("nodes", "edges", "subject", kwargs)
+        super().__init__(**kwargs)
+        if self._in_construct_mode:
+            # data read from a file is used as is, so that files with invalid nodes or edges can still be read
+            try:
+                validate_skeleton(nodes[:], None if edges is None else edges[:])
+            except ValueError as e:
+                warnings.warn("Skeleton '%s' read from the file is invalid: %s" % (self.name, e))
+        elif isinstance(nodes, (list, tuple, np.ndarray)):
+            # new nodes and edges are checked, and edges are stored as uint8 node indices, the dtype of the spec
+            if isinstance(edges, (list, tuple, np.ndarray)):
+                edges = validate_skeleton(nodes, edges)
+                if edges.size and edges.max() > np.iinfo(np.uint8).max:
+                    raise ValueError(
+                        "Skeleton edges are stored as uint8 node indices, so they can refer only to the first %d "
+                        "nodes, but edges refer to node index %d." % (np.iinfo(np.uint8).max + 1, edges.max())
+                    )
+                edges = edges.astype(np.uint8)
+            elif edges is None:
+                validate_skeleton(nodes, edges)
+        self.nodes = nodes
+        self.edges = edges
+        self.subject = subject
+        self._graph = None
+
+    @property
+    def graph(self):
+        """The SkeletonGraph of this Skeleton, with node lookup, adjacency, components, and traversal order.
+
+        The graph is built on first use and cached. After changing the nodes or edges, e.g., in place, call
+        reset_graph(). Building it raises a ValueError if the nodes or edges are invalid, e.g., if an edge refers to a
+        node that does not exist.
+        """
+        if self._graph is None:
+            self._graph = SkeletonGraph(self.nodes[:], None if self.edges is None else self.edges[:])
+        return self._graph
+
+    def reset_graph(self):
+        """Discard the cached graph, so that it is rebuilt, e.g., after the nodes or edges were changed in place."""
+        self._graph = None
+
+    def get_node_indices(self, nodes):
+        """Get the indices of the nodes with the given names as an array, using the cached node index."""
+        return self.graph.get_node_indices(nodes)
+
+
 Skeletons = get_class("Skeletons", "ndx-pose")
 SkeletonInstance = get_class("SkeletonInstance", "ndx-pose")
 SkeletonInstances = get_class("SkeletonInstances", "ndx-pose")
 TrainingFrame = get_class("TrainingFrame", "ndx-pose")
 TrainingFrames = get_class("TrainingFrames", "ndx-pose")
 SourceVideos = get_class("SourceVideos", "ndx-pose")
+
+
+def _get_column_description(table_cls, name):
+    """Get the description of the predefined column 'name' of a DynamicTable subclass."""
+    return next(column["description"] for column in table_cls.__columns__ if column["name"] == name)
+
+
+def _get_optional_values(objects, attr, table_cls):
+    """Get the value of 'attr' of each object, or None if no object has a value for 'attr'.
+
+    Raises a ValueError if only some of the objects have a value, because a column must have a value in every row.
+    """
+    values = [getattr(obj, attr) for obj in objects]
+    num_missing = sum(value is None for value in values)
+    if num_missing == len(values):
+        return None
+    if num_missing > 0:
+        raise ValueError(
+            "Cannot store '%s' in a %s because %d of %d %s objects have no '%s'. Either all or none of them must "
+            "have a value for it."
+            % (attr, table_cls.__name__, num_missing, len(values), type(objects[0]).__name__, attr)
+        )
+    return values
+
+
+def _get_target_timestamps(timestamps):
+    """Get the target timestamps of resampling from an array of timestamps or a TimeSeries."""
+    if isinstance(timestamps, TimeSeries):
+        return timestamps.get_timestamps() if timestamps.timestamps is None else timestamps.timestamps
+    return timestamps
+
+
+# selected rows of a table that are at most this many rows apart are read with one read of the rows between them
+ROW_READ_GAP = 256
+
+
+def _get_row_blocks(rows, max_gap):
+    """Group the given rows of a table into blocks of nearby rows, to read each column with one read per block.
+
+    Returns the sorted unique rows, the position of each given row in them, and a list of arrays with the sorted
+    unique rows of each block. Rows at most 'max_gap' rows apart are in the same block, so the rows read between the
+    selected rows are at most 'max_gap' rows per selected row, instead of the whole range from the first to the last.
+    """
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+    return unique_rows, inverse, np.split(unique_rows, np.flatnonzero(np.diff(unique_rows) > max_gap) + 1)
+
+
+def _read_rows(read, blocks):
+    """Read the values of the rows of each block with ``read(start, stop)``, one read per block, as a list."""
+    values = []
+    for block in blocks:
+        start = int(block[0])
+        block_values = read(start, int(block[-1]) + 1)
+        values.extend(block_values[i] for i in block - start)
+    return values
+
+
+def _read_ragged(index, start, stop):
+    """Read the values of rows 'start' to 'stop' of a ragged column as a list with one array per row.
+
+    Only the index entries of those rows and the range of the target dataset that they cover are read.
+    """
+    ends = np.asarray(index.data[start:stop], dtype=np.int64)
+    if len(ends) == 0:
+        return []
+    first = int(index.data[start - 1]) if start > 0 else 0
+    values = np.asarray(index.target.data[first : ends[-1]])
+    return np.split(values, ends[:-1] - first)
+
+
+def _read_column_rows(column, blocks):
+    """Read the values of the rows of each block of a column, with one read per block, as a list."""
+    return _read_rows(lambda start, stop: column.data[start:stop], blocks)
+
+
+def _read_ragged_rows(index, blocks):
+    """Read the values of the rows of each block of a ragged column, with one read per block, as a list of arrays."""
+    return _read_rows(lambda start, stop: _read_ragged(index, start, stop), blocks)
+
+
+@register_class("SkeletonInstancesTable", "ndx-pose")
+class SkeletonInstancesTable(DynamicTable):
+    """Ground-truth pose data for many instances of skeletons, one instance per row.
+
+    This stores the same data as many SkeletonInstance objects in a few large datasets. It is meant to be used within
+    a TrainingFramesTable, which is usually created from TrainingFrame objects with
+    TrainingFramesTable.from_training_frames.
+    """
+
+    __defaultname__ = "skeleton_instances_table"
+
+    __columns__ = (
+        {
+            "name": "skeleton",
+            "description": "Reference to the Skeleton that defines the layout of the nodes of each instance.",
+            "required": True,
+        },
+        {
+            "name": "node_locations",
+            "description": "Locations (x, y) or (x, y, z) of the nodes of each instance.",
+            "required": True,
+            "index": True,
+        },
+        {
+            "name": "node_visibility",
+            "description": "Markers for node visibility where true corresponds to a visible node.",
+            "index": True,
+        },
+        {"name": "instance_id", "description": "ID used to differentiate skeleton instances."},
+        {"name": "instance_name", "description": "Name of each instance, unique within its training frame."},
+    )
+
+    @docval(
+        {
+            "name": "name",
+            "type": str,
+            "doc": "Name of this SkeletonInstancesTable.",
+            "default": "skeleton_instances_table",
+        },
+        {
+            "name": "description",
+            "type": str,
+            "doc": "Description of this SkeletonInstancesTable.",
+            "default": "Ground-truth pose data for instances of skeletons.",
+        },
+        *get_docval(DynamicTable.__init__, "id", "columns", "colnames"),
+        allow_positional=AllowPositional.ERROR,
+    )
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    @classmethod
+    def from_skeleton_instances(cls, skeleton_instances, name="skeleton_instances_table"):
+        """Create a SkeletonInstancesTable with one row per SkeletonInstance, in order.
+
+        The node locations and node visibility of all instances are concatenated into one array each, so the table
+        is built without adding rows one at a time.
+        """
+        skeleton_instances = list(skeleton_instances)
+        node_locations = [np.asarray(instance.node_locations[:]) for instance in skeleton_instances]
+        if len({locations.shape[1:] for locations in node_locations}) > 1:
+            raise ValueError(
+                "Cannot store SkeletonInstance objects with both 2D and 3D node locations in one %s." % cls.__name__
+            )
+        num_nodes = np.array([len(locations) for locations in node_locations], dtype=np.uint64)
+        node_locations_column = VectorData(
+            name="node_locations",
+            description=_get_column_description(cls, "node_locations"),
+            data=np.concatenate(node_locations) if node_locations else np.zeros((0, 2)),
+        )
+        columns = [
+            VectorData(
+                name="skeleton",
+                description=_get_column_description(cls, "skeleton"),
+                data=[instance.skeleton for instance in skeleton_instances],
+            ),
+            VectorIndex(name="node_locations_index", target=node_locations_column, data=np.cumsum(num_nodes)),
+            node_locations_column,
+        ]
+
+        node_visibility = _get_optional_values(skeleton_instances, "node_visibility", cls)
+        if node_visibility is not None:
+            node_visibility = [np.asarray(visibility[:], dtype=bool) for visibility in node_visibility]
+            if any(len(visibility) != n for visibility, n in zip(node_visibility, num_nodes)):
+                raise ValueError(
+                    "Cannot store SkeletonInstance objects whose 'node_visibility' and 'node_locations' have "
+                    "different numbers of nodes in a %s."
+                    % cls.__name__
+                )
+            node_visibility_column = VectorData(
+                name="node_visibility",
+                description=_get_column_description(cls, "node_visibility"),
+                data=np.concatenate(node_visibility),
+            )
+            columns.append(
+                VectorIndex(name="node_visibility_index", target=node_visibility_column, data=np.cumsum(num_nodes))
+            )
+            columns.append(node_visibility_column)
+
+        instance_ids = _get_optional_values(skeleton_instances, "id", cls)
+        if instance_ids is not None:
+            columns.append(
+                VectorData(
+                    name="instance_id",
+                    description=_get_column_description(cls, "instance_id"),
+                    data=np.asarray(instance_ids, dtype=np.uint8),
+                )
+            )
+        columns.append(
+            VectorData(
+                name="instance_name",
+                description=_get_column_description(cls, "instance_name"),
+                data=[instance.name for instance in skeleton_instances],
+            )
+        )
+        return cls(name=name, columns=columns)
+
+    def get_skeleton_instances(self, rows=None):
+        """Create a SkeletonInstance object for each of the given rows, or for all rows by default.
+
+        The rows are sorted and grouped into blocks of rows at most ROW_READ_GAP rows apart, and each column is read
+        with one read per block, so scattered rows do not read the whole range between the first and the last row.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        unique_rows, inverse, blocks = _get_row_blocks(rows, ROW_READ_GAP)
+        node_locations = _read_ragged_rows(self.node_locations_index, blocks)
+        skeletons = _read_column_rows(self.skeleton, blocks)
+        node_visibility = instance_ids = names = None
+        if self.node_visibility is not None:
+            node_visibility = _read_ragged_rows(self.node_visibility_index, blocks)
+        if self.instance_id is not None:
+            instance_ids = np.asarray(_read_column_rows(self.instance_id, blocks), dtype=np.uint8)
+        if self.instance_name is not None:
+            names = _read_column_rows(self.instance_name, blocks)
+        return [
+            SkeletonInstance(
+                name="skeleton_instance_%d" % unique_rows[i] if names is None else str(names[i]),
+                id=None if instance_ids is None else instance_ids[i],
+                node_locations=node_locations[i],
+                node_visibility=None if node_visibility is None else node_visibility[i],
+                skeleton=skeletons[i],
+            )
+            for i in inverse
+        ]
+
+
+@register_class("TrainingFramesTable", "ndx-pose")
+class TrainingFramesTable(DynamicTable):
+    """Ground-truth position data for many training frames, one frame per row.
+
+    This stores the same data as a TrainingFrames object in a few large datasets: the instances of skeletons in all
+    frames are rows of a child SkeletonInstancesTable, and each frame refers to its instances through the ragged
+    'skeleton_instances' column. Writing and reading a TrainingFramesTable takes a few dataset operations instead
+    of several per frame, so use it instead of TrainingFrames when there are many training frames.
+
+    Use from_training_frames to create a TrainingFramesTable from TrainingFrame objects and to_training_frames or
+    get_training_frames to create TrainingFrame objects from it.
+    """
+
+    __defaultname__ = "training_frames_table"
+
+    __fields__ = ({"name": "skeleton_instances_table", "child": True},)
+
+    __columns__ = (
+        {
+            "name": "skeleton_instances",
+            "description": "Rows of the skeleton instances table that hold the instances in each training frame.",
+            "required": True,
+            "index": True,
+            "table": True,
+        },
+        {"name": "frame_name", "description": "Name of each training frame."},
+        {"name": "annotator", "description": "Name of annotator who labeled each training frame."},
+        {"name": "source_video", "description": "Reference to the ImageSeries that contains each training frame."},
+        {"name": "source_video_frame_index", "description": "Frame index of each training frame in 'source_video'."},
+        {"name": "source_frame", "description": "Reference to the Image that represents each training frame."},
+    )
+
+    @docval(
+        {
+            "name": "skeleton_instances_table",
+            "type": SkeletonInstancesTable,
+            "doc": "Position data for the instances of skeletons in all training frames.",
+        },
+        {
+            "name": "name",
+            "type": str,
+            "doc": "Name of this TrainingFramesTable.",
+            "default": "training_frames_table",
+        },
+        {
+            "name": "description",
+            "type": str,
+            "doc": "Description of this TrainingFramesTable.",
+            "default": "Ground-truth position data for training frames.",
+        },
+        *get_docval(DynamicTable.__init__, "id", "columns", "colnames"),
+        allow_positional=AllowPositional.ERROR,
+    )
+    def __init__(self, **kwargs):
+        skeleton_instances_table = popargs("skeleton_instances_table", kwargs)
+        super().__init__(target_tables={"skeleton_instances": skeleton_instances_table}, **kwargs)
+        self.skeleton_instances_table = skeleton_instances_table
+
+    @classmethod
+    def from_training_frames(cls, training_frames, name="training_frames_table"):
+        """Create a TrainingFramesTable with one row per TrainingFrame, in order.
+
+        'training_frames' is a TrainingFrames object or an iterable of TrainingFrame objects. The columns are built
+        from whole arrays, without adding rows one at a time. Optional fields of TrainingFrame and SkeletonInstance,
+        e.g., 'annotator' or 'node_visibility', are stored only if all objects have a value for them.
+        """
+        if isinstance(training_frames, TrainingFrames):
+            training_frames = training_frames.training_frames.values()
+        training_frames = list(training_frames)
+        frame_instances = [list(frame.skeleton_instances.skeleton_instances.values()) for frame in training_frames]
+        skeleton_instances_table = SkeletonInstancesTable.from_skeleton_instances(
+            [instance for instances in frame_instances for instance in instances]
+        )
+        num_instances = np.array([len(instances) for instances in frame_instances], dtype=np.uint64)
+        skeleton_instances = DynamicTableRegion(
+            name="skeleton_instances",
+            description=_get_column_description(cls, "skeleton_instances"),
+            data=np.arange(len(skeleton_instances_table)),
+            table=skeleton_instances_table,
+        )
+        columns = [
+            VectorIndex(name="skeleton_instances_index", target=skeleton_instances, data=np.cumsum(num_instances)),
+            skeleton_instances,
+            VectorData(
+                name="frame_name",
+                description=_get_column_description(cls, "frame_name"),
+                data=[frame.name for frame in training_frames],
+            ),
+        ]
+        for attr, dtype in (
+            ("annotator", None),
+            ("source_video", None),
+            ("source_video_frame_index", np.uint32),
+            ("source_frame", None),
+        ):
+            values = _get_optional_values(training_frames, attr, cls)
+            if values is not None:
+                columns.append(
+                    VectorData(
+                        name=attr,
+                        description=_get_column_description(cls, attr),
+                        data=values if dtype is None else np.asarray(values, dtype=dtype),
+                    )
+                )
+        return cls(name=name, skeleton_instances_table=skeleton_instances_table, columns=columns)
+
+    def get_training_frames(self, rows=None):
+        """Create a TrainingFrame object, with its SkeletonInstance objects, for each of the given rows.
+
+        By default, a TrainingFrame is created for every row. Each column is read with one read per block of nearby
+        rows. See SkeletonInstancesTable.get_skeleton_instances().
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        unique_rows, inverse, blocks = _get_row_blocks(rows, ROW_READ_GAP)
+        instance_rows = _read_ragged_rows(self.skeleton_instances_index, blocks)
+        selected_instance_rows = [instance_rows[i] for i in inverse]
+        skeleton_instances = iter(
+            self.skeleton_instances_table.get_skeleton_instances(np.concatenate(selected_instance_rows))
+        )
+        values = dict()
+        for attr in ("frame_name", "annotator", "source_video", "source_video_frame_index", "source_frame"):
+            column = getattr(self, attr)
+            values[attr] = None if column is None else _read_column_rows(column, blocks)
+        training_frames = list()
+        for i, frame_instance_rows in zip(inverse, selected_instance_rows):
+            training_frames.append(
+                TrainingFrame(
+                    name=(
+                        "frame_%d" % unique_rows[i] if values["frame_name"] is None else str(values["frame_name"][i])
+                    ),
+                    annotator=None if values["annotator"] is None else str(values["annotator"][i]),
+                    skeleton_instances=SkeletonInstances(
+                        skeleton_instances=[next(skeleton_instances) for _ in frame_instance_rows]
+                    ),
+                    source_video=None if values["source_video"] is None else values["source_video"][i],
+                    source_video_frame_index=(
+                        None
+                        if values["source_video_frame_index"] is None
+                        else np.uint32(values["source_video_frame_index"][i])
+                    ),
+                    source_frame=None if values["source_frame"] is None else values["source_frame"][i],
+                )
+            )
+        return training_frames
+
+    def get_training_frame(self, row):
+        """Create a TrainingFrame object, with its SkeletonInstance objects, for one row."""
+        return self.get_training_frames([row])[0]
+
+    def to_training_frames(self, name="training_frames"):
+        """Create a TrainingFrames object that holds a TrainingFrame object for every row of this table."""
+        return TrainingFrames(name=name, training_frames=self.get_training_frames())
+
+    def extract_source_frames(
+        self,
+        stacked=False,
+        name="training_frame_images",
+        num_workers=1,
+        max_skip=None,
+        batch_frames=video.DEFAULT_BATCH_FRAMES,
+    ):
+        """Extract the frame of each row from its 'source_video' at its 'source_video_frame_index'.
+
+        The requested frames are grouped by video file and sorted, so each video file is decoded once, in order, and
+        the video files are decoded in 'num_workers' processes, each of which decodes whole files or contiguous ranges
+        of frames. Each file is decoded forward between requested frames, seeking only past more than 'max_skip'
+        frames, by default the keyframe interval of the file. Returns an Images container with one image per row,
+        named after 'frame_name', or, if 'stacked' is True, a FrameDataChunkIterator that extracts the frames of all
+        rows as they are written into one dataset. Extracting frames from video files requires OpenCV. See
+        ndx_pose.video.extract_training_frames().
+        """
+        return video.extract_training_frames(
+            self, stacked=stacked, name=name, num_workers=num_workers, max_skip=max_skip, batch_frames=batch_frames
+        )
+
+
+# PoseTraining is generated after the registration of TrainingFramesTable, which it holds
 PoseTraining = get_class("PoseTraining", "ndx-pose")
 
 
@@ -90,6 +600,69 @@ class PoseEstimationSeries(SpatialSeries):
         self.confidence = confidence
         self.confidence_definition = confidence_definition
 
+    @property
+    def confidence_scale(self):
+        """The scale of 'confidence' values quantized to integers by set_storage_precision, or None."""
+        return self.confidence.scale if isinstance(self.confidence, DecodedArray) else None
+
+    def set_dataset_io_preset(self, preset):
+        """Set the HDF5 chunking and compression of the 'data', 'confidence', and 'timestamps' datasets by preset name.
+
+        Available presets are "sequential-scan" for reading full sessions, "random-window" for reading short time
+        windows, and "archive" for the smallest files. See ndx_pose.dataio.DATASET_IO_PRESETS. Call this before writing.
+        """
+        apply_dataset_io_preset(self, preset)
+
+    def set_storage_precision(self, dtype="float32", data_decimals=None, confidence_dtype=None):
+        """Store 'data' and 'confidence' with reduced precision to make files smaller and faster to read.
+
+        Both are stored as 'dtype', "float32" by default. If 'data_decimals' is given, 'data' is also quantized to that
+        many decimal places and stored as integers by the HDF5 scale-offset filter, e.g., data_decimals=2 for an error
+        of less than 0.01 pixels. If 'confidence_dtype' is "uint8" or "uint16", 'confidence' is quantized to that
+        integer type, with the scale stored in the 'scale' attribute of the dataset. Missing (NaN) values are stored
+        as reserved values. The datasets read as floats with NaN values, before writing and after reading the file.
+        Call this before writing.
+        """
+        apply_storage_precision(self, dtype=dtype, data_decimals=data_decimals, confidence_dtype=confidence_dtype)
+
+    def masked(self, min_confidence):
+        """Get a lazy view of 'data' in which positions with confidence below 'min_confidence' are NaN.
+
+        The mask is applied to each block of frames as it is read, e.g., ``series.masked(0.9)[t0:t1]`` reads and masks
+        only frames t0 to t1. Use the ``iter_chunks`` method of the view to process a full recording block by block.
+        """
+        return MaskedPoseArray(self.data, self.confidence, min_confidence)
+
+    def get_time_index_bounds(self, start_time, stop_time):
+        """Get the slice of frames with timestamps in the half-open interval [start_time, stop_time).
+
+        The bounds are found by bisection over the timestamps, which reads only O(log n) timestamps from a file, or
+        computed directly from 'rate' and 'starting_time' without reading anything.
+        """
+        return get_time_index_bounds(self, start_time, stop_time)
+
+    def get_time_slice(self, start_time, stop_time):
+        """Get the timestamps, data, and confidence for the frames in the time window [start_time, stop_time).
+
+        Only the frames in the window are read from the 'data' and 'confidence' datasets.
+        """
+        frames = self.get_time_index_bounds(start_time, stop_time)
+        confidence = unwrap_array(self.confidence)
+        return TimeSlice(
+            timestamps=get_timestamps_slice(self, frames),
+            data=np.asarray(unwrap_array(self.data)[frames]),
+            confidence=None if confidence is None else np.asarray(confidence[frames]),
+        )
+
+
+# the arguments of the PoseEstimationSeries constructor that PoseEstimation.share_timestamps copies from each series
+# that it replaces
+SERIES_CONSTRUCTOR_ARGS = tuple(
+    arg["name"]
+    for arg in get_docval(PoseEstimationSeries.__init__)
+    if arg["name"] not in ("timestamps", "starting_time", "rate")
+)
+
 
 @register_class("PoseEstimation", "ndx-pose")
 # NOTE: NWB MultiContainerInterface extends NWBDataInterface and HDMF MultiContainerInterface
@@ -362,6 +935,8 @@ class PoseEstimation(MultiContainerInterface):
         self.skeleton = skeleton
         self.source_video = source_video
         self.labeled_video = labeled_video
+        self._timestamps_cache = None
+        self._video_frame_index_cache = None
 
         # TODO include calibration images for 3D estimates?
         # TODO validate that the nodes correspond to the names of the pose estimation series objects
@@ -410,6 +985,396 @@ class PoseEstimation(MultiContainerInterface):
             "Setting PoseEstimation.devices is deprecated. Please use PoseEstimation.device instead."
         )
 
+    def _get_ordered_series(self, nodes=None):
+        """Return the node names and the PoseEstimationSeries for those nodes, in order.
+
+        By default, the nodes of the Skeleton are used, or the order in which the series were added if there is
+        no Skeleton.
+        """
+        if nodes is None:
+            if self.skeleton is not None:
+                nodes = [str(node) for node in self.skeleton.nodes[:]]
+            else:
+                nodes = list(self.pose_estimation_series.keys())
+        missing = [node for node in nodes if node not in self.pose_estimation_series]
+        if missing:
+            raise ValueError(
+                "PoseEstimation '%s' has no PoseEstimationSeries for the node(s) %s. Each node must have a "
+                "PoseEstimationSeries with the same name." % (self.name, missing)
+            )
+        return nodes, [self.pose_estimation_series[node] for node in nodes]
+
+    def get_stacked_view(self, nodes=None):
+        """Get a lazy (num_frames, num_nodes, num_dims) view over the PoseEstimationSeries of this object.
+
+        The view has 'data', 'confidence', and 'timestamps' arrays, with nodes in the order of the Skeleton nodes
+        unless 'nodes' is given. Slicing the 'data' or 'confidence' arrays, e.g., ``view.data[t0:t1, :, :]``, reads
+        only the selected frames of each series into a single preallocated output array.
+        """
+        nodes, pose_estimation_series = self._get_ordered_series(nodes)
+        return StackedPoseEstimationView(pose_estimation_series=pose_estimation_series, nodes=nodes)
+
+    def to_dataframe(self, nodes=None):
+        """Get the positions and confidence values of all nodes as a pandas DataFrame indexed by timestamps.
+
+        The columns have a (node, coordinate) MultiIndex, e.g., ("nose", "x"), ("nose", "y"), and
+        ("nose", "confidence"), with nodes in the order of the Skeleton nodes unless 'nodes' is given. The table is
+        built in one pass from the stacked arrays of get_stacked_view().
+        """
+        return self.get_stacked_view(nodes=nodes).to_dataframe()
+
+    def to_arrow(self, nodes=None):
+        """Get the timestamps, positions, and confidence values of all nodes as a pyarrow Table.
+
+        The table has a "timestamps" column and one column per node and coordinate, e.g., "nose_x", "nose_y", and
+        "nose_confidence", with nodes in the order of the Skeleton nodes unless 'nodes' is given. The columns wrap the
+        arrays read from the file without copying them. Requires pyarrow.
+        """
+        return self.get_stacked_view(nodes=nodes).to_arrow()
+
+    def get_time_slice(self, start_time, stop_time, nodes=None):
+        """Get the stacked timestamps, data, and confidence for the frames in the time window [start_time, stop_time).
+
+        The frame bounds are found from the timestamps of the first series, which all series share, by bisection or,
+        for series defined by 'rate', by direct computation. Only the frames in the window are read from each series.
+        See get_stacked_view() for the node order and the shapes of the returned arrays.
+        """
+        view = self.get_stacked_view(nodes=nodes)
+        first = next(iter(self.pose_estimation_series.values()))
+        frames = get_time_index_bounds(first, start_time, stop_time)
+        return TimeSlice(
+            timestamps=get_timestamps_slice(first, frames),
+            data=view.data[frames],
+            confidence=None if view.confidence is None else view.confidence[frames],
+        )
+
+    def _get_calibrated_camera(self):
+        if not isinstance(self.device, CalibratedCamera):
+            raise ValueError(
+                "PoseEstimation '%s' must link to a CalibratedCamera to undistort its positions." % self.name
+            )
+        return self.device
+
+    def get_undistorted_view(self, nodes=None):
+        """Get a lazy (num_frames, num_nodes, 2) view of the positions with the lens distortion of the camera removed.
+
+        The PoseEstimation must link to a CalibratedCamera. Indexing the view, e.g., ``view[t0:t1]``, reads only the
+        selected frames of each series and undistorts them at once. Use its ``iter_chunks`` method to process a full
+        recording block by block. See CalibratedCamera.undistort_points.
+        """
+        return self._get_calibrated_camera().get_undistorted_view(self.get_stacked_view(nodes=nodes).data)
+
+    def create_undistorted_pose_estimation(self, name, chunk_size=BUFFER_FRAMES):
+        """Create a PoseEstimation with a copy of each PoseEstimationSeries with the lens distortion removed.
+
+        The 'data' of each new series is a data chunk iterator that reads, undistorts, and writes at most
+        'chunk_size' frames at a time when the new PoseEstimation is written, so the undistorted positions are never
+        all held in memory. The confidence values are shared with the original series and the timestamps link to
+        those of the original series. The new PoseEstimation links to the same camera, skeleton, and source video.
+        Add it to the NWBFile and write it while the file of this PoseEstimation, if any, is open.
+        """
+        camera = self._get_calibrated_camera()
+        pose_estimation_series = []
+        for series in self.pose_estimation_series.values():
+            data = multiview.UndistortedDataChunkIterator(camera.get_undistorted_view(series.data), chunk_size)
+            if series.timestamps is None:
+                timing = dict(rate=series.rate, starting_time=series.starting_time)
+            else:
+                timing = dict(timestamps=series)
+            pose_estimation_series.append(
+                PoseEstimationSeries(
+                    name=series.name,
+                    data=data,
+                    reference_frame=series.reference_frame,
+                    confidence=series.confidence,
+                    unit=series.unit,
+                    confidence_definition=series.confidence_definition,
+                    conversion=series.conversion,
+                    description="%s Undistorted with the distortion coefficients of camera '%s'."
+                    % (series.description, camera.name),
+                    **timing,
+                )
+            )
+        return PoseEstimation(
+            name=name,
+            pose_estimation_series=pose_estimation_series,
+            description=self.description,
+            device=camera,
+            scorer=self.scorer,
+            source_software=self.source_software,
+            source_software_version=self.source_software_version,
+            skeleton=self.skeleton,
+            source_video=self.source_video,
+        )
+
+    def get_resampled_view(self, timestamps, nodes=None, method="linear", max_gap=None):
+        """Get a lazy (num_timestamps, num_nodes, num_dims) view of the positions resampled onto 'timestamps'.
+
+        'timestamps' is an increasing array of target times, e.g., the timestamps of another camera view or a common
+        clock, or a TimeSeries whose timestamps are used. 'method' is "nearest", "linear", or "confidence" for
+        interpolation weighted by the confidence of each position. With "linear" and "confidence", target times
+        outside the recording, or between two frames more than 'max_gap' seconds apart, are NaN. With "nearest",
+        target times outside the recording take the first or last frame, and only target times more than 'max_gap'
+        seconds from the nearest frame are NaN. Indexing the view, or its ``iter_chunks`` method, reads only the frames
+        around the selected target times. See resample.interpolate.
+        """
+        return resample.ResampledPoseEstimationView(
+            self.get_stacked_view(nodes=nodes), _get_target_timestamps(timestamps), method=method, max_gap=max_gap
+        )
+
+    def create_resampled_pose_estimation(
+        self, name, timestamps, method="linear", max_gap=None, chunk_size=BUFFER_FRAMES
+    ):
+        """Create a PoseEstimation with a copy of each PoseEstimationSeries resampled onto 'timestamps'.
+
+        The 'data' and 'confidence' of each new series are data chunk iterators that resample and write at most
+        'chunk_size' frames at a time when the new PoseEstimation is written. The first new series stores the target
+        timestamps and the others link to them. If 'timestamps' is a TimeSeries, e.g., a series of another
+        PoseEstimation, all new series link to its timestamps instead. See get_resampled_view() for the other
+        arguments. The new PoseEstimation links to the same camera, skeleton, and source video. Add it to the NWBFile
+        and write it while the file of this PoseEstimation, if any, is open.
+        """
+        target_timestamps = _get_target_timestamps(timestamps)
+        timestamps_link = None
+        if isinstance(timestamps, TimeSeries) and timestamps.timestamps is not None:
+            timestamps_link = timestamps
+        pose_estimation_series = []
+        for series in self.pose_estimation_series.values():
+            view = resample.ResampledPoseEstimationView(
+                StackedPoseEstimationView(pose_estimation_series=[series], nodes=[series.name]),
+                target_timestamps,
+                method=method,
+                max_gap=max_gap,
+            )
+            confidence = None
+            if view.confidence is not None:
+                confidence = LazyArrayDataChunkIterator(resample.ResampledPoseArray(view, "confidence", 0), chunk_size)
+            pose_estimation_series.append(
+                PoseEstimationSeries(
+                    name=series.name,
+                    data=LazyArrayDataChunkIterator(resample.ResampledPoseArray(view, "data", 0), chunk_size),
+                    reference_frame=series.reference_frame,
+                    confidence=confidence,
+                    unit=series.unit,
+                    confidence_definition=series.confidence_definition,
+                    conversion=series.conversion,
+                    description="%s Resampled onto new timestamps with %s interpolation."
+                    % (series.description, resample.RESAMPLING_METHODS[method]),
+                    timestamps=view.timestamps if timestamps_link is None else timestamps_link,
+                )
+            )
+            if timestamps_link is None:
+                timestamps_link = pose_estimation_series[0]  # link the other series to the first one
+        return PoseEstimation(
+            name=name,
+            pose_estimation_series=pose_estimation_series,
+            description=self.description,
+            device=self.device,
+            scorer=self.scorer,
+            source_software=self.source_software,
+            source_software_version=self.source_software_version,
+            skeleton=self.skeleton,
+            source_video=self.source_video,
+        )
+
+    def _get_skeleton_graph(self):
+        if self.skeleton is None:
+            raise ValueError(
+                "This PoseEstimation object has no Skeleton, so it has no edges or joints. Provide a 'skeleton' "
+                "argument to compute bone lengths and joint angles."
+            )
+        return self.skeleton.graph
+
+    def get_bone_lengths(self, min_confidence=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Get the length of each edge of the Skeleton in each frame as a (num_frames, num_edges) array.
+
+        Works for 2D and 3D positions. Only the series of nodes that are part of an edge are read, in blocks of at
+        most 'chunk_size' frames, and the lengths of all edges in a block are computed at once. If 'min_confidence'
+        is given, positions with confidence below it are NaN, and so are the lengths of the edges that use them.
+        Lengths are in the units of the stored data; multiply by 'conversion' of the series to get them in 'unit'.
+        """
+        edges = self._get_skeleton_graph().edges
+        return compute_in_chunks(
+            self, edges, compute_bone_lengths, min_confidence=min_confidence, chunk_size=chunk_size
+        )
+
+    def get_joint_angles(self, min_confidence=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Get the angle of each joint of the Skeleton in each frame as a (num_frames, num_joints) array, in radians.
+
+        A joint is a pair of edges that share a node, and its angle, between 0 and pi, is the one at that shared
+        node. The joints are given by Skeleton.graph.joints as (node, vertex, node) indices. Works for 2D and 3D
+        positions. Series are read in blocks of at most 'chunk_size' frames, and the angles of all joints in a block
+        are computed at once. If 'min_confidence' is given, positions with confidence below it are NaN, and so are
+        the angles of the joints that use them.
+        """
+        joints = self._get_skeleton_graph().joints
+        return compute_in_chunks(
+            self, joints, compute_joint_angles, min_confidence=min_confidence, chunk_size=chunk_size
+        )
+
+    def _create_series(self, name, data, unit, conversion, description):
+        """Create a TimeSeries of values computed from the PoseEstimationSeries, with the same timing."""
+        first = next(iter(self.pose_estimation_series.values()))
+        if first.timestamps is None:
+            timing = dict(rate=first.rate, starting_time=first.starting_time)
+        else:
+            timing = dict(timestamps=first)  # link to the timestamps of the first series
+        return TimeSeries(name=name, data=data, unit=unit, conversion=conversion, description=description, **timing)
+
+    def create_bone_lengths_series(self, name="bone_lengths", min_confidence=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Create a TimeSeries of the lengths from get_bone_lengths(), with one column per edge of the Skeleton.
+
+        The TimeSeries has the unit and conversion of the PoseEstimationSeries and links to the timestamps of the
+        first series, or has the same 'rate' and 'starting_time'. Its description lists the edges in column order.
+        Add it to the NWBFile, e.g., to the same processing module as this object, to write it.
+        """
+        graph = self._get_skeleton_graph()
+        first = next(iter(self.pose_estimation_series.values()))
+        columns = ", ".join("%s-%s" % (graph.nodes[a], graph.nodes[b]) for a, b in graph.edges)
+        description = "Length of each edge of the skeleton '%s' in each frame of PoseEstimation '%s'." % (
+            self.skeleton.name,
+            self.name,
+        )
+        description += " Columns: %s." % columns
+        if min_confidence is not None:
+            description += " Lengths are NaN where a node has confidence below %s." % min_confidence
+        data = self.get_bone_lengths(min_confidence=min_confidence, chunk_size=chunk_size)
+        return self._create_series(name, data, first.unit, first.conversion, description)
+
+    def create_joint_angles_series(self, name="joint_angles", min_confidence=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Create a TimeSeries of the angles from get_joint_angles(), in radians, with one column per joint.
+
+        The TimeSeries links to the timestamps of the first PoseEstimationSeries, or has the same 'rate' and
+        'starting_time'. Its description lists the joints in column order. Add it to the NWBFile to write it.
+        """
+        graph = self._get_skeleton_graph()
+        columns = ", ".join("%s-%s-%s" % tuple(graph.nodes[i] for i in joint) for joint in graph.joints)
+        description = (
+            "Angle at the middle node of each pair of connected edges of the skeleton '%s' in each frame of "
+            "PoseEstimation '%s'. Columns: %s." % (self.skeleton.name, self.name, columns)
+        )
+        if min_confidence is not None:
+            description += " Angles are NaN where a node has confidence below %s." % min_confidence
+        data = self.get_joint_angles(min_confidence=min_confidence, chunk_size=chunk_size)
+        return self._create_series(name, data, "radians", 1.0, description)
+
+    def set_dataset_io_preset(self, preset):
+        """Set the HDF5 chunking and compression of the datasets of all PoseEstimationSeries by preset name.
+
+        See PoseEstimationSeries.set_dataset_io_preset. Call this after share_timestamps(), if used, and before writing.
+        """
+        for series in self.pose_estimation_series.values():
+            series.set_dataset_io_preset(preset)
+
+    def set_storage_precision(self, dtype="float32", data_decimals=None, confidence_dtype=None):
+        """Store the 'data' and 'confidence' of all PoseEstimationSeries with reduced precision.
+
+        See PoseEstimationSeries.set_storage_precision. Call this before writing.
+        """
+        for series in self.pose_estimation_series.values():
+            series.set_storage_precision(dtype=dtype, data_decimals=data_decimals, confidence_dtype=confidence_dtype)
+
+    def share_timestamps(self):
+        """Store the timestamps once, in the first PoseEstimationSeries, and link to them from every other series.
+
+        All PoseEstimationSeries of a PoseEstimation object should have the same timestamps. By default, each series
+        writes its own copy of them. After calling this method, only the first series writes the 'timestamps' dataset
+        and the other series link to it, which makes the file smaller and reduces the amount of data written.
+
+        A TimeSeries links to the timestamps of another TimeSeries only if it is created with it as 'timestamps', so
+        each other series that does not link to the first series yet is replaced with a new PoseEstimationSeries with
+        the same name, data, and attributes that is created with ``timestamps=first_series``. Get the series from
+        'pose_estimation_series' after calling this method.
+
+        Raises a ValueError if the series do not all have the same timestamps, or if a TimeSeries outside this
+        PoseEstimation links to the timestamps or data of a series that would be replaced.
+        """
+        pose_estimation_series = list(self.pose_estimation_series.values())
+        if not pose_estimation_series:
+            return
+        owner = pose_estimation_series[0]
+        if owner.timestamps is None:
+            if any(series.timestamps is not None for series in pose_estimation_series):
+                raise ValueError(
+                    "Cannot share timestamps in PoseEstimation '%s': the first PoseEstimationSeries '%s' is defined "
+                    "by 'rate' but other series have timestamps." % (self.name, owner.name)
+                )
+            return  # series defined by 'rate' and 'starting_time' store no timestamps
+        owner_timestamps = unwrap_array(owner.timestamps)
+        others = pose_estimation_series[1:]
+        replaced = [series for series in others if series not in owner.timestamp_link]
+        for series in replaced:
+            timestamps = unwrap_array(series.timestamps)
+            if timestamps is not owner_timestamps and (
+                timestamps is None or not np.array_equal(timestamps[:], owner_timestamps[:])
+            ):
+                raise ValueError(
+                    "Cannot share timestamps in PoseEstimation '%s': the timestamps of PoseEstimationSeries '%s' "
+                    "differ from those of PoseEstimationSeries '%s'." % (self.name, series.name, owner.name)
+                )
+            if (series.timestamp_link | series.data_link) - set(others):
+                raise ValueError(
+                    "Cannot share timestamps in PoseEstimation '%s': PoseEstimationSeries '%s' would be replaced, "
+                    "but other TimeSeries link to its timestamps or data." % (self.name, series.name)
+                )
+        if not replaced:
+            return
+
+        # remove the other series and add them back in order, replacing those that do not link to the first series
+        for series in others:
+            del self.pose_estimation_series[series.name]
+        for series in others:
+            if series in replaced:
+                kwargs = {name: getattr(series, name) for name in SERIES_CONSTRUCTOR_ARGS}
+                series = PoseEstimationSeries(
+                    timestamps=owner, **{name: value for name, value in kwargs.items() if value is not None}
+                )
+            self.add_pose_estimation_series(series)
+        self._timestamps_cache = None
+
+    def get_timestamps(self):
+        """Get the timestamps shared by the PoseEstimationSeries of this object as an in-memory numpy array.
+
+        The timestamps of the first series are read on first access and cached. Series that link to the timestamps of
+        the first series, e.g., after share_timestamps() or when read from a file written that way, resolve to the same
+        dataset, so the shared array is read and held in memory only once. For series defined by 'rate' and
+        'starting_time', the timestamps are computed.
+        """
+        if not self.pose_estimation_series:
+            raise ValueError("PoseEstimation '%s' has no PoseEstimationSeries, so it has no timestamps." % self.name)
+        first = next(iter(self.pose_estimation_series.values()))
+        source = first.timestamps
+        if (
+            self._timestamps_cache is None
+            or self._timestamps_cache[0] is not first
+            or self._timestamps_cache[1] is not source
+        ):
+            timestamps = first.get_timestamps() if source is None else unwrap_array(source)[:]
+            self._timestamps_cache = (first, source, np.asarray(timestamps))
+        return self._timestamps_cache[2]
+
+    def get_video_frame_index(self, tolerance=None):
+        """Get the index between the rows of the pose estimates and the frames of the files of the source video.
+
+        Each row is matched to the nearest frame of 'source_video' in time, within 'tolerance' seconds, by default
+        half a video frame period. The index is computed on first access and cached until the timestamps or the
+        source video change. See VideoFrameIndex for the lookups in both directions.
+        """
+        if self.source_video is None:
+            raise ValueError(
+                "PoseEstimation '%s' has no source video, so its rows cannot be mapped to video frames." % self.name
+            )
+        timestamps = self.get_timestamps()
+        if (
+            self._video_frame_index_cache is None
+            or self._video_frame_index_cache[0] is not timestamps
+            or self._video_frame_index_cache[1] is not self.source_video
+            or self._video_frame_index_cache[2] != tolerance
+        ):
+            index = video.VideoFrameIndex.from_image_series(timestamps, self.source_video, tolerance=tolerance)
+            self._video_frame_index_cache = (timestamps, self.source_video, tolerance, index)
+        return self._video_frame_index_cache[3]
+
 
 @register_class("CalibratedCamera", "ndx-pose")
 class CalibratedCamera(Device):
@@ -477,6 +1442,71 @@ class CalibratedCamera(Device):
         self.rotation_matrix = rotation_matrix
         self.translation_vector = translation_vector
         self.distortion_coefficients = distortion_coefficients
+        self._geometry = None
+        self._geometry_key = None
+
+    def _get_geometry_key(self):
+        """Get a key that changes when the calibration of this CalibratedCamera changes.
+
+        Calibration arrays held in memory are compared by value, so that changes made in place are detected. Datasets
+        read from a file are compared by identity, so that they are not read again.
+        """
+        fields = (self.intrinsic_matrix, self.rotation_matrix, self.translation_vector, self.distortion_coefficients)
+        key = [id(data) for data in fields]
+        for data in fields:
+            if isinstance(data, (list, tuple, np.ndarray)):
+                key.append(np.asarray(data).tobytes())
+        return tuple(key)
+
+    @property
+    def geometry(self):
+        """The multiview.CameraGeometry of this camera, with its calibration and the matrices derived from it.
+
+        The geometry holds the calibration as float64 arrays, together with K[R|t], its pseudo-inverse, and the camera
+        center if the rotation matrix and translation vector are set. It is computed on first use and cached, so the
+        calibration datasets of a file are read only once. It is computed again when the calibration changes.
+        """
+        key = self._get_geometry_key()
+        if self._geometry is None or self._geometry_key != key:
+            self._geometry = multiview.CameraGeometry(
+                intrinsic_matrix=self.intrinsic_matrix[:],
+                rotation_matrix=None if self.rotation_matrix is None else self.rotation_matrix[:],
+                translation_vector=None if self.translation_vector is None else self.translation_vector[:],
+                distortion_coefficients=(
+                    None if self.distortion_coefficients is None else self.distortion_coefficients[:]
+                ),
+            )
+            self._geometry_key = key
+        return self._geometry
+
+    def undistort_points(self, points, max_iterations=20, tolerance=1e-12):
+        """Remove the lens distortion of this camera from pixel positions of shape (..., 2).
+
+        Supports the radial-tangential model with 4 (k1, k2, p1, p2), 5 (+ k3), or 8 (+ k4, k5, k6) coefficients, in
+        the order used by OpenCV. The distortion model is inverted for all positions at once by Newton's method, see
+        multiview.undistort_normalized_points. Positions that cannot be undistorted are NaN. Returns the undistorted
+        pixel positions, i.e., where a pinhole camera with the same intrinsic matrix would have seen them.
+        """
+        return multiview.undistort_points(
+            points,
+            self.geometry.intrinsic_matrix,
+            self.geometry.distortion_coefficients,
+            max_iterations=max_iterations,
+            tolerance=tolerance,
+        )
+
+    def get_undistorted_view(self, data, max_iterations=20, tolerance=1e-12):
+        """Get a lazy view of 2D pixel positions, e.g., the 'data' of a PoseEstimationSeries, without lens distortion.
+
+        Indexing the view reads and undistorts only the selected frames. See undistort_points().
+        """
+        return multiview.UndistortedPoseArray(
+            data,
+            self.geometry.intrinsic_matrix,
+            self.geometry.distortion_coefficients,
+            max_iterations=max_iterations,
+            tolerance=tolerance,
+        )
 
 
 @register_class("MultiCameraPoseEstimation", "ndx-pose")
@@ -589,3 +1619,287 @@ class MultiCameraPoseEstimation(MultiContainerInterface):
         self.source_software = source_software
         self.source_software_version = source_software_version
         self.skeleton = skeleton
+        self._camera_rig = None
+        self._camera_rig_key = None
+
+    def set_dataset_io_preset(self, preset):
+        """Set the HDF5 chunking and compression of the datasets of all 3D and per-camera series by preset name.
+
+        See PoseEstimationSeries.set_dataset_io_preset. Call this before writing.
+        """
+        for series in self.pose_estimation_series.values():
+            series.set_dataset_io_preset(preset)
+        for pose_estimation in self.pose_estimations.values():
+            pose_estimation.set_dataset_io_preset(preset)
+
+    def set_storage_precision(self, dtype="float32", data_decimals=None, confidence_dtype=None):
+        """Store the 'data' and 'confidence' of all 3D and per-camera series with reduced precision.
+
+        See PoseEstimationSeries.set_storage_precision. Call this before writing.
+        """
+        for series in self.pose_estimation_series.values():
+            series.set_storage_precision(dtype=dtype, data_decimals=data_decimals, confidence_dtype=confidence_dtype)
+        for pose_estimation in self.pose_estimations.values():
+            pose_estimation.set_storage_precision(
+                dtype=dtype, data_decimals=data_decimals, confidence_dtype=confidence_dtype
+            )
+
+    @property
+    def camera_rig(self):
+        """The multiview.CameraRig of the cameras of 'pose_estimations', with the matrices between each pair of them.
+
+        The rig holds the cached CalibratedCamera.geometry of each camera view, in the order of 'pose_estimations', and
+        the essential and fundamental matrices between each pair of cameras. It is computed on first use and cached.
+        It is computed again when a PoseEstimation is added or the calibration of a camera changes. Raises a
+        ValueError if a PoseEstimation does not link to a CalibratedCamera with a rotation matrix and a translation
+        vector.
+        """
+        action = "compute the geometry of the camera rig"
+        names = list(self.pose_estimations.keys())
+        cameras = [multiview.get_camera_geometry(pe, action) for pe in self.pose_estimations.values()]
+        key = tuple(names) + tuple(id(camera) for camera in cameras)
+        if self._camera_rig is None or self._camera_rig_key != key:
+            self._camera_rig = multiview.CameraRig(names, cameras)
+            self._camera_rig_key = key
+        return self._camera_rig
+
+    def _get_nodes(self, nodes=None):
+        """Get 'nodes', the Skeleton nodes, the nodes of the 3D series, or the nodes of the first camera view."""
+        if nodes is not None:
+            return list(nodes)
+        if self.skeleton is not None:
+            return [str(node) for node in self.skeleton.nodes[:]]
+        if self.pose_estimation_series:
+            return list(self.pose_estimation_series.keys())
+        if not self.pose_estimations:
+            raise ValueError("MultiCameraPoseEstimation '%s' has no PoseEstimation objects." % self.name)
+        return list(next(iter(self.pose_estimations.values())).pose_estimation_series.keys())
+
+    def _get_common_timestamps(self, timestamps=None):
+        """Get 'timestamps', or the timestamps of the first series of the first camera view if it is None."""
+        if timestamps is not None:
+            return timestamps
+        if not self.pose_estimations:
+            raise ValueError("MultiCameraPoseEstimation '%s' has no PoseEstimation objects." % self.name)
+        return next(iter(next(iter(self.pose_estimations.values())).pose_estimation_series.values()))
+
+    def get_resampled_views(self, timestamps=None, nodes=None, method="linear", max_gap=None):
+        """Get lazy views of the 2D positions of all camera views resampled onto one common clock.
+
+        'timestamps' is an increasing array of target times or a TimeSeries, and defaults to the timestamps of the
+        first camera view. Returns a dict from the name of each PoseEstimation to a
+        resample.ResampledPoseEstimationView, all with the same timestamps. See PoseEstimation.get_resampled_view for
+        the other arguments.
+        """
+        target_timestamps = _get_target_timestamps(self._get_common_timestamps(timestamps))
+        nodes = self._get_nodes(nodes)
+        return {
+            name: pose_estimation.get_resampled_view(target_timestamps, nodes=nodes, method=method, max_gap=max_gap)
+            for name, pose_estimation in self.pose_estimations.items()
+        }
+
+    def create_resampled_pose_estimations(
+        self, timestamps=None, method="linear", max_gap=None, chunk_size=BUFFER_FRAMES, suffix="_resampled"
+    ):
+        """Create a copy of each camera view with its PoseEstimationSeries resampled onto one common clock.
+
+        'timestamps' defaults to the timestamps of the first camera view. The new PoseEstimation objects are named
+        after the original ones with 'suffix' appended, and the series of all of them link to the same timestamps,
+        so a MultiCameraPoseEstimation created from them can be triangulated. Returns a list of the new
+        PoseEstimation objects. See PoseEstimation.create_resampled_pose_estimation for the other arguments.
+        """
+        timestamps = self._get_common_timestamps(timestamps)
+        resampled = []
+        for name, pose_estimation in self.pose_estimations.items():
+            resampled.append(
+                pose_estimation.create_resampled_pose_estimation(
+                    name + suffix, timestamps, method=method, max_gap=max_gap, chunk_size=chunk_size
+                )
+            )
+            if not isinstance(timestamps, TimeSeries) or timestamps.timestamps is None:
+                # link the series of the other camera views to the timestamps of the first new series
+                timestamps = next(iter(resampled[0].pose_estimation_series.values()))
+        return resampled
+
+    def triangulate(
+        self,
+        nodes=None,
+        min_confidence=None,
+        chunk_size=multiview.DEFAULT_CHUNK_SIZE,
+        error_scale=multiview.DEFAULT_ERROR_SCALE,
+        num_workers=1,
+    ):
+        """Triangulate the 3D positions of the nodes from the 2D pose estimates of all camera views.
+
+        Each PoseEstimation in 'pose_estimations' must link to a CalibratedCamera with a rotation matrix and a
+        translation vector, and all camera views must have the same number of frames. The 3D positions are found by
+        linear least squares (DLT) over the camera views in which a node is present, with each view weighted by the
+        confidence of its 2D position. Views with a NaN position, or with confidence below 'min_confidence', are left
+        out, and positions seen by fewer than two views are NaN. Frames are read and triangulated in blocks of at
+        most 'chunk_size' frames, with all frames and nodes of a block solved at once.
+
+        Returns a multiview.Triangulation with the (num_frames, num_nodes, 3) positions in world coordinates, the
+        root mean square reprojection error in pixels, a confidence of exp(-reprojection_error / error_scale), and
+        the number of camera views used for each position. Nodes are those of the Skeleton unless 'nodes' is given.
+        The 2D positions are undistorted with the distortion coefficients of each camera before they are
+        triangulated.
+
+        If 'num_workers' is more than 1, or None for one worker per CPU, the blocks are triangulated in a pool of
+        worker processes, each of which opens the file this object was read from. See parallel.map_frame_blocks.
+        """
+        nodes = self._get_nodes(nodes)
+        pose_estimations = list(self.pose_estimations.values())
+        _, _, num_frames = multiview.get_camera_views(pose_estimations, nodes)
+        blocks = parallel.map_frame_blocks(
+            self,
+            "_triangulate_frames",
+            num_frames,
+            chunk_size,
+            num_workers,
+            nodes=nodes,
+            min_confidence=min_confidence,
+            error_scale=error_scale,
+        )
+        return multiview.gather_triangulations(blocks, num_frames, len(nodes), len(pose_estimations))
+
+    def _triangulate_frames(self, frames, nodes, min_confidence, error_scale):
+        """Triangulate the 3D positions of the nodes in the frames of the slice 'frames', as one block."""
+        return multiview.triangulate(
+            list(self.pose_estimations.values()),
+            nodes,
+            min_confidence=min_confidence,
+            chunk_size=max(frames.stop - frames.start, 1),
+            error_scale=error_scale,
+            frames=frames,
+        )
+
+    def add_triangulated_series(
+        self,
+        unit,
+        reference_frame,
+        nodes=None,
+        min_confidence=None,
+        chunk_size=multiview.DEFAULT_CHUNK_SIZE,
+        error_scale=multiview.DEFAULT_ERROR_SCALE,
+        num_workers=1,
+    ):
+        """Triangulate the 3D positions of the nodes and add one 3D PoseEstimationSeries per node to this object.
+
+        'unit' is the unit of the translation vectors of the cameras, e.g., "millimeters", and 'reference_frame'
+        describes the origin of the world coordinates of the calibration. See triangulate() for the other arguments.
+        The confidence of each series is the reprojection confidence of its positions. The series link to the
+        timestamps of the first PoseEstimationSeries of the first camera view. Returns the Triangulation.
+        """
+        nodes = self._get_nodes(nodes)
+        result = self.triangulate(
+            nodes=nodes,
+            min_confidence=min_confidence,
+            chunk_size=chunk_size,
+            error_scale=error_scale,
+            num_workers=num_workers,
+        )
+        first = next(iter(self.pose_estimations.values())).pose_estimation_series[nodes[0]]
+        if first.timestamps is None:
+            timing = dict(rate=first.rate, starting_time=first.starting_time)
+        else:
+            timing = dict(timestamps=first)  # link to the timestamps of the first 2D series
+        confidence_definition = (
+            "exp(-e / %s), where e is the root mean square reprojection error, in pixels, over the camera views used "
+            "to triangulate the position." % error_scale
+        )
+        for j, node in enumerate(nodes):
+            self.add_pose_estimation_series(
+                PoseEstimationSeries(
+                    name=node,
+                    data=result.data[:, j],
+                    confidence=result.confidence[:, j],
+                    confidence_definition=confidence_definition,
+                    reference_frame=reference_frame,
+                    unit=unit,
+                    description="3D position of %s triangulated from %d camera views."
+                    % (node, len(self.pose_estimations)),
+                    **timing,
+                )
+            )
+        return result
+
+    def get_stacked_view(self, nodes=None):
+        """Get a lazy (num_frames, num_nodes, 3) view over the 3D PoseEstimationSeries of this object.
+
+        Nodes are in the order of the Skeleton nodes unless 'nodes' is given. See PoseEstimation.get_stacked_view.
+        """
+        nodes = self._get_nodes(nodes)
+        missing = [node for node in nodes if node not in self.pose_estimation_series]
+        if missing:
+            raise ValueError(
+                "MultiCameraPoseEstimation '%s' has no 3D PoseEstimationSeries for the node(s) %s."
+                % (self.name, missing)
+            )
+        return StackedPoseEstimationView(
+            pose_estimation_series=[self.pose_estimation_series[node] for node in nodes], nodes=nodes
+        )
+
+    def iter_reprojections(self, nodes=None, chunk_size=multiview.DEFAULT_CHUNK_SIZE, num_workers=1):
+        """Project the 3D positions into each camera view, including lens distortion, block by block.
+
+        Yields a tuple (frame_slice, reprojections) for each block of at most 'chunk_size' frames, where
+        'reprojections' has one multiview.Reprojection per PoseEstimation in 'pose_estimations', in order. Use this
+        to process a long recording with memory bounded by the block size. See reproject().
+        """
+        nodes = self._get_nodes(nodes)
+        positions = self.get_stacked_view(nodes=nodes)
+        _, _, num_frames = multiview.get_camera_views(list(self.pose_estimations.values()), nodes, positions=positions)
+        return parallel.map_frame_blocks(self, "_reproject_frames", num_frames, chunk_size, num_workers, nodes=nodes)
+
+    def _reproject_frames(self, frames, nodes):
+        """Project the 3D positions of the nodes in the frames of the slice 'frames' into each camera view."""
+        return multiview.reproject_frames(
+            self.get_stacked_view(nodes=nodes), list(self.pose_estimations.values()), nodes, frames
+        )
+
+    def reproject(self, nodes=None, chunk_size=multiview.DEFAULT_CHUNK_SIZE, num_workers=1):
+        """Project the 3D positions into each camera view and get the reprojection error of each node in each frame.
+
+        The 3D positions are projected with the intrinsic matrix, rotation matrix, translation vector, and
+        radial-tangential distortion coefficients of the CalibratedCamera of each PoseEstimation in
+        'pose_estimations'. All frames and nodes of a block of at most 'chunk_size' frames are projected at once,
+        in a pool of 'num_workers' worker processes if it is more than 1. See triangulate().
+
+        Returns a dict from the name of each PoseEstimation to a multiview.Reprojection, whose (num_frames, num_nodes,
+        2) 'data' is aligned with the stacked view of that PoseEstimation and whose (num_frames, num_nodes) 'error' is
+        the distance in pixels to its 2D positions. Nodes are those of the Skeleton unless 'nodes' is given.
+        """
+        nodes = self._get_nodes(nodes)
+        return multiview.gather_reprojections(
+            self.iter_reprojections(nodes=nodes, chunk_size=chunk_size, num_workers=num_workers),
+            list(self.pose_estimations.keys()),
+            len(self.get_stacked_view(nodes=nodes)),
+            len(nodes),
+        )
+
+    def get_reprojection_error_statistics(
+        self,
+        nodes=None,
+        chunk_size=multiview.DEFAULT_CHUNK_SIZE,
+        num_workers=1,
+        outlier_threshold=qc.DEFAULT_OUTLIER_THRESHOLD,
+        percentiles=qc.DEFAULT_PERCENTILES,
+    ):
+        """Compute statistics of the reprojection error of each camera view and node in one pass over the frames.
+
+        The 3D positions are reprojected into each camera view block by block, as in iter_reprojections(), and each
+        block is added to running statistics, so memory is bounded by the block size and the full reprojections are
+        never held at once. Returns a qc.ReprojectionErrorStatistics with the mean, root mean square, maximum,
+        'percentiles', and number of errors above 'outlier_threshold' pixels of each camera view and node, and of all
+        camera views per node. Use its to_table() method to store a summary of the statistics in the NWB file.
+        """
+        nodes = self._get_nodes(nodes)
+        statistics = qc.ReprojectionErrorStatistics(
+            cameras=list(self.pose_estimations.keys()),
+            nodes=nodes,
+            outlier_threshold=outlier_threshold,
+            percentiles=percentiles,
+        )
+        for _, reprojections in self.iter_reprojections(nodes=nodes, chunk_size=chunk_size, num_workers=num_workers):
+            statistics.update(reprojections)
+        return statistics
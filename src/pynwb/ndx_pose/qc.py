@@ -0,0 +1,182 @@
+"""Streaming statistics of the reprojection error of multi-camera pose estimates, for quality control.
+
+The statistics are accumulated block by block over the frames of a recording, so they are computed in one pass over
+the 2D and 3D series with memory bounded by the block size. Percentiles are read from a histogram of the errors with
+logarithmically spaced bins, so they are approximate to within the width of one bin.
+"""
+
+import numpy as np
+from hdmf.common import DynamicTable, VectorData
+
+DEFAULT_OUTLIER_THRESHOLD = 10.0
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+# bin edges, in pixels, of the histogram of errors: 0 and then 100 bins per decade from 1e-3 to 1e4 pixels, which
+# bounds the relative error of a percentile to about 2.3%. Errors from the last edge up are counted in one last bin.
+DEFAULT_HISTOGRAM_EDGES = np.concatenate([[0.0], np.geomspace(1e-3, 1e4, 701)])
+
+ALL_CAMERAS = "all"
+
+
+class ReprojectionErrorStatistics:
+    """Running statistics of the reprojection error of each camera view and node.
+
+    Call update() with the reprojections of each block of frames, e.g., from
+    MultiCameraPoseEstimation.iter_reprojections(). The statistics of each camera view and node are held in arrays of
+    shape (num_cameras, num_nodes). Errors that are NaN, because the 3D position or the 2D position is missing, are
+    counted in 'num_missing' and left out of the other statistics.
+
+    The statistics of all camera views together, per node, measure the consistency of the camera views: an error
+    above 'outlier_threshold' pixels in any view means that the 2D positions of the views do not agree with one 3D
+    position. See get_statistics() and to_table().
+    """
+
+    def __init__(
+        self,
+        cameras,
+        nodes,
+        outlier_threshold=DEFAULT_OUTLIER_THRESHOLD,
+        percentiles=DEFAULT_PERCENTILES,
+        histogram_edges=DEFAULT_HISTOGRAM_EDGES,
+    ):
+        self.cameras = [str(camera) for camera in cameras]
+        self.nodes = [str(node) for node in nodes]
+        self.outlier_threshold = float(outlier_threshold)
+        self.percentiles = tuple(float(q) for q in percentiles)
+        if any(q < 0 or q > 100 for q in self.percentiles):
+            raise ValueError("'percentiles' must be between 0 and 100, got %s." % list(self.percentiles))
+        self.histogram_edges = np.asarray(histogram_edges, dtype=np.float64)
+        if self.histogram_edges[0] != 0 or np.any(np.diff(self.histogram_edges) <= 0):
+            raise ValueError("'histogram_edges' must start at 0 and be strictly increasing.")
+
+        shape = (len(self.cameras), len(self.nodes))
+        self.num_frames = 0
+        self.num_valid = np.zeros(shape, dtype=np.int64)
+        self.num_outliers = np.zeros(shape, dtype=np.int64)
+        self.sum = np.zeros(shape)
+        self.sum_of_squares = np.zeros(shape)
+        self.max = np.full(shape, np.nan)
+        self.histogram = np.zeros(shape + (len(self.histogram_edges),), dtype=np.int64)
+        # number of frames in which the error of a node is above the outlier threshold in at least one camera view
+        self.num_inconsistent_frames = np.zeros(len(self.nodes), dtype=np.int64)
+
+    @property
+    def num_missing(self):
+        """The number of frames in which the error of each camera view and node is NaN."""
+        return self.num_frames - self.num_valid
+
+    def update(self, reprojections):
+        """Add the reprojection errors of one block of frames, with one Reprojection per camera view, in order."""
+        errors = np.stack([np.asarray(reprojection.error, dtype=np.float64) for reprojection in reprojections])
+        if errors.shape[0] != len(self.cameras) or errors.shape[2:] != (len(self.nodes),):
+            raise ValueError(
+                "The reprojection errors must have shape (num_frames, %d) for each of %d camera views, but have shape "
+                "%s." % (len(self.nodes), len(self.cameras), errors.shape[1:])
+            )
+        valid = ~np.isnan(errors)
+        outliers = errors > self.outlier_threshold  # NaN compares False
+        filled = np.where(valid, errors, 0.0)
+        self.num_frames += errors.shape[1]
+        self.num_valid += valid.sum(axis=1)
+        self.num_outliers += outliers.sum(axis=1)
+        self.sum += filled.sum(axis=1)
+        self.sum_of_squares += np.square(filled).sum(axis=1)
+        self.max = np.fmax(self.max, np.max(np.where(valid, errors, -np.inf), axis=1, initial=-np.inf))
+        self.max[np.isinf(self.max)] = np.nan
+        self.num_inconsistent_frames += outliers.any(axis=0).sum(axis=0)
+
+        # count the bin of every valid error of every cell of the histogram with one bincount
+        num_bins = len(self.histogram_edges)
+        bins = np.searchsorted(self.histogram_edges, filled, side="right") - 1
+        cells = np.arange(errors.shape[0] * errors.shape[2]).reshape(errors.shape[0], 1, errors.shape[2])
+        flat = (cells * num_bins + bins)[valid]
+        self.histogram += np.bincount(flat, minlength=self.histogram.size).reshape(self.histogram.shape)
+        return self
+
+    def _get_percentiles(self, histogram, maximum):
+        """Interpolate the percentiles of errors from their histogram, with shape (..., num_bins)."""
+        counts = np.cumsum(histogram, axis=-1)
+        total = counts[..., -1]
+        upper_edges = np.broadcast_to(np.append(self.histogram_edges[1:], np.inf), histogram.shape).copy()
+        upper_edges[..., -1] = np.maximum(maximum, self.histogram_edges[-1])
+        result = np.full(histogram.shape[:-1] + (len(self.percentiles),), np.nan)
+        for i, q in enumerate(self.percentiles):
+            rank = q / 100.0 * total
+            # first bin whose cumulative count reaches the rank, skipping empty bins for the 0th percentile
+            reached = (counts >= rank[..., None]) & (histogram > 0)
+            b = np.argmax(reached, axis=-1)[..., None]
+            count = np.take_along_axis(histogram, b, axis=-1)[..., 0]
+            before = np.take_along_axis(counts, b, axis=-1)[..., 0] - count
+            lower = self.histogram_edges[b[..., 0]]
+            upper = np.take_along_axis(upper_edges, b, axis=-1)[..., 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value = lower + np.clip((rank - before) / count, 0.0, 1.0) * (upper - lower)
+            result[..., i] = np.where(total > 0, np.fmin(value, maximum), np.nan)
+        return result
+
+    def get_statistics(self):
+        """Get the statistics of each camera view and node, and of all camera views per node.
+
+        Returns a dict of arrays with one row per camera view and node, in the order of 'cameras' and then 'nodes',
+        followed by one row per node for all camera views together, with camera "all". The errors are in pixels.
+        For the rows of all camera views, 'num_frames' and 'num_missing' count camera views and frames, and
+        'num_outliers' is the number of frames in which the error is above the outlier threshold in at least one
+        camera view.
+        """
+        num_cameras, num_nodes = len(self.cameras), len(self.nodes)
+        num_valid = np.concatenate([self.num_valid.ravel(), self.num_valid.sum(axis=0)])
+        total = np.concatenate([self.sum.ravel(), self.sum.sum(axis=0)])
+        total_of_squares = np.concatenate([self.sum_of_squares.ravel(), self.sum_of_squares.sum(axis=0)])
+        maximum = np.concatenate([self.max.ravel(), np.fmax.reduce(self.max, axis=0)])
+        histogram = np.concatenate([self.histogram.reshape(-1, len(self.histogram_edges)), self.histogram.sum(axis=0)])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(num_valid > 0, total / num_valid, np.nan)
+            rms = np.where(num_valid > 0, np.sqrt(total_of_squares / num_valid), np.nan)
+        statistics = dict(
+            camera=[camera for camera in self.cameras for _ in self.nodes] + [ALL_CAMERAS] * num_nodes,
+            node=self.nodes * (num_cameras + 1),
+            num_frames=np.full(len(num_valid), self.num_frames, dtype=np.int64),
+            num_missing=np.concatenate([self.num_missing.ravel(), self.num_missing.sum(axis=0)]),
+            num_outliers=np.concatenate([self.num_outliers.ravel(), self.num_inconsistent_frames]),
+            mean=mean,
+            rms=rms,
+            max=maximum,
+        )
+        statistics["num_frames"][-num_nodes:] *= num_cameras
+        for q, values in zip(self.percentiles, self._get_percentiles(histogram, maximum).T):
+            statistics["percentile_%g" % q] = values
+        return statistics
+
+    def to_table(self, name="reprojection_error", description=None):
+        """Create a DynamicTable of the statistics, with one row per camera view and node and one per node for all
+        camera views. See get_statistics(). Add the table to a processing module to store it in the NWB file."""
+        if description is None:
+            description = (
+                "Statistics of the reprojection error, in pixels, of each camera view and node, and of all camera "
+                "views per node (camera '%s'), with outliers above %g pixels." % (ALL_CAMERAS, self.outlier_threshold)
+            )
+        descriptions = dict(
+            camera="Name of the camera view, or '%s' for all camera views." % ALL_CAMERAS,
+            node="Name of the node.",
+            num_frames="Number of frames, times the number of camera views for the rows of all camera views.",
+            num_missing="Number of those errors that are NaN because the 2D or the 3D position is NaN.",
+            num_outliers=(
+                "Number of frames with an error above %g pixels, in at least one camera view for the rows of all "
+                "camera views."
+                % self.outlier_threshold
+            ),
+            mean="Mean error, in pixels.",
+            rms="Root mean square error, in pixels.",
+            max="Maximum error, in pixels.",
+        )
+        columns = []
+        for column_name, data in self.get_statistics().items():
+            if column_name.startswith("percentile_"):
+                column_description = (
+                    "Percentile %s of the error, in pixels, interpolated from a histogram of the errors."
+                    % column_name[len("percentile_") :]
+                )
+            else:
+                column_description = descriptions[column_name]
+            columns.append(VectorData(name=column_name, description=column_description, data=data))
+        return DynamicTable(name=name, description=description, columns=columns)
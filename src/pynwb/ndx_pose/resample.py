@@ -0,0 +1,245 @@
+"""Resampling of pose estimates onto a common clock, e.g., to align the camera views of a MultiCameraPoseEstimation
+whose cameras run at slightly different rates or with jitter."""
+
+import numpy as np
+
+from .views import _bisect, _normalize_frame_key, unwrap_array
+
+# resampling methods and their descriptions
+RESAMPLING_METHODS = {"nearest": "nearest-neighbor", "linear": "linear", "confidence": "confidence-weighted linear"}
+
+
+def merge_counts(source, target):
+    """Count, for each target timestamp, the source timestamps that are less than or equal to it.
+
+    Both arrays must be sorted in increasing order. They are merged with one stable sort of their concatenation,
+    which for two sorted runs is a linear-time merge, instead of one binary search per target timestamp.
+    """
+    source = np.asarray(source)
+    order = np.argsort(np.concatenate([source, np.asarray(target)]), kind="stable")
+    is_source = order < len(source)
+    return np.cumsum(is_source)[~is_source]
+
+
+def _search(timestamps, value, side="left"):
+    """Get the index at which 'value' would be inserted into sorted timestamps, reading O(log n) timestamps."""
+    if isinstance(timestamps, np.ndarray):
+        return int(np.searchsorted(timestamps, value, side=side))
+    if side == "right":
+        value = np.nextafter(value, np.inf)
+    return _bisect(timestamps, value, 0, len(timestamps))
+
+
+def get_source_window(source_timestamps, first, last):
+    """Get the slice of source frames needed to resample onto target timestamps from 'first' to 'last'.
+
+    The slice covers the source frames within [first, last] and one more frame on each side, if there is one.
+    """
+    start = max(_search(source_timestamps, first, side="left") - 1, 0)
+    stop = min(_search(source_timestamps, last, side="right") + 1, len(source_timestamps))
+    return slice(start, max(start, stop))
+
+
+def _blend(left, right, weight):
+    """Interpolate linearly from 'left' to 'right', using 'left' or 'right' as is where 'weight' is 0 or 1."""
+    weight = weight.reshape(weight.shape + (1,) * (left.ndim - 1))
+    blended = left + weight * (right - left)
+    return np.where(weight == 0, left, np.where(weight == 1, right, blended))
+
+
+def interpolate(source_timestamps, data, confidence, target_timestamps, method="linear", max_gap=None):
+    """Resample positions from sorted source timestamps onto sorted target timestamps.
+
+    'data' has shape (num_source_frames, ...) and 'confidence' has shape (num_source_frames, ...) without the
+    coordinate axis, or is None. The methods are:
+
+    - "nearest": the position and confidence of the nearest source frame, the earlier one on a tie
+    - "linear": linear interpolation of the positions and the confidence between the two source frames around each
+      target timestamp
+    - "confidence": like "linear", but each of the two positions is also weighted by its confidence, clipped to
+      [0, 1], and a NaN position has weight 0, so a missing or unreliable position is replaced by the other one. The
+      confidence is the sum of the two weights. NaN confidence counts as 1.
+
+    For "linear" and "confidence", target timestamps outside the source timestamps are NaN, and so are those between
+    two source frames more than 'max_gap' seconds apart. For "nearest", target timestamps outside the source
+    timestamps take the first or last source frame, e.g., when the last frame of one camera is slightly later than the
+    last frame of another, so only target timestamps more than 'max_gap' seconds from the nearest source frame are
+    NaN. Returns a tuple (data, confidence) of float64 arrays with one row per target timestamp; 'confidence' is None
+    if 'confidence' was None.
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError("'method' must be one of %s, got '%s'." % (list(RESAMPLING_METHODS), method))
+    if method == "confidence" and confidence is None:
+        raise ValueError("Confidence-weighted resampling requires confidence values.")
+    source_timestamps = np.asarray(source_timestamps, dtype=np.float64)
+    target_timestamps = np.asarray(target_timestamps, dtype=np.float64)
+    data = np.asarray(data, dtype=np.float64)
+    confidence = None if confidence is None else np.asarray(confidence, dtype=np.float64)
+    num_targets = len(target_timestamps)
+    if len(source_timestamps) == 0:
+        out_data = np.full((num_targets,) + data.shape[1:], np.nan)
+        return out_data, None if confidence is None else np.full(out_data.shape[:-1], np.nan)
+
+    counts = merge_counts(source_timestamps, target_timestamps)
+    last = len(source_timestamps) - 1
+    left = np.clip(counts - 1, 0, last)
+    right = np.clip(counts, 0, last)
+    before = target_timestamps - source_timestamps[left]
+    after = source_timestamps[right] - target_timestamps
+    if method == "nearest":
+        nearest = np.where(np.abs(before) <= np.abs(after), left, right)
+        valid = np.ones(num_targets, dtype=bool)
+        if max_gap is not None:
+            valid = np.abs(target_timestamps - source_timestamps[nearest]) <= max_gap
+        out_data = data[nearest]
+        out_confidence = None if confidence is None else confidence[nearest]
+    else:
+        gap = source_timestamps[right] - source_timestamps[left]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(gap > 0, before / gap, 0.0)
+        valid = (target_timestamps >= source_timestamps[0]) & (target_timestamps <= source_timestamps[last])
+        if max_gap is not None:
+            valid &= gap <= max_gap
+        if method == "linear":
+            out_data = _blend(data[left], data[right], weight)
+            out_confidence = None if confidence is None else _blend(confidence[left], confidence[right], weight)
+        else:
+            clipped = np.clip(np.where(np.isnan(confidence), 1.0, confidence), 0.0, 1.0)
+            present = ~np.isnan(data).any(axis=-1)
+            weight = weight.reshape(weight.shape + (1,) * (confidence.ndim - 1))
+            left_weight = np.where(present[left], (1 - weight) * clipped[left], 0.0)
+            right_weight = np.where(present[right], weight * clipped[right], 0.0)
+            out_confidence = left_weight + right_weight
+            weighted_sum = left_weight[..., None] * np.nan_to_num(data[left], nan=0.0)
+            weighted_sum += right_weight[..., None] * np.nan_to_num(data[right], nan=0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out_data = weighted_sum / out_confidence[..., None]
+            out_data[out_confidence == 0] = np.nan
+    out_data = np.array(out_data, dtype=np.float64)
+    out_data[~valid] = np.nan
+    if out_confidence is not None:
+        out_confidence = np.array(out_confidence, dtype=np.float64)
+        out_confidence[~valid] = np.nan
+    return out_data, out_confidence
+
+
+class ResampledPoseEstimationView:
+    """Lazy view of a StackedPoseEstimationView resampled onto target timestamps.
+
+    Like a StackedPoseEstimationView, the view has ``data`` with shape (num_target_frames, num_nodes, num_dims),
+    ``confidence`` with shape (num_target_frames, num_nodes) or None, and ``timestamps``, which are the target
+    timestamps. Indexing ``data`` or ``confidence`` reads only the source frames around the selected target frames, and
+    ``iter_chunks`` resamples a full recording block by block. Within each block, the target timestamps are matched to
+    the source timestamps by one sorted merge, so only the bounds of the block are searched. See interpolate() for the
+    methods and 'max_gap'.
+    """
+
+    def __init__(self, view, timestamps, method="linear", max_gap=None):
+        if method not in RESAMPLING_METHODS:
+            raise ValueError("'method' must be one of %s, got '%s'." % (list(RESAMPLING_METHODS), method))
+        if method == "confidence" and view.confidence is None:
+            raise ValueError("Confidence-weighted resampling requires confidence values.")
+        self.timestamps = np.asarray(unwrap_array(timestamps)[:], dtype=np.float64)
+        if self.timestamps.ndim != 1 or np.any(np.diff(self.timestamps) < 0):
+            raise ValueError("The target timestamps must be a 1D array in increasing order.")
+        self.nodes = view.nodes
+        self.method = method
+        self.max_gap = max_gap
+        self._view = view
+        self.data = ResampledPoseArray(self, "data")
+        self.confidence = None if view.confidence is None else ResampledPoseArray(self, "confidence")
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def resample(self, frames):
+        """Resample the positions at the target frames 'frames', a slice or an increasing array of frame indices.
+
+        Returns a tuple (data, confidence), where 'confidence' is None if the source has no confidence values.
+        """
+        target_timestamps = self.timestamps[frames]
+        if len(target_timestamps) == 0:
+            window = slice(0, 0)
+        else:
+            window = get_source_window(self._view.timestamps, target_timestamps[0], target_timestamps[-1])
+        source_confidence = None if self._view.confidence is None else self._view.confidence[window]
+        return interpolate(
+            np.asarray(self._view.timestamps[window]),
+            self._view.data[window],
+            source_confidence,
+            target_timestamps,
+            method=self.method,
+            max_gap=self.max_gap,
+        )
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over the resampled positions in blocks of at most ``chunk_size`` target frames.
+
+        Yields a tuple (frame_slice, data, confidence) for each block, where 'confidence' is None if the source has
+        no confidence values.
+        """
+        if chunk_size < 1:
+            raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+        for start in range(0, len(self), chunk_size):
+            frame_slice = slice(start, min(start + chunk_size, len(self)))
+            yield (frame_slice,) + self.resample(frame_slice)
+
+
+class ResampledPoseArray:
+    """Lazy, read-only array of the resampled 'data' or 'confidence' of a ResampledPoseEstimationView.
+
+    If 'node' is given, the array holds only the values of that node index, without the node axis, e.g., with shape
+    (num_target_frames, num_dims) for the 'data' of one PoseEstimationSeries.
+    """
+
+    def __init__(self, view, field, node=None):
+        self._view = view
+        self._field = field
+        self._node = node
+        source = view._view.data if field == "data" else view._view.confidence
+        item_shape = tuple(source.shape[1:])
+        if node is not None:
+            item_shape = item_shape[1:]
+        self._shape = (len(view.timestamps),) + item_shape
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1 :]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        selection, inverse, frame_shape = _normalize_frame_key(key[0], len(self))
+        if isinstance(selection, (int, np.integer)):
+            selection = slice(selection, selection + 1)
+        data, confidence = self._view.resample(selection)
+        values = data if self._field == "data" else confidence
+        if self._node is not None:
+            values = values[:, self._node]
+        if inverse is not None:
+            values = values[inverse]
+        values = values.reshape(frame_shape + values.shape[1:])
+        return values[(slice(None),) * len(frame_shape) + key[1:]]
@@ -0,0 +1,261 @@
+"""Write pose estimates incrementally, e.g., from live pose tracking, to resizable datasets in an NWB file.
+
+Create the PoseEstimation object with create_appendable_pose_estimation(), add it to the NWBFile, write the
+NWBFile with NWBHDF5IO, and, while the NWBHDF5IO object is still open, append batches of frames with a
+PoseEstimationAppender::
+
+    pose_estimation = create_appendable_pose_estimation(skeleton=skeleton, num_dims=2, device=camera)
+    behavior_pm.add(pose_estimation)
+    with NWBHDF5IO(path, mode="w") as io:
+        io.write(nwbfile)
+        with PoseEstimationAppender(pose_estimation) as appender:
+            for timestamps, data, confidence in tracker:
+                appender.append(data=data, confidence=confidence, timestamps=timestamps)
+"""
+
+import h5py
+import numpy as np
+from hdmf.backends.hdf5.h5_utils import H5DataIO
+from hdmf.utils import AllowPositional, docval, get_docval, getargs, popargs
+
+from .dataio import DecodedArray
+from .pose import PoseEstimation, PoseEstimationSeries, Skeleton
+
+# attribute of the PoseEstimation group with the number of frames of the last complete batch
+COMMITTED_FRAMES_ATTR = "num_committed_frames"
+
+
+@docval(
+    {"name": "skeleton", "type": Skeleton, "doc": "Skeleton of the pose estimates, with one series per node."},
+    {"name": "num_dims", "type": int, "doc": "Number of spatial dimensions of the positions, 2 or 3."},
+    {"name": "name", "type": str, "doc": "Name of the PoseEstimation object.", "default": "PoseEstimation"},
+    {
+        "name": "reference_frame",
+        "type": str,
+        "doc": "Description of the reference frame of the positions.",
+        "default": "(0,0) corresponds to the top-left corner of the video frame.",
+    },
+    {"name": "unit", "type": str, "doc": "Base unit of measurement of the positions.", "default": "pixels"},
+    {
+        "name": "confidence_definition",
+        "type": str,
+        "doc": "Description of how the confidence was computed.",
+        "default": None,
+    },
+    {
+        "name": "rate",
+        "type": (int, float),
+        "doc": "Sampling rate, in Hz, if the frames are regularly sampled. No timestamps are stored then.",
+        "default": None,
+    },
+    {
+        "name": "starting_time",
+        "type": (int, float),
+        "doc": "Time of the first frame, in seconds, if 'rate' is given.",
+        "default": None,
+    },
+    {
+        "name": "chunk_frames",
+        "type": int,
+        "doc": "Number of frames per chunk of the datasets, which are chunked along time.",
+        "default": 4096,
+    },
+    {"name": "dtype", "type": str, "doc": "Data type of the positions and confidence values.", "default": "float64"},
+    *get_docval(
+        PoseEstimation.__init__,
+        "description",
+        "device",
+        "scorer",
+        "source_software",
+        "source_software_version",
+        "source_video",
+        "labeled_video",
+    ),
+    is_method=False,
+    allow_positional=AllowPositional.ERROR,
+)
+def create_appendable_pose_estimation(**kwargs):
+    """Create a PoseEstimation object with empty, resizable datasets, one PoseEstimationSeries per skeleton node.
+
+    The 'data', 'confidence', and 'timestamps' datasets are created with zero frames and an unlimited first
+    dimension, chunked along time in blocks of 'chunk_frames' frames. The first series owns the 'timestamps' dataset
+    and the other series link to it, so each batch of timestamps is written only once. If 'rate' is given, no
+    timestamps are stored.
+
+    The other arguments, e.g., 'device', 'description', 'scorer', 'source_software', and 'source_video', are passed to
+    the PoseEstimation constructor.
+    """
+    skeleton, num_dims, name, reference_frame, unit, confidence_definition = popargs(
+        "skeleton", "num_dims", "name", "reference_frame", "unit", "confidence_definition", kwargs
+    )
+    rate, starting_time, chunk_frames, dtype = popargs("rate", "starting_time", "chunk_frames", "dtype", kwargs)
+    if num_dims not in (2, 3):
+        raise ValueError("'num_dims' must be 2 or 3, got %s." % num_dims)
+    if rate is None and starting_time is not None:
+        raise ValueError("'starting_time' can only be used together with 'rate'.")
+
+    # frames that were allocated but not written before a crash read as NaN, see PoseEstimationAppender
+    fillvalue = np.nan if np.dtype(dtype).kind == "f" else None
+    pose_estimation_series = []
+    for node in skeleton.nodes:
+        if rate is not None:
+            timing = dict(rate=float(rate), starting_time=float(starting_time or 0.0))
+        elif pose_estimation_series:
+            timing = dict(timestamps=pose_estimation_series[0])  # link to the timestamps of the first series
+        else:
+            timing = dict(
+                timestamps=H5DataIO(
+                    shape=(0,),
+                    dtype=np.dtype("float64"),
+                    maxshape=(None,),
+                    chunks=(chunk_frames,),
+                    fillvalue=np.nan,
+                )
+            )
+        pose_estimation_series.append(
+            PoseEstimationSeries(
+                name=node,
+                data=H5DataIO(
+                    shape=(0, num_dims),
+                    dtype=np.dtype(dtype),
+                    maxshape=(None, num_dims),
+                    chunks=(chunk_frames, num_dims),
+                    fillvalue=fillvalue,
+                ),
+                confidence=H5DataIO(
+                    shape=(0,), dtype=np.dtype(dtype), maxshape=(None,), chunks=(chunk_frames,), fillvalue=fillvalue
+                ),
+                reference_frame=reference_frame,
+                unit=unit,
+                confidence_definition=confidence_definition,
+                **timing,
+            )
+        )
+    return PoseEstimation(name=name, pose_estimation_series=pose_estimation_series, skeleton=skeleton, **kwargs)
+
+
+class PoseEstimationAppender:
+    """Append batches of frames for all nodes at once to a PoseEstimation created by create_appendable_pose_estimation.
+
+    The PoseEstimation object must have been written with an NWBHDF5IO object that is still open. Each call to
+    append() grows the 'data', 'confidence', and 'timestamps' datasets and writes the batch to them, so memory use does
+    not grow with the length of the session. The HDF5 file is flushed to disk every 'flush_every' batches; with the
+    default of 1, a crash loses at most the batch that was being written.
+
+    After all datasets of a batch are written, the number of frames of the complete batches is stored in the
+    "num_committed_frames" attribute of the PoseEstimation group. When an appender is created for a file that was
+    reopened after a crash, the datasets are truncated to that number of frames, so the frames of an incomplete batch
+    are dropped, whether the series have timestamps or a rate.
+    """
+
+    @docval(
+        {
+            "name": "pose_estimation",
+            "type": PoseEstimation,
+            "doc": "PoseEstimation created by create_appendable_pose_estimation() and written to an open file.",
+        },
+        {"name": "flush_every", "type": int, "doc": "Number of batches between flushes to disk.", "default": 1},
+    )
+    def __init__(self, **kwargs):
+        pose_estimation, flush_every = getargs("pose_estimation", "flush_every", kwargs)
+        if flush_every < 1:
+            raise ValueError("'flush_every' must be a positive integer, got %s." % flush_every)
+        self.pose_estimation = pose_estimation
+        self.flush_every = flush_every
+        nodes, pose_estimation_series = pose_estimation._get_ordered_series()
+        self.nodes = nodes
+        self._data = [self._get_dataset(series, "data") for series in pose_estimation_series]
+        self._confidence = [self._get_dataset(series, "confidence") for series in pose_estimation_series]
+        first = pose_estimation_series[0]
+        self._timestamps = None if first.rate is not None else self._get_dataset(first, "timestamps")
+        self._num_dims = self._data[0].shape[1]
+        self._group = self._data[0].parent.parent  # the group of the PoseEstimation
+        self.num_frames = self._get_num_complete_frames()
+        self._truncate(self.num_frames)
+        self._num_unflushed = 0
+
+    def _get_datasets(self):
+        datasets = self._data + self._confidence
+        return datasets if self._timestamps is None else datasets + [self._timestamps]
+
+    def _get_num_complete_frames(self):
+        """Get the number of frames of the last complete batch, or 0 if no batch was completed."""
+        return int(self._group.attrs.get(COMMITTED_FRAMES_ATTR, 0))
+
+    def _truncate(self, num_frames):
+        """Shrink the datasets that hold frames of an incomplete batch to 'num_frames' frames."""
+        for dataset in self._get_datasets():
+            if len(dataset) != num_frames:
+                dataset.resize(num_frames, axis=0)
+
+    def _get_dataset(self, series, field):
+        value = series.fields.get(field)
+        if isinstance(value, DecodedArray):
+            raise ValueError(
+                "The '%s' dataset of PoseEstimationSeries '%s' is stored with reduced precision and cannot be appended "
+                "to." % (field, series.name)
+            )
+        # an H5DataIO after writing, or an h5py Dataset after reading the file again to continue appending
+        dataset = value if isinstance(value, h5py.Dataset) else getattr(value, "dataset", None)
+        if dataset is None:
+            raise ValueError(
+                "The '%s' dataset of PoseEstimationSeries '%s' has not been written. Create the PoseEstimation with "
+                "create_appendable_pose_estimation() and write the NWBFile before appending." % (field, series.name)
+            )
+        if dataset.maxshape[0] is not None:
+            raise ValueError("The '%s' dataset of PoseEstimationSeries '%s' is not resizable." % (field, series.name))
+        return dataset
+
+    def append(self, data, confidence, timestamps=None):
+        """Append a batch of frames for all nodes.
+
+        'data' has shape (num_frames, num_nodes, num_dims) and 'confidence' has shape (num_frames, num_nodes), with
+        nodes in skeleton order. 'timestamps' has shape (num_frames,) and is required unless the series were created
+        with a 'rate'.
+        """
+        data = np.asarray(data)
+        confidence = np.asarray(confidence)
+        num_frames = len(data)
+        if data.shape != (num_frames, len(self.nodes), self._num_dims):
+            raise ValueError(
+                "'data' must have shape (num_frames, %d, %d), got %s." % (len(self.nodes), self._num_dims, data.shape)
+            )
+        if confidence.shape != (num_frames, len(self.nodes)):
+            raise ValueError(
+                "'confidence' must have shape (%d, %d), got %s." % (num_frames, len(self.nodes), confidence.shape)
+            )
+        if self._timestamps is not None:
+            if timestamps is None:
+                raise ValueError("'timestamps' are required because the series were not created with a 'rate'.")
+            timestamps = np.asarray(timestamps)
+            if timestamps.shape != (num_frames,):
+                raise ValueError("'timestamps' must have shape (%d,), got %s." % (num_frames, timestamps.shape))
+        elif timestamps is not None:
+            raise ValueError("'timestamps' cannot be appended because the series were created with a 'rate'.")
+
+        start, stop = self.num_frames, self.num_frames + num_frames
+        # grow all datasets first, so that they never have different lengths, and commit the batch last
+        for dataset in self._get_datasets():
+            dataset.resize(stop, axis=0)
+        for j in range(len(self.nodes)):
+            self._data[j][start:stop] = data[:, j]
+            self._confidence[j][start:stop] = confidence[:, j]
+        if self._timestamps is not None:
+            self._timestamps[start:stop] = timestamps
+        self._group.attrs[COMMITTED_FRAMES_ATTR] = stop
+        self.num_frames = stop
+
+        self._num_unflushed += 1
+        if self._num_unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Flush all appended frames to disk."""
+        self._data[0].file.flush()
+        self._num_unflushed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
@@ -16,8 +16,10 @@ from ...pose import (
     SkeletonInstance,
     SkeletonInstances,
     TrainingFrame,
+    TrainingFramesTable,
     Skeletons,
 )
+from ...multiview import CameraGeometry, project_to_camera
 
 
 def mock_PoseEstimationSeries(
@@ -156,6 +158,72 @@ def mock_CalibratedCamera(
     return camera
 
 
+def mock_projected_PoseEstimations(
+    *,
+    nwbfile: NWBFile,
+    skeleton: Skeleton,
+    points: np.ndarray,
+    num_cameras: int = 3,
+    distance: float = 1000.0,
+    timestamps: Optional[Any] = None,
+    distortion_coefficients: Optional[Any] = None,
+) -> List[PoseEstimation]:
+    """Create one PoseEstimation per CalibratedCamera with the projections of 3D 'points' into that camera.
+
+    'points' has shape (num_frames, num_nodes, 3), with nodes in the order of the Skeleton nodes. The cameras are
+    added to the NWBFile and placed at 'distance' from the origin on an arc around the y axis, looking at the origin.
+    If 'distortion_coefficients' is given, all cameras have that lens distortion and the projections include it.
+    The PoseEstimation objects are not added to the NWBFile.
+    """
+    if timestamps is None:
+        timestamps = np.arange(len(points)) / 30.0
+    intrinsic_matrix = np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]])
+    pose_estimations = []
+    for i, angle in enumerate(np.linspace(-0.6, 0.6, num_cameras)):
+        cos, sin = np.cos(angle), np.sin(angle)
+        rotation_matrix = np.array([[cos, 0.0, sin], [0.0, 1.0, 0.0], [-sin, 0.0, cos]])
+        translation_vector = np.array([0.0, 0.0, distance])
+        camera = CalibratedCamera(
+            name=f"camera{i + 1}",
+            intrinsic_matrix=intrinsic_matrix,
+            rotation_matrix=rotation_matrix,
+            translation_vector=translation_vector,
+            distortion_coefficients=distortion_coefficients,
+        )
+        nwbfile.add_device(camera)
+        projected = project_to_camera(
+            points,
+            CameraGeometry(
+                intrinsic_matrix=intrinsic_matrix,
+                rotation_matrix=rotation_matrix,
+                translation_vector=translation_vector,
+                distortion_coefficients=distortion_coefficients,
+            ),
+        )
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=node,
+                data=projected[:, j],
+                confidence=np.ones(len(points)),
+                timestamps=timestamps,
+                reference_frame="(0,0) corresponds to the top-left corner of the video frame.",
+            )
+            for j, node in enumerate(skeleton.nodes)
+        ]
+        pose_estimations.append(
+            mock_PoseEstimation(
+                nwbfile=nwbfile,
+                name=f"PoseEstimation_camera{i + 1}",
+                pose_estimation_series=pose_estimation_series,
+                skeleton=skeleton,
+                device=camera,
+                description=f"2D pose estimates from camera{i + 1}.",
+                add_to_nwbfile=False,
+            )
+        )
+    return pose_estimations
+
+
 def mock_MultiCameraPoseEstimation(
     *,
     nwbfile: NWBFile,
@@ -306,3 +374,26 @@ def mock_TrainingFrame(
         source_video_frame_index=source_video_frame_index,
     )
     return training_frame
+
+
+def mock_TrainingFramesTable(
+    *,
+    name: str = "training_frames_table",
+    training_frames: Optional[List[TrainingFrame]] = None,
+):
+    if training_frames is None:
+        skeleton = mock_Skeleton()
+        source_video = mock_source_video()
+        training_frames = [
+            mock_TrainingFrame(
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[
+                        mock_SkeletonInstance(id=np.uint(i), skeleton=skeleton) for i in range(num_instances)
+                    ]
+                ),
+                source_video=source_video,
+                source_video_frame_index=np.uint(num_instances),
+            )
+            for num_instances in (1, 2)
+        ]
+    return TrainingFramesTable.from_training_frames(training_frames, name=name)
@@ -0,0 +1,587 @@
+"""Index between the rows of pose estimates and the frames of the video files of their source video ImageSeries,
+and batch extraction of frames from those video files."""
+
+import itertools
+import multiprocessing
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from hdmf.data_utils import AbstractDataChunkIterator, DataChunk
+from pynwb.base import ImageReferences, Images
+from pynwb.image import GrayscaleImage, RGBAImage, RGBImage
+
+from .parallel import get_num_workers
+from .resample import merge_counts
+from .views import _read_frames, unwrap_array
+
+# the number of frames decoded and discarded to reach the next requested frame of a video file, beyond which the
+# reader seeks to it, if the keyframe interval of the video is not known. Seeking restarts decoding from the keyframe
+# before the frame, so it only saves work when it jumps over at least one keyframe.
+DEFAULT_MAX_SKIP = 64
+
+# the maximum number of frames decoded from the start of a video file to find the interval between its keyframes
+MAX_KEYFRAME_PROBE_FRAMES = 600
+
+# the maximum number of frames that are read at a time, and that a worker process decodes and sends back at a time
+DEFAULT_BATCH_FRAMES = 256
+
+
+def get_file_frames(starting_frames, video_frames):
+    """Get a tuple (file_indices, frames) with the file and the frame within that file of frames of an ImageSeries.
+
+    File i holds the frames of the ImageSeries from 'starting_frames[i]' on. Frames before 0 are in no file, and
+    their file index and frame are -1.
+    """
+    video_frames = np.asarray(video_frames, dtype=np.int64)
+    valid = video_frames >= 0
+    file_indices = np.where(valid, np.searchsorted(starting_frames, video_frames, side="right") - 1, -1)
+    return file_indices, np.where(valid, video_frames - starting_frames[np.maximum(file_indices, 0)], -1)
+
+
+def get_image_series_files(image_series):
+    """Get a tuple (files, starting_frames) with the files of an ImageSeries and the first frame of each file.
+
+    The files are the 'external_file' of the ImageSeries, as stored, with its 'starting_frame', or a single file None
+    if the frames are stored in the ImageSeries.
+    """
+    if image_series.external_file is None:
+        return [None], np.zeros(1, dtype=np.int64)
+    files = [str(file) for file in unwrap_array(image_series.external_file)[:]]
+    starting_frames = image_series.starting_frame
+    if starting_frames is None:
+        if len(files) > 1:
+            raise ValueError(
+                "ImageSeries '%s' has %d external files but no 'starting_frame'." % (image_series.name, len(files))
+            )
+        starting_frames = [0]
+    return files, np.asarray(unwrap_array(starting_frames)[:], dtype=np.int64)
+
+
+class VideoFrameIndex:
+    """Precomputed mapping between the rows of pose estimates and the frames of a video split across files.
+
+    The video is an ImageSeries whose frames are stored in the files 'files', where file i holds the frames of the
+    ImageSeries from 'starting_frames[i]' on. Each row, i.e., each timestamp in 'timestamps', is matched to the
+    nearest video frame in time, using the timestamps of the video or its rate and starting time. Rows farther than
+    'tolerance' seconds from every video frame, by default half a video frame period, have no video frame and map to
+    -1. The matching is computed once, with one sorted merge of the two sets of timestamps, so:
+
+    - get_video_frames() and get_file_frames() map rows to frames of the ImageSeries or of its files in O(1) per row
+    - get_rows() and get_rows_from_video_frames() map frames back to rows in O(log n) per frame
+
+    All lookups are vectorized over arrays of rows or frames.
+    """
+
+    def __init__(
+        self,
+        timestamps,
+        files,
+        starting_frames,
+        video_timestamps=None,
+        rate=None,
+        starting_time=0.0,
+        num_video_frames=None,
+        tolerance=None,
+    ):
+        self.files = list(files)
+        self.starting_frames = np.asarray(starting_frames, dtype=np.int64).ravel()
+        if len(self.starting_frames) != len(self.files):
+            raise ValueError(
+                "There must be one starting frame per file, but there are %d starting frames and %d files."
+                % (len(self.starting_frames), len(self.files))
+            )
+        if len(self.files) == 0 or self.starting_frames[0] != 0 or np.any(np.diff(self.starting_frames) <= 0):
+            raise ValueError("The starting frames of the files must start at 0 and be strictly increasing.")
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+
+        if video_timestamps is not None:
+            video_timestamps = np.asarray(video_timestamps, dtype=np.float64)
+            num_video_frames = len(video_timestamps)
+            if tolerance is None:
+                tolerance = 0.5 * np.median(np.diff(video_timestamps)) if num_video_frames > 1 else np.inf
+            if num_video_frames == 0:
+                nearest = np.zeros(len(timestamps), dtype=np.int64)
+                offset = np.full(len(timestamps), np.inf)
+            else:
+                counts = merge_counts(video_timestamps, timestamps)
+                left = np.clip(counts - 1, 0, num_video_frames - 1)
+                right = np.clip(counts, 0, num_video_frames - 1)
+                use_left = np.abs(timestamps - video_timestamps[left]) <= np.abs(video_timestamps[right] - timestamps)
+                nearest = np.where(use_left, left, right)
+                offset = timestamps - video_timestamps[nearest]
+        elif rate is not None:
+            if tolerance is None:
+                tolerance = 0.5 / rate
+            nearest = np.rint((timestamps - starting_time) * rate).astype(np.int64)
+            offset = timestamps - (starting_time + nearest / rate)
+        else:
+            raise ValueError("The timing of the video must be given by 'video_timestamps' or 'rate'.")
+        self.tolerance = float(tolerance)
+        self.num_video_frames = num_video_frames
+
+        valid = (np.abs(offset) <= self.tolerance) & (nearest >= 0)
+        if num_video_frames is not None:
+            valid &= nearest < num_video_frames
+        self.video_frames = np.where(valid, nearest, -1)
+        self.file_indices, self.file_frames = get_file_frames(self.starting_frames, self.video_frames)
+
+        # the video frames of the rows that have one, which increase with the row, for the reverse lookups
+        self._valid_rows = np.flatnonzero(valid)
+        self._valid_video_frames = self.video_frames[self._valid_rows]
+
+    @classmethod
+    def from_image_series(cls, timestamps, image_series, tolerance=None):
+        """Create the index between rows with 'timestamps' and the frames of an ImageSeries.
+
+        The files are those of get_image_series_files(). Rows after the last frame of the ImageSeries, as given by its
+        timestamps or 'num_samples', have no video frame.
+        """
+        files, starting_frames = get_image_series_files(image_series)
+        if image_series.external_file is not None:
+            # the data of an external ImageSeries is empty, so 0 frames means that the number of frames is not known
+            num_video_frames = image_series.num_samples or None
+        else:
+            num_video_frames = len(unwrap_array(image_series.data))
+        video_timestamps = image_series.timestamps
+        if video_timestamps is not None:
+            video_timestamps = unwrap_array(video_timestamps)[:]
+        return cls(
+            timestamps=timestamps,
+            files=files,
+            starting_frames=starting_frames,
+            video_timestamps=video_timestamps,
+            rate=image_series.rate,
+            starting_time=image_series.starting_time or 0.0,
+            num_video_frames=num_video_frames,
+            tolerance=tolerance,
+        )
+
+    def __len__(self):
+        """The number of rows."""
+        return len(self.video_frames)
+
+    def get_video_frames(self, rows):
+        """Get the frame of the ImageSeries of each row, or -1 for rows without a video frame."""
+        return self.video_frames[rows]
+
+    def get_file_frames(self, rows):
+        """Get a tuple (file_indices, frames) with the index of the file and the frame within that file of each row.
+
+        Both are -1 for rows without a video frame. Use get_file_names() to get the names of the files.
+        """
+        return self.file_indices[rows], self.file_frames[rows]
+
+    def get_file_names(self, file_indices):
+        """Get the name of the file of each file index, or None for index -1, as an object array."""
+        file_indices = np.asarray(file_indices)
+        names = np.array(self.files + [None], dtype=object)
+        return names[np.where(file_indices < 0, len(self.files), file_indices)]
+
+    def get_rows_from_video_frames(self, video_frames):
+        """Get the first row matched to each frame of the ImageSeries, or -1 for frames without a row."""
+        video_frames = np.asarray(video_frames, dtype=np.int64)
+        if len(self._valid_rows) == 0:
+            return np.full(video_frames.shape, -1, dtype=np.int64)
+        positions = np.searchsorted(self._valid_video_frames, video_frames, side="left")
+        clipped = np.minimum(positions, len(self._valid_rows) - 1)
+        found = (positions < len(self._valid_rows)) & (self._valid_video_frames[clipped] == video_frames)
+        return np.where(found, self._valid_rows[clipped], -1)
+
+    def get_rows(self, file_indices, frames):
+        """Get the first row matched to each frame 'frames' of the file 'file_indices', or -1 for frames without a row.
+
+        A frame number past the end of its file, i.e., at or after the starting frame of the next file, has no row.
+        """
+        file_indices, frames = np.broadcast_arrays(np.asarray(file_indices, np.int64), np.asarray(frames, np.int64))
+        if np.any((file_indices < 0) | (file_indices >= len(self.files))):
+            raise IndexError("File indices must be between 0 and %d." % (len(self.files) - 1))
+        video_frames = self.starting_frames[file_indices] + frames
+        next_starting_frames = np.append(self.starting_frames[1:], np.iinfo(np.int64).max)[file_indices]
+        in_file = (frames >= 0) & (video_frames < next_starting_frames)
+        return np.where(in_file, self.get_rows_from_video_frames(np.where(in_file, video_frames, -1)), -1)
+
+
+def resolve_external_file(image_series, file):
+    """Get the path of an external file of an ImageSeries, which is relative to the NWB file that the ImageSeries was
+    read from, or to the current directory if it was not read from a file."""
+    if os.path.isabs(file) or image_series.container_source is None:
+        return file
+    return os.path.join(os.path.dirname(os.path.abspath(image_series.container_source)), file)
+
+
+def get_seeks(frames, max_skip, position=0):
+    """Get whether to seek to each frame of increasing, unique frame indices read in order from 'position' on.
+
+    A frame is sought if it is before 'position', the index of the next frame that the reader decodes, or if reaching
+    it by decoding forward from the previous frame read, or from 'position', would decode and discard more than
+    'max_skip' frames.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    skipped = frames - np.concatenate([[position], frames[:-1] + 1])
+    return (skipped < 0) | (skipped > max_skip)
+
+
+def _import_cv2():
+    try:
+        import cv2
+    except ImportError:
+        raise ImportError('Extracting frames from video files requires OpenCV: pip install "ndx-pose[video]"')
+    return cv2
+
+
+def _open_capture(cv2, path):
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError("Cannot open video file '%s'." % path)
+    return capture
+
+
+def get_keyframe_interval(path, max_frames=MAX_KEYFRAME_PROBE_FRAMES):
+    """Get the number of frames from the first keyframe of a video file to the next, with OpenCV.
+
+    The frames are decoded from the start of the file, without converting them, until the second intra-coded frame,
+    so this decodes one keyframe interval. Returns 'max_frames' if none of the next 'max_frames' frames after the
+    first one is a keyframe, or the file ends before one, and None if the video backend of OpenCV does not report the
+    type of the frames.
+    """
+    cv2 = _import_cv2()
+    frame_type = getattr(cv2, "CAP_PROP_FRAME_TYPE", None)
+    if frame_type is None:
+        return None
+    capture = _open_capture(cv2, path)
+    try:
+        for position in range(max_frames + 1):
+            if not capture.grab():
+                break
+            picture_type = int(capture.get(frame_type))
+            if picture_type == 0:  # not reported by the backend
+                return None
+            if position > 0 and picture_type == ord("I"):
+                return position
+        return max_frames
+    finally:
+        capture.release()
+
+
+class VideoReader:
+    """Reader of frames of a video file, given as increasing frame indices, with OpenCV.
+
+    The reader keeps its position in the video between calls of read(), so frames requested in increasing order over
+    several calls are decoded once, in order. Each frame is reached by decoding forward from the previous frame read,
+    unless that would decode and discard more than 'max_skip' frames, in which case the reader seeks to it. If
+    'max_skip' is None, it is the keyframe interval of the video, see get_keyframe_interval(), so the reader seeks
+    only past at least one keyframe, or DEFAULT_MAX_SKIP if the interval is not known. Requires OpenCV.
+    """
+
+    def __init__(self, path, max_skip=None):
+        self._cv2 = _import_cv2()
+        self.path = path
+        if max_skip is None:
+            max_skip = get_keyframe_interval(path)
+            max_skip = DEFAULT_MAX_SKIP if max_skip is None else max_skip
+        self.max_skip = max_skip
+        self._capture = _open_capture(self._cv2, path)
+        self._position = 0  # index of the next frame that the capture decodes
+
+    def read(self, frames):
+        """Iterate over the frames with the given increasing, unique indices, as RGB arrays of shape (height, width,
+        3), as they are decoded."""
+        cv2 = self._cv2
+        frames = np.asarray(frames, dtype=np.int64)
+        for frame, seek in zip(frames, get_seeks(frames, self.max_skip, self._position)):
+            if seek:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, int(frame))
+                self._position = frame
+            while self._position < frame:
+                if not self._capture.grab():  # decodes a frame without converting it
+                    break
+                self._position += 1
+            success, image = self._capture.read()
+            if self._position != frame or not success:
+                raise IndexError("Cannot read frame %d of video file '%s'." % (frame, self.path))
+            self._position += 1
+            yield cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def close(self):
+        self._capture.release()
+
+
+def iter_video_frames(path, frames, max_skip=None):
+    """Iterate over frames of a video file, given as increasing, unique frame indices, with OpenCV.
+
+    The video is decoded once, in order, seeking only past more than 'max_skip' frames, by default the keyframe
+    interval of the video. See VideoReader. Yields an array of shape (height, width, 3) with each RGB frame, as it is
+    decoded. Requires OpenCV.
+    """
+    reader = VideoReader(path, max_skip)
+    try:
+        yield from reader.read(frames)
+    finally:
+        reader.close()
+
+
+def read_video_frames(path, frames, max_skip=None):
+    """Read frames of a video file, given as increasing, unique frame indices, with OpenCV.
+
+    See iter_video_frames(). Returns an array of shape (num_frames, height, width, 3) with the RGB frames.
+    """
+    images = list(iter_video_frames(path, frames, max_skip))
+    return np.stack(images) if images else np.empty((0, 0, 0, 3), dtype=np.uint8)
+
+
+# the VideoReader of the video file that a worker process read from last, which is kept open so that the next batch of
+# frames of the same file is decoded from where the previous batch ended
+_worker_reader = None
+
+
+def _read_video_batch(path, frames, max_skip):
+    """Read a batch of frames of a video file in a worker process, continuing from the previous batch of that file."""
+    global _worker_reader
+    if _worker_reader is None or _worker_reader.path != path:
+        if _worker_reader is not None:
+            _worker_reader.close()
+        _worker_reader = None  # not left set to a closed reader if the file cannot be opened
+        _worker_reader = VideoReader(path, max_skip)
+    images = list(_worker_reader.read(frames))
+    return np.stack(images) if images else np.empty((0, 0, 0, 3), dtype=np.uint8)
+
+
+def assign_frame_ranges(tasks, num_workers):
+    """Assign the requested frames of video files, given as (path, frames) pairs, to at most 'num_workers' workers.
+
+    Each worker gets whole video files, so it decodes each of them once, in order, from its first requested frame.
+    A file with more requested frames than an even share of all requested frames per worker is split into
+    contiguous ranges of at most that many frames. The ranges are assigned, longest first, to the worker with the
+    fewest frames. Returns a list with a list of (path, frames) ranges per worker, in the order of 'tasks'.
+    """
+    total = sum(len(frames) for _, frames in tasks)
+    share = max(-(-total // num_workers), 1)
+    ranges = [
+        (task, start, frames[start : start + share])
+        for task, (_, frames) in enumerate(tasks)
+        for start in range(0, len(frames), share)
+    ]
+    workers = [list() for _ in range(min(num_workers, len(ranges)))]
+    loads = np.zeros(len(workers), dtype=np.int64)
+    for task, start, frames in sorted(ranges, key=lambda item: -len(item[2])):
+        worker = int(np.argmin(loads))
+        workers[worker].append((task, start, frames))
+        loads[worker] += len(frames)
+    return [[(tasks[task][0], frames) for task, _, frames in sorted(worker)] for worker in workers]
+
+
+def _group_requests(requests):
+    """Group requested frames of ImageSeries, given as (image_series, frame_index) pairs, by video file.
+
+    Returns a dict {key: {frame: positions}} with the positions of the requests of each frame of each video file, or
+    of each ImageSeries that stores its frames, and a dict {key: image_series} with those ImageSeries.
+    """
+    requested = defaultdict(lambda: defaultdict(list))
+    internal = dict()
+    files = dict()
+    for position, (image_series, frame) in enumerate(requests):
+        if image_series.external_file is None:
+            internal[id(image_series)] = image_series
+            requested[id(image_series)][int(frame)].append(position)
+            continue
+        if id(image_series) not in files:
+            files[id(image_series)] = get_image_series_files(image_series)
+        image_series_files, starting_frames = files[id(image_series)]
+        file_index, file_frame = get_file_frames(starting_frames, frame)
+        if file_index < 0:
+            raise IndexError("Frame index %d of ImageSeries '%s' is negative." % (frame, image_series.name))
+        path = resolve_external_file(image_series, image_series_files[file_index])
+        requested[path][int(file_frame)].append(position)
+    return requested, internal
+
+
+def iter_frames(requests, num_workers=1, max_skip=None, batch_frames=DEFAULT_BATCH_FRAMES):
+    """Extract frames of ImageSeries, given as an iterable of (image_series, frame_index) pairs.
+
+    The requested frames are grouped by file and sorted, so each video file is decoded once, in order, and each frame
+    requested more than once is decoded once. A video file is decoded forward from one requested frame to the next,
+    unless that would decode and discard more than 'max_skip' frames, in which case the reader seeks to the frame. By
+    default, 'max_skip' is the keyframe interval of each video file, see VideoReader.
+
+    With more than one worker, the video files are decoded in 'num_workers' worker processes, or one per CPU if
+    'num_workers' is None. Each worker decodes whole video files, or contiguous ranges of the requested frames of
+    long ones, see assign_frame_ranges(), and sends the frames back in batches of at most 'batch_frames' frames. At
+    most two batches per worker are held in memory. Frames stored in an ImageSeries are read in batches of at most
+    'batch_frames' frames.
+
+    Yields a tuple (positions, image) for each distinct requested frame, as it is extracted, with the positions of the
+    requests of that frame. The frames are yielded grouped by file, not in the order of the requests.
+    """
+    num_workers = get_num_workers(num_workers)
+    requested, internal = _group_requests(requests)
+    tasks = list()
+    for key, positions in requested.items():
+        frames = np.array(sorted(positions), dtype=np.int64)
+        if key in internal:
+            data = unwrap_array(internal[key].data)
+            data = data if hasattr(data, "shape") else np.asarray(data)
+            for start in range(0, len(frames), batch_frames):
+                batch = frames[start : start + batch_frames]
+                for frame, image in zip(batch, _read_frames(data, (batch,))):
+                    yield positions[frame], image
+        else:
+            tasks.append((key, frames))
+    workers = assign_frame_ranges(tasks, num_workers)
+    if len(workers) <= 1:
+        for path, frames in tasks:
+            for frame, image in zip(frames, iter_video_frames(path, frames, max_skip)):
+                yield requested[path][frame], image
+        return
+
+    # one single-process pool per worker, so that the batches of a range are decoded in order by the same process
+    context = multiprocessing.get_context("spawn")
+    executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in workers]
+    batches = [
+        [
+            (executor, path, frames[start : start + batch_frames])
+            for path, frames in ranges
+            for start in range(0, len(frames), batch_frames)
+        ]
+        for executor, ranges in zip(executors, workers)
+    ]
+    pending = deque()
+    try:
+        # the batches are submitted to the workers in turn, so each worker has at most two batches in flight
+        for round_batches in itertools.zip_longest(*batches):
+            for executor, path, batch in filter(None, round_batches):
+                pending.append((path, batch, executor.submit(_read_video_batch, path, batch, max_skip)))
+                if len(pending) >= 2 * len(executors):
+                    yield from _iter_batch(requested, *pending.popleft())
+        while pending:
+            yield from _iter_batch(requested, *pending.popleft())
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_batch(requested, path, frames, future):
+    """Yield the positions of the requests of each frame of a batch read by a worker, and the frame."""
+    for frame, image in zip(frames, future.result()):
+        yield requested[path][frame], image
+
+
+class FrameDataChunkIterator(AbstractDataChunkIterator):
+    """Iterate over the frames of ImageSeries extracted by iter_frames() as one DataChunk per request.
+
+    The chunks fill a dataset of shape (num_requests, height, width[, num_channels]) one frame at a time, in the order
+    in which the frames are extracted, so the frames can be written, e.g., as the data of an ImageSeries wrapped in an
+    H5DataIO, without holding more than one batch of frames in memory. The first frame is extracted when the iterator
+    is created, to determine the shape and data type of the dataset.
+    """
+
+    def __init__(self, requests, num_workers=1, max_skip=None, batch_frames=DEFAULT_BATCH_FRAMES):
+        requests = list(requests)
+        self._num_requests = len(requests)
+        self._frames = iter_frames(requests, num_workers=num_workers, max_skip=max_skip, batch_frames=batch_frames)
+        self._chunks = deque()  # the chunks of the last frame extracted that were not returned yet
+        self._frame_shape, self._dtype = (0, 0, 3), np.dtype(np.uint8)
+        if self._num_requests > 0:
+            self._add_chunks(*next(self._frames))
+            self._frame_shape, self._dtype = self._chunks[0].data.shape[1:], self._chunks[0].data.dtype
+
+    def _add_chunks(self, positions, image):
+        image = np.asarray(image)[np.newaxis]
+        frame_selection = tuple(slice(0, length) for length in image.shape[1:])
+        for position in positions:
+            self._chunks.append(DataChunk(data=image, selection=(slice(position, position + 1),) + frame_selection))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._chunks:
+            self._add_chunks(*next(self._frames))  # raises StopIteration after the last frame
+        return self._chunks.popleft()
+
+    def recommended_chunk_shape(self):
+        return (1,) + tuple(self._frame_shape)
+
+    def recommended_data_shape(self):
+        return self.maxshape
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def maxshape(self):
+        return (self._num_requests,) + tuple(self._frame_shape)
+
+
+def create_images(images, names, name="images", description="Frames extracted from videos."):
+    """Create an Images container with an RGBImage, RGBAImage, or GrayscaleImage for each frame, in order."""
+    image_types = {2: GrayscaleImage, 3: RGBImage}
+    containers = list()
+    for image_name, image in zip(names, images):
+        image_type = RGBAImage if image.ndim == 3 and image.shape[2] == 4 else image_types.get(image.ndim)
+        if image_type is None:
+            raise ValueError("Frame '%s' has shape %s, which is not the shape of an image." % (image_name, image.shape))
+        containers.append(image_type(name=str(image_name), data=image))
+    return Images(
+        name=name,
+        images=containers,
+        description=description,
+        order_of_images=ImageReferences(name="order_of_images", data=containers),
+    )
+
+
+def extract_training_frames(
+    training_frames,
+    stacked=False,
+    name="training_frame_images",
+    description="Frames of the source videos of the training frames.",
+    num_workers=1,
+    max_skip=None,
+    batch_frames=DEFAULT_BATCH_FRAMES,
+):
+    """Extract the frame of each training frame from its 'source_video' at its 'source_video_frame_index'.
+
+    'training_frames' is a TrainingFramesTable, a TrainingFrames object, or an iterable of TrainingFrame objects.
+    The frames are extracted in one batch with iter_frames(), which decodes each video file forward between requested
+    frames and seeks only past more than 'max_skip' frames, by default the keyframe interval of the file. Returns an
+    Images container with one image per training frame, named after the training frame, which holds all frames in
+    memory, or, if 'stacked' is True, a FrameDataChunkIterator over the frames of a dataset of shape
+    (num_training_frames, height, width[, num_channels]), which extracts the frames as they are written, e.g., as the
+    data of an ImageSeries.
+    """
+    if hasattr(training_frames, "skeleton_instances_table"):
+        table = training_frames
+        if table.source_video is None or table.source_video_frame_index is None:
+            raise ValueError(
+                "TrainingFramesTable '%s' must have 'source_video' and 'source_video_frame_index' columns to extract "
+                "the frames of its source videos."
+                % table.name
+            )
+        source_videos = table.source_video.data[:]
+        frame_indices = table.source_video_frame_index.data[:]
+        names = ["frame_%d" % i for i in range(len(table))] if table.frame_name is None else table.frame_name.data[:]
+    else:
+        if hasattr(training_frames, "training_frames"):
+            training_frames = training_frames.training_frames.values()
+        source_videos, frame_indices, names = list(), list(), list()
+        for frame in training_frames:
+            if frame.source_video is None or frame.source_video_frame_index is None:
+                raise ValueError(
+                    "TrainingFrame '%s' must have a 'source_video' and a 'source_video_frame_index' to extract its "
+                    "frame."
+                    % frame.name
+                )
+            source_videos.append(frame.source_video)
+            frame_indices.append(frame.source_video_frame_index)
+            names.append(frame.name)
+    requests = zip(source_videos, frame_indices)
+    kwargs = dict(num_workers=num_workers, max_skip=max_skip, batch_frames=batch_frames)
+    if stacked:
+        return FrameDataChunkIterator(requests, **kwargs)
+    images = [None] * len(names)
+    for positions, image in iter_frames(requests, **kwargs):
+        for position in positions:
+            images[position] = image
+    return create_images(images, names, name=name, description=description)
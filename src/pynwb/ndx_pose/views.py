@@ -0,0 +1,426 @@
+"""Lazy, read-only array views over the PoseEstimationSeries of a PoseEstimation object."""
+
+import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+from hdmf.data_utils import DataIO
+
+# names of the coordinate columns of tables built from a StackedPoseEstimationView
+COORDINATE_NAMES = ("x", "y", "z")
+
+
+class TimeSlice(NamedTuple):
+    """Pose estimates for the frames within a time window.
+
+    For a PoseEstimationSeries, 'data' has shape (num_frames, num_dims) and 'confidence' has shape (num_frames,).
+    For a PoseEstimation, 'data' has shape (num_frames, num_nodes, num_dims) and 'confidence' has shape
+    (num_frames, num_nodes). 'confidence' is None if there are no confidence values.
+    """
+
+    timestamps: np.ndarray
+    data: np.ndarray
+    confidence: Optional[np.ndarray]
+
+
+def unwrap_array(array):
+    """Return the array wrapped by a DataIO object, or the array itself. Lists are converted to numpy arrays."""
+    if isinstance(array, DataIO):
+        array = array.data
+    if array is not None and not hasattr(array, "shape"):
+        array = np.asarray(array)
+    return array
+
+
+def _normalize_frame_key(key, num_frames):
+    """Convert an index along the frame axis into a selection that h5py datasets and numpy arrays both accept.
+
+    h5py supports integers, slices, and increasing integer arrays without duplicates. Other integer arrays and
+    boolean masks are converted to a sorted array of unique indices, which is read once, and an inverse index that
+    restores the requested order afterward.
+
+    Returns a tuple (selection, inverse, shape) where ``inverse`` is None when no reordering is needed and ``shape``
+    is the shape the frame axis takes in the output.
+    """
+    if isinstance(key, (int, np.integer)):
+        if not -num_frames <= key < num_frames:
+            raise IndexError("Frame index %d is out of bounds for %d frames." % (key, num_frames))
+        return int(key) % num_frames, None, ()
+    if isinstance(key, slice):
+        start, stop, step = key.indices(num_frames)
+        if step > 0:
+            return slice(start, stop, step), None, (len(range(start, stop, step)),)
+        key = np.arange(start, stop, step)  # h5py does not support negative steps
+    key = np.asarray(key)
+    if key.dtype == bool:
+        if key.shape != (num_frames,):
+            raise IndexError("Boolean frame mask of shape %s does not match %d frames." % (key.shape, num_frames))
+        key = np.flatnonzero(key)
+    if key.ndim != 1 or not np.issubdtype(key.dtype, np.integer):
+        raise IndexError("Frames must be indexed with an integer, a slice, or a 1D integer or boolean array.")
+    key = np.where(key < 0, key + num_frames, key)
+    if key.size and (key.min() < 0 or key.max() >= num_frames):
+        raise IndexError("Frame indices are out of bounds for %d frames." % num_frames)
+    unique, inverse = np.unique(key, return_inverse=True)
+    if unique.size == key.size and np.array_equal(unique, key):
+        inverse = None
+    return unique, inverse, (key.size,)
+
+
+class StackedSeriesArray:
+    """Read-only array that stacks one dataset from each of several PoseEstimationSeries along a node axis.
+
+    The stacked array has shape (num_frames, num_nodes) + the trailing shape of the per-series arrays, e.g.,
+    (num_frames, num_nodes, num_dims) for the 'data' datasets and (num_frames, num_nodes) for the 'confidence'
+    datasets. Nothing is read until the array is indexed. Indexing reads only the selected frames of the selected
+    series, one hyperslab per series, and writes them into a single preallocated output array.
+
+    A series without the dataset, e.g., a PoseEstimationSeries without confidence values, is represented by NaN.
+    """
+
+    def __init__(self, arrays, item_shape=None, dtype=None):
+        self._arrays = [unwrap_array(array) for array in arrays]
+        present = [array for array in self._arrays if array is not None]
+        if not present:
+            raise ValueError("Cannot stack arrays: none of the series hold the requested dataset.")
+        lengths = {len(array) for array in present}
+        if len(lengths) > 1:
+            raise ValueError("Cannot stack arrays with different numbers of frames: %s." % sorted(lengths))
+        item_shapes = {tuple(array.shape[1:]) for array in present}
+        if len(item_shapes) > 1:
+            raise ValueError("Cannot stack arrays with different shapes per frame: %s." % sorted(item_shapes))
+        self._num_frames = lengths.pop()
+        self._item_shape = item_shapes.pop() if item_shape is None else tuple(item_shape)
+        if dtype is None:
+            dtype = np.result_type(*[array.dtype for array in present])
+            if len(present) < len(self._arrays):  # missing datasets are filled with NaN
+                dtype = np.result_type(dtype, np.float32)
+        self._dtype = np.dtype(dtype)
+
+    @property
+    def shape(self):
+        return (self._num_frames, len(self._arrays)) + self._item_shape
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self._num_frames
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1 :]
+        if len(key) > self.ndim:
+            raise IndexError("Too many indices for a stacked array with %d dimensions." % self.ndim)
+        key = key + (slice(None),) * (self.ndim - len(key))
+        frame_key, node_key, item_key = key[0], key[1], key[2:]
+
+        frame_selection, inverse, frame_shape = _normalize_frame_key(frame_key, self._num_frames)
+        node_indices = np.arange(len(self._arrays))[node_key]
+        single_node = np.ndim(node_indices) == 0
+        node_indices = np.atleast_1d(node_indices)
+        item_shape = np.empty(self._item_shape, dtype=bool)[item_key].shape
+        if not frame_shape:
+            read_shape = ()
+        elif inverse is None:
+            read_shape = frame_shape
+        else:
+            read_shape = (len(frame_selection),)
+
+        out = np.empty(read_shape + (len(node_indices),) + item_shape, dtype=self._dtype)
+        for j, node_index in enumerate(node_indices):
+            array = self._arrays[node_index]
+            if array is None:
+                out[(slice(None),) * len(read_shape) + (j,)] = np.nan
+                continue
+            if read_shape == (0,):
+                continue
+            block = array[frame_selection]
+            if item_key:
+                block = np.asarray(block)[(slice(None),) * len(read_shape) + item_key]
+            out[(slice(None),) * len(read_shape) + (j,)] = block
+
+        if inverse is not None:
+            out = out[inverse]
+        if single_node:
+            out = out[(slice(None),) * len(frame_shape) + (0,)]
+        return out
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over the array in blocks of at most ``chunk_size`` frames.
+
+        Yields a tuple (frame_slice, block) for each block, where ``block`` equals ``self[frame_slice]``.
+        """
+        if chunk_size < 1:
+            raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+        for start in range(0, self._num_frames, chunk_size):
+            frame_slice = slice(start, min(start + chunk_size, self._num_frames))
+            yield frame_slice, self[frame_slice]
+
+
+class StackedPoseEstimationView:
+    """Lazy stacked view over the PoseEstimationSeries of a PoseEstimation object, in skeleton node order.
+
+    The view exposes three read-only arrays:
+
+    - ``data`` with shape (num_frames, num_nodes, num_dims), stacking the 'data' of each series
+    - ``confidence`` with shape (num_frames, num_nodes), stacking the 'confidence' of each series, or None if no
+      series has confidence values
+    - ``timestamps`` with shape (num_frames,), holding the timestamps shared by all series
+
+    Slicing ``data`` or ``confidence`` reads only the selected frames of the selected series.
+    """
+
+    def __init__(self, pose_estimation_series, nodes):
+        self.nodes = list(nodes)
+        self.pose_estimation_series = list(pose_estimation_series)
+        if not self.pose_estimation_series:
+            raise ValueError("Cannot create a stacked view without any PoseEstimationSeries.")
+        self.data = StackedSeriesArray([series.data for series in self.pose_estimation_series])
+        confidences = [series.confidence for series in self.pose_estimation_series]
+        self.confidence = None
+        if any(confidence is not None for confidence in confidences):
+            self.confidence = StackedSeriesArray(confidences, item_shape=())
+        self._timestamps = None
+
+    @property
+    def timestamps(self):
+        """Timestamps of the first series, which the PoseEstimation schema requires all series to share.
+
+        For series defined by 'rate' and 'starting_time', the timestamps are computed on first access.
+        """
+        if self._timestamps is None:
+            first = self.pose_estimation_series[0]
+            timestamps = first.timestamps
+            if timestamps is None:
+                timestamps = first.get_timestamps()
+            self._timestamps = unwrap_array(timestamps)
+        return self._timestamps
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return len(self.data)
+
+    def masked(self, min_confidence):
+        """Get a lazy view of 'data' in which positions with confidence below 'min_confidence' are NaN.
+
+        See MaskedPoseArray.
+        """
+        if self.confidence is None:
+            raise ValueError("Cannot mask positions by confidence: none of the series have confidence values.")
+        return MaskedPoseArray(self.data, self.confidence, min_confidence)
+
+    def _read_columns(self):
+        """Read all frames into one buffer with one contiguous row per (node, coordinate) column of a table.
+
+        The coordinates of each node are "x", "y", and, for 3D data, "z", followed by "confidence" if any series has
+        confidence values. Returns the (node, coordinate) column labels and the buffer, which has shape
+        (num_columns, num_frames).
+        """
+        num_frames, num_nodes, num_dims = self.data.shape
+        coordinates = COORDINATE_NAMES[:num_dims]
+        dtype = self.data.dtype
+        if self.confidence is not None:
+            coordinates += ("confidence",)
+            dtype = np.result_type(dtype, self.confidence.dtype)
+        buffer = np.empty((num_nodes, len(coordinates), num_frames), dtype=dtype)
+        for j in range(num_nodes):
+            buffer[j, :num_dims] = self.data[:, j].T
+            if self.confidence is not None:
+                buffer[j, num_dims] = self.confidence[:, j]
+        columns = [(node, coordinate) for node in self.nodes for coordinate in coordinates]
+        return columns, buffer.reshape((len(columns), num_frames))
+
+    def to_dataframe(self):
+        """Get a pandas DataFrame with one row per frame, indexed by timestamps.
+
+        The columns have a (node, coordinate) MultiIndex, with the coordinates "x", "y", and, for 3D data, "z",
+        followed by "confidence" if any series has confidence values. All series are read into one column-major
+        buffer, which the DataFrame uses without copying.
+        """
+        import pandas as pd  # imported here so that importing ndx_pose does not import pandas
+
+        columns, buffer = self._read_columns()
+        return pd.DataFrame(
+            buffer.T,
+            index=pd.Index(np.asarray(self.timestamps[:]), name="timestamps"),
+            columns=pd.MultiIndex.from_tuples(columns, names=["node", "coordinate"]),
+            copy=False,
+        )
+
+    def to_arrow(self):
+        """Get a pyarrow Table with a "timestamps" column and one column per node and coordinate.
+
+        Columns are named "<node>_<coordinate>", e.g., "nose_x" and "nose_confidence", with the node and coordinate
+        also stored in the metadata of each field. Each column wraps a contiguous row of one column-major buffer, so
+        no data is copied after the series are read. Requires pyarrow.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Converting pose estimates to an Arrow table requires pyarrow: pip install pyarrow")
+        columns, buffer = self._read_columns()
+        timestamps = np.ascontiguousarray(self.timestamps[:])
+        arrays = [pa.array(timestamps)]
+        fields = [pa.field("timestamps", arrays[0].type)]
+        value_type = pa.from_numpy_dtype(buffer.dtype)
+        for (node, coordinate), column in zip(columns, buffer):
+            arrays.append(pa.array(column))
+            metadata = {"node": node, "coordinate": coordinate}
+            fields.append(pa.field("%s_%s" % (node, coordinate), value_type, metadata=metadata))
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _read_frames(array, key):
+    """Read ``array[key]`` from a numpy array, h5py dataset, or StackedSeriesArray, indexing frames h5py-safely."""
+    if isinstance(array, StackedSeriesArray):
+        return array[key]
+    frame_selection, inverse, frame_shape = _normalize_frame_key(key[0], len(array))
+    if frame_shape == (0,):
+        values = np.empty((0,) + array.shape[1:], dtype=array.dtype)
+    else:
+        values = np.asarray(array[frame_selection])
+    if inverse is not None:
+        values = values[inverse]
+    if len(key) > 1:
+        values = values[(slice(None),) * len(frame_shape) + key[1:]]
+    return values
+
+
+class MaskedPoseArray:
+    """Lazy, read-only view of pose positions in which positions with low confidence are replaced with NaN.
+
+    The view has the shape of the positions, e.g., (num_frames, num_dims) for a PoseEstimationSeries or
+    (num_frames, num_nodes, num_dims) for a stacked PoseEstimation. Nothing is read until the view is indexed.
+    Indexing reads only the selected frames of the positions and of the confidence values and applies the mask to that
+    block, so the view composes with slicing and ``iter_chunks`` processes a full recording block by block, without a
+    masked copy of the whole recording. Positions whose confidence is below 'min_confidence' or NaN are masked.
+    """
+
+    def __init__(self, data, confidence, min_confidence):
+        self._data = unwrap_array(data)
+        self._confidence = unwrap_array(confidence)
+        if self._confidence is None:
+            raise ValueError("Cannot mask positions by confidence: there are no confidence values.")
+        if tuple(self._confidence.shape) != tuple(self._data.shape[:-1]):
+            raise ValueError(
+                "Confidence values of shape %s do not match positions of shape %s."
+                % (tuple(self._confidence.shape), tuple(self._data.shape))
+            )
+        self.min_confidence = min_confidence
+        self._dtype = np.result_type(self._data.dtype, np.float32)
+
+    @property
+    def shape(self):
+        return tuple(self._data.shape)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1 :]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        values = np.asarray(_read_frames(self._data, key))
+        if values.base is not None or values.dtype != self._dtype or values.ndim == 0:
+            values = values.astype(self._dtype)  # never write NaN into the source array
+        confidence = _read_frames(self._confidence, key[:-1])
+        values[~(np.asarray(confidence) >= self.min_confidence)] = np.nan
+        return values[()] if values.ndim == 0 else values
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over the masked positions in blocks of at most ``chunk_size`` frames.
+
+        Yields a tuple (frame_slice, block) for each block, where ``block`` equals ``self[frame_slice]``.
+        """
+        if chunk_size < 1:
+            raise ValueError("'chunk_size' must be a positive integer, got %s." % chunk_size)
+        for start in range(0, len(self), chunk_size):
+            frame_slice = slice(start, min(start + chunk_size, len(self)))
+            yield frame_slice, self[frame_slice]
+
+
+def _bisect(timestamps, value, start, stop):
+    """Return the first index in [start, stop) whose timestamp is >= value, or stop if there is none.
+
+    Each step reads a single element, so a search over an HDF5 dataset reads O(log n) elements.
+    """
+    while start < stop:
+        mid = (start + stop) // 2
+        if timestamps[mid] < value:
+            start = mid + 1
+        else:
+            stop = mid
+    return start
+
+
+def get_time_index_bounds(series, start_time, stop_time):
+    """Return the slice of frames of a TimeSeries with timestamps in the half-open interval [start_time, stop_time).
+
+    For a series with timestamps, the bounds are found by bisection, which reads only O(log n) timestamps from a
+    dataset in a file. For a series defined by 'rate' and 'starting_time', the bounds are computed directly without
+    reading anything.
+    """
+    if stop_time < start_time:
+        raise ValueError("'stop_time' (%s) must not be less than 'start_time' (%s)." % (stop_time, start_time))
+    timestamps = series.timestamps
+    if timestamps is None:
+        num_frames = len(unwrap_array(series.data))
+        return slice(*(_rate_index(series, t, num_frames) for t in (start_time, stop_time)))
+    timestamps = unwrap_array(timestamps)
+    if isinstance(timestamps, np.ndarray):
+        return slice(*np.searchsorted(timestamps, [start_time, stop_time], side="left").tolist())
+    start = _bisect(timestamps, start_time, 0, len(timestamps))
+    return slice(start, _bisect(timestamps, stop_time, start, len(timestamps)))
+
+
+def get_timestamps_slice(series, frames):
+    """Return the timestamps of a TimeSeries for a slice of frames, computing them for a series defined by 'rate'."""
+    if series.timestamps is None:
+        return np.arange(frames.start, frames.stop) / series.rate + series.starting_time
+    return np.asarray(unwrap_array(series.timestamps)[frames])
+
+
+def _rate_index(series, time, num_frames):
+    """Return the first frame index of a rate-based series whose time is >= time, clipped to [0, num_frames].
+
+    Frame times are computed as starting_time + index / rate, the same way that TimeSeries.get_timestamps() computes
+    them, and the initial estimate is corrected by one frame when floating-point rounding puts it on the wrong side.
+    """
+    rate, starting_time = series.rate, series.starting_time
+    index = min(max(math.ceil((time - starting_time) * rate), 0), num_frames)
+    if index > 0 and (index - 1) / rate + starting_time >= time:
+        index -= 1
+    elif index < num_frames and index / rate + starting_time < time:
+        index += 1
+    return index
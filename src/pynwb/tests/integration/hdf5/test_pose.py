@@ -1,7 +1,10 @@
 import datetime
 import warnings
+from unittest import mock
 
+import h5py
 import numpy as np
+from hdmf.backends.hdf5.h5_utils import H5DataIO
 
 from pynwb import NWBHDF5IO, NWBFile
 from pynwb.device import DeviceModel
@@ -17,10 +20,14 @@ from ndx_pose import (
     Skeletons,
     SourceVideos,
     TrainingFrames,
+    TrainingFramesTable,
 )
+from ndx_pose.io import LazyContainerDict, lazy, lazy_pose_training
+from ndx_pose.multiview import project_points
 from ndx_pose.testing.mock.pose import (
     mock_MultiCameraPoseEstimation,
     mock_PoseEstimationSeries,
+    mock_projected_PoseEstimations,
     mock_Skeleton,
     mock_PoseEstimation,
     mock_SkeletonInstance,
@@ -190,6 +197,311 @@ class TestPoseEstimationRoundtrip(TestCase):
             self.assertContainerEqual(read_pe.pose_estimation_series["node3"], pose_estimation_series[2])
             self.assertContainerEqual(read_pe.skeleton, skeleton)
             self.assertContainerEqual(read_pe.device, self.nwbfile.devices["camera1"])
+            self.assertEqual(read_pe.skeleton.graph.node_index, skeleton.graph.node_index)
+            np.testing.assert_array_equal(read_pe.skeleton.graph.traversal_order, skeleton.graph.traversal_order)
+            self.assertIs(read_pe.skeleton.graph, read_pe.skeleton.graph)
+
+    def test_read_invalid_skeleton_warns(self):
+        """Test that a Skeleton with invalid edges in a file is read with a warning instead of an error."""
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add(Skeletons(skeletons=[mock_Skeleton(name="subject")]))
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+        with h5py.File(self.path, "r+") as f:
+            f["processing/behavior/Skeletons/subject/edges"][1] = [2, 2]
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            msg = (
+                "Skeleton 'subject' read from the file is invalid: Skeleton edges must connect two different nodes, "
+                "but edges [1] connect a node to itself."
+            )
+            with self.assertWarnsWith(UserWarning, msg):
+                read_skeleton = io.read().processing["behavior"]["Skeletons"]["subject"]
+            np.testing.assert_array_equal(read_skeleton.edges[:], [[0, 1], [2, 2]])
+
+
+class TestPoseEstimationStackedViewRead(TestCase):
+    """Test the stacked view of a PoseEstimation read from a file."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_read_slice(self):
+        """Write a PoseEstimation, then read a slice of the stacked data back from the HDF5 datasets."""
+        skeleton = mock_Skeleton()
+        data = np.random.rand(3, 50, 3)
+        confidence = np.random.rand(3, 50)
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name=node, data=data[i], confidence=confidence[i])
+            for i, node in enumerate(skeleton.nodes)
+        ]
+        mock_PoseEstimation(nwbfile=self.nwbfile, skeleton=skeleton, pose_estimation_series=pose_estimation_series)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_nwbfile = io.read()
+            view = read_nwbfile.processing["behavior"]["PoseEstimation"].get_stacked_view()
+            self.assertEqual(view.shape, (50, 3, 3))
+            np.testing.assert_array_equal(view.data[10:20, :, :], data[:, 10:20, :].transpose(1, 0, 2))
+            np.testing.assert_array_equal(view.data[[40, 5], 2, :2], data[2, [40, 5], :2])
+            np.testing.assert_array_equal(view.confidence[10:20], confidence[:, 10:20].T)
+            np.testing.assert_array_equal(view.timestamps[:], np.linspace(0, 10, num=50))
+
+            # the timestamps are an h5py.Dataset here, so the window bounds are found by bisection
+            timestamps = np.linspace(0, 10, num=50)
+            frames = np.flatnonzero((timestamps >= 2.0) & (timestamps < 4.0))
+            time_slice = read_nwbfile.processing["behavior"]["PoseEstimation"].get_time_slice(2.0, 4.0)
+            np.testing.assert_array_equal(time_slice.timestamps, timestamps[frames])
+            np.testing.assert_array_equal(time_slice.data, data[:, frames].transpose(1, 0, 2))
+            np.testing.assert_array_equal(time_slice.confidence, confidence[:, frames].T)
+
+            masked = read_nwbfile.processing["behavior"]["PoseEstimation"].pose_estimation_series["node2"].masked(0.5)
+            expected = data[1].copy()
+            expected[confidence[1] < 0.5] = np.nan
+            np.testing.assert_array_equal(masked[5:25], expected[5:25])
+            np.testing.assert_array_equal(masked[[30, 3]], expected[[30, 3]])
+
+            df = read_nwbfile.processing["behavior"]["PoseEstimation"].to_dataframe()
+            self.assertEqual(df.shape, (50, 12))
+            np.testing.assert_array_equal(df.index, np.linspace(0, 10, num=50))
+            np.testing.assert_array_equal(df["node3"][["x", "y", "z"]], data[2])
+            np.testing.assert_array_equal(df[("node1", "confidence")], confidence[0])
+
+
+class TestPoseEstimationKinematicsRoundtrip(TestCase):
+    """Test computing bone lengths and joint angles from a file and writing them back to it."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        skeleton = mock_Skeleton()
+        data = np.random.rand(3, 50, 2)
+        confidence = np.random.rand(3, 50)
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name=node, data=data[i], confidence=confidence[i])
+            for i, node in enumerate(skeleton.nodes)
+        ]
+        mock_PoseEstimation(nwbfile=self.nwbfile, skeleton=skeleton, pose_estimation_series=pose_estimation_series)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            read_pe = read_nwbfile.processing["behavior"]["PoseEstimation"]
+            lengths = read_pe.create_bone_lengths_series(chunk_size=16)
+            angles = read_pe.create_joint_angles_series(min_confidence=0.5, chunk_size=16)
+            read_nwbfile.processing["behavior"].add([lengths, angles])
+            io.write(read_nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            read_lengths = read_nwbfile.processing["behavior"]["bone_lengths"]
+            expected = np.linalg.norm(data[[1, 2]] - data[[0, 1]], axis=2).T
+            np.testing.assert_allclose(read_lengths.data[:], expected)
+            np.testing.assert_array_equal(read_lengths.timestamps[:], np.linspace(0, 10, num=50))
+            read_angles = read_nwbfile.processing["behavior"]["joint_angles"]
+            self.assertEqual(read_angles.unit, "radians")
+            self.assertEqual(read_angles.data.shape, (50, 1))
+            low = (confidence < 0.5).any(axis=0)
+            np.testing.assert_array_equal(np.isnan(read_angles.data[:, 0]), low)
+
+
+class TestPoseEstimationShareTimestampsRoundtrip(TestCase):
+    """Test writing a PoseEstimation whose series share the timestamps of the first series."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        pe.share_timestamps()
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with h5py.File(self.path, mode="r") as f:
+            group = f["processing/behavior/PoseEstimation"]
+            self.assertIsInstance(group["node1"].get("timestamps", getlink=True), h5py.HardLink)
+            self.assertIsInstance(group["node2"].get("timestamps", getlink=True), h5py.SoftLink)
+            self.assertIsInstance(group["node3"].get("timestamps", getlink=True), h5py.SoftLink)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_nwbfile = io.read()
+            read_pe = read_nwbfile.processing["behavior"]["PoseEstimation"]
+            self.assertContainerEqual(read_pe, pe)
+            read_series = list(read_pe.pose_estimation_series.values())
+            self.assertIs(read_series[1].timestamps, read_series[0].timestamps)
+            self.assertIs(read_series[2].timestamps, read_series[0].timestamps)
+            timestamps = read_pe.get_timestamps()
+            np.testing.assert_array_equal(timestamps, np.linspace(0, 10, num=10))
+            self.assertIs(read_pe.get_timestamps(), timestamps)
+
+
+class TestPoseEstimationDatasetIOPresetRoundtrip(TestCase):
+    """Test writing a PoseEstimation with the chunking and compression of a dataset I/O preset."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+        self.export_path = "test_pose_export.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+        remove_test_file(self.export_path)
+
+    def test_roundtrip(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        pe.share_timestamps()
+        pe.set_dataset_io_preset("sequential-scan")
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with h5py.File(self.path, mode="r") as f:
+            group = f["processing/behavior/PoseEstimation"]
+            for name in ("node1", "node2", "node3"):
+                self.assertEqual(group[name]["data"].chunks, (10, 3))
+                self.assertEqual(group[name]["data"].compression, "gzip")
+                self.assertEqual(group[name]["data"].compression_opts, 4)
+                self.assertTrue(group[name]["data"].shuffle)
+                self.assertEqual(group[name]["confidence"].chunks, (10,))
+            self.assertEqual(group["node1"]["timestamps"].chunks, (10,))
+            self.assertIsInstance(group["node2"].get("timestamps", getlink=True), h5py.SoftLink)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            self.assertContainerEqual(read_pe, pe)
+
+    def test_export_with_preset(self):
+        mock_PoseEstimation(nwbfile=self.nwbfile)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as read_io:
+            read_nwbfile = read_io.read()
+            read_nwbfile.processing["behavior"]["PoseEstimation"].set_dataset_io_preset("random-window")
+            with NWBHDF5IO(self.export_path, mode="w") as export_io:
+                export_io.export(src_io=read_io, nwbfile=read_nwbfile)
+
+        with h5py.File(self.export_path, mode="r") as f:
+            dataset = f["processing/behavior/PoseEstimation/node1/data"]
+            self.assertEqual(dataset.chunks, (10, 3))
+            self.assertEqual(dataset.compression_opts, 1)
+            np.testing.assert_array_equal(dataset[:], np.arange(30, dtype=np.float64).reshape((10, 3)))
+
+
+class TestPoseEstimationStoragePrecisionRoundtrip(TestCase):
+    """Test writing a PoseEstimation with reduced-precision storage of positions and confidence values."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+        rng = np.random.default_rng(0)
+        self.pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=name,
+                data=rng.random((5000, 2)) * 640,
+                confidence=rng.random(5000),
+                timestamps=np.arange(5000) / 30.0,
+            )
+            for name in ("node1", "node2", "node3")
+        ]
+        self.data = [series.data for series in self.pose_estimation_series]
+        self.confidence = [series.confidence for series in self.pose_estimation_series]
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile, pose_estimation_series=self.pose_estimation_series)
+        pe.set_storage_precision(data_decimals=2, confidence_dtype="uint8")
+        pe.set_dataset_io_preset("sequential-scan")
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with h5py.File(self.path, mode="r") as f:
+            group = f["processing/behavior/PoseEstimation/node1"]
+            self.assertEqual(group["data"].dtype, np.float32)
+            self.assertEqual(group["data"].scaleoffset, 2)
+            self.assertEqual(group["confidence"].dtype, np.uint8)
+            self.assertEqual(group["confidence"].attrs["scale"], 1 / 254)
+            self.assertEqual(group["timestamps"].dtype, np.float64)
+            # about 16 bits per position with 2 decimals in [0, 640) and 8 bits per confidence value, compared to 64
+            # bits per float64 value
+            self.assertLess(group["data"].id.get_storage_size() * 3.5, self.data[0].nbytes)
+            self.assertLess(group["confidence"].id.get_storage_size() * 7, self.confidence[0].nbytes)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            for series, data, confidence in zip(read_pe.pose_estimation_series.values(), self.data, self.confidence):
+                np.testing.assert_allclose(series.data[:], data, rtol=0, atol=0.01)
+                np.testing.assert_allclose(series.confidence[:], confidence, rtol=0, atol=1 / 508)
+                self.assertEqual(series.confidence_scale, 1 / 254)
+            view = read_pe.get_stacked_view()
+            np.testing.assert_allclose(view.data[:10], np.stack(self.data, axis=1)[:10], rtol=0, atol=0.01)
+
+    def test_missing_values_roundtrip(self):
+        self.data[0][100:200] = np.nan
+        self.confidence[0][100:200] = np.nan
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile, pose_estimation_series=self.pose_estimation_series)
+        pe.set_storage_precision(data_decimals=2, confidence_dtype="uint16")
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        export_path = "test_pose_export.nwb"
+        try:
+            with NWBHDF5IO(self.path, mode="r") as io:
+                read_nwbfile = io.read()
+                read_nwbfile.processing["behavior"]["PoseEstimation"].set_dataset_io_preset("archive")
+                with NWBHDF5IO(export_path, mode="w") as export_io:
+                    export_io.export(src_io=io, nwbfile=read_nwbfile)
+
+            for path in (self.path, export_path):
+                with NWBHDF5IO(path, mode="r") as io:
+                    series = io.read().processing["behavior"]["PoseEstimation"].pose_estimation_series["node1"]
+                    self.assertTrue(np.isnan(series.data[100:200]).all())
+                    self.assertTrue(np.isnan(series.confidence[100:200]).all())
+                    np.testing.assert_allclose(series.data[:], self.data[0], rtol=0, atol=0.01)
+                    np.testing.assert_allclose(series.confidence[:], self.confidence[0], rtol=0, atol=1e-5)
+                    self.assertEqual(series.data.dataset.scaleoffset, 2)
+        finally:
+            remove_test_file(export_path)
 
 
 class TestPoseEstimationRoundtripDeprecatedVideoFields(TestCase):
@@ -299,6 +611,40 @@ class TestPoseEstimationRoundtripSourceVideo(TestCase):
             self.assertContainerEqual(read_pe.source_video, source_video)
             self.assertEqual(read_pe.source_video.external_file[0], "camera1.mp4")
 
+    def test_video_frame_index(self):
+        """Test mapping the rows of a read PoseEstimation to the frames of the files of its source video."""
+        source_video = ImageSeries(
+            name="source_video",
+            description="Source video split across two files.",
+            unit="NA",
+            format="external",
+            external_file=["camera1_part1.mp4", "camera1_part2.mp4"],
+            starting_frame=[0, 5],
+            timestamps=np.arange(10) / 30.0,
+        )
+        self.nwbfile.add_acquisition(source_video)
+        skeleton = mock_Skeleton(nodes=["nose"])
+        pose_estimation_series = mock_PoseEstimationSeries(
+            name="nose", data=np.zeros((20, 2)), confidence=np.ones(20), timestamps=np.arange(20) / 60.0
+        )
+        pe = PoseEstimation(
+            pose_estimation_series=[pose_estimation_series], skeleton=skeleton, source_video=source_video
+        )
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([pe, Skeletons(skeletons=[skeleton])])
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            index = io.read().processing["behavior"]["PoseEstimation"].get_video_frame_index()
+            file_indices, frames = index.get_file_frames([0, 2, 10, 12])
+            np.testing.assert_array_equal(
+                index.get_file_names(file_indices), ["camera1_part1.mp4"] * 2 + ["camera1_part2.mp4"] * 2
+            )
+            np.testing.assert_array_equal(frames, [0, 1, 0, 1])
+            np.testing.assert_array_equal(index.get_rows([0, 1], [4, 4]), [8, 18])
+
 
 class TestPoseEstimationRoundtripLabeledVideo(TestCase):
     """Roundtrip test for PoseEstimation with labeled_video link."""
@@ -425,6 +771,316 @@ class TestPoseTrainingRoundtripPyNWB(NWBH5IOFlexMixin, TestCase):
         return nwbfile.processing["behavior"]["PoseTraining"]
 
 
+class TestLazyPoseTrainingRead(TestCase):
+    """Test reading the TrainingFrame and SkeletonInstance objects of a PoseTraining object lazily."""
+
+    def setUp(self):
+        nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        skeleton = mock_Skeleton(name="subject1")
+        source_video = mock_source_video(name="source_video")
+        self.training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i,
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[
+                        mock_SkeletonInstance(
+                            id=np.uint(j), node_locations=np.full((3, 2), 10.0 * i + j), skeleton=skeleton
+                        )
+                        for j in range(2)
+                    ]
+                ),
+                source_video=source_video,
+                source_video_frame_index=np.uint(i),
+            )
+            for i in range(5)
+        ]
+        behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add(Skeletons(skeletons=[skeleton]))
+        behavior_pm.add(
+            PoseTraining(
+                training_frames=TrainingFrames(training_frames=self.training_frames),
+                source_videos=SourceVideos(image_series=[source_video]),
+            )
+        )
+        self.path = "test_pose.nwb"
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_lazy_read(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            with lazy_pose_training():
+                read_nwbfile = io.read()
+            read_pose_training = read_nwbfile.processing["behavior"]["PoseTraining"]
+            read_training_frames = read_pose_training.training_frames
+            training_frames = read_training_frames.training_frames
+            self.assertIsInstance(training_frames, LazyContainerDict)
+            self.assertEqual(len(training_frames), 5)
+            self.assertEqual(list(training_frames), ["frame0", "frame1", "frame2", "frame3", "frame4"])
+            self.assertIn("frame3", training_frames)
+            self.assertEqual(training_frames.num_constructed, 0)
+            self.assertEqual(read_training_frames.children, ())
+
+            frame = training_frames["frame3"]
+            self.assertEqual(training_frames.num_constructed, 1)
+            self.assertIs(training_frames["frame3"], frame)
+            self.assertIs(read_training_frames.get_training_frames("frame3"), frame)
+            self.assertIs(frame.parent, read_training_frames)
+            self.assertEqual(read_training_frames.children, (frame,))
+            self.assertFalse(read_training_frames.modified)
+            self.assertIs(frame.source_video, read_pose_training.source_videos["source_video"])
+
+            skeleton_instances = frame.skeleton_instances.skeleton_instances
+            self.assertIsInstance(skeleton_instances, LazyContainerDict)
+            self.assertEqual(skeleton_instances.num_constructed, 0)
+            instance = skeleton_instances["subject1_instance_1"]
+            self.assertIs(instance.parent, frame.skeleton_instances)
+            self.assertIs(instance.skeleton, read_nwbfile.processing["behavior"]["Skeletons"]["subject1"])
+            np.testing.assert_array_equal(instance.node_locations[:], np.full((3, 2), 31.0))
+
+            for expected, read_frame in zip(self.training_frames, training_frames.values()):
+                self.assertEqual(read_frame.name, expected.name)
+                self.assertEqual(read_frame.source_video_frame_index, expected.source_video_frame_index)
+            self.assertEqual(training_frames.num_constructed, 5)
+
+    def test_eager_read_outside_context(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            training_frames = read_nwbfile.processing["behavior"]["PoseTraining"].training_frames.training_frames
+            self.assertNotIsInstance(training_frames, LazyContainerDict)
+            self.assertEqual(len(training_frames), 5)
+
+    def test_eager_read_fallback(self):
+        """Test that containers are read eagerly within the context if lazy reading is not supported."""
+        with mock.patch.object(lazy, "LAZY_READ_SUPPORTED", False):
+            with NWBHDF5IO(self.path, mode="r") as io:
+                with self.assertWarnsRegex(UserWarning, "Lazy reading of PoseTraining objects is not supported"):
+                    with lazy_pose_training():
+                        read_nwbfile = io.read()
+                training_frames = read_nwbfile.processing["behavior"]["PoseTraining"].training_frames.training_frames
+                self.assertNotIsInstance(training_frames, LazyContainerDict)
+                self.assertEqual(list(training_frames), ["frame0", "frame1", "frame2", "frame3", "frame4"])
+                skeleton_instances = training_frames["frame3"].skeleton_instances.skeleton_instances
+                self.assertNotIsInstance(skeleton_instances, LazyContainerDict)
+                instance = skeleton_instances["subject1_instance_1"]
+                np.testing.assert_array_equal(instance.node_locations[:], np.full((3, 2), 31.0))
+
+    def test_export(self):
+        """Export a lazily read file in which only some containers were accessed and check the round trip."""
+        export_path = "test_pose_export.nwb"
+        for link_data, modified in ((True, False), (True, True), (False, False)):
+            with self.subTest(link_data=link_data, modified=modified):
+                with NWBHDF5IO(self.path, mode="r") as io, lazy_pose_training():
+                    read_nwbfile = io.read()
+                    read_training_frames = read_nwbfile.processing["behavior"]["PoseTraining"].training_frames
+                    read_training_frames.training_frames["frame3"]
+                    self.assertEqual(read_training_frames.training_frames.num_constructed, 1)
+                    if modified:  # the container is built again instead of reusing the builder read from the file
+                        read_training_frames.set_modified()
+                    with NWBHDF5IO(export_path, mode="w") as export_io:
+                        export_io.export(src_io=io, nwbfile=read_nwbfile, write_args={"link_data": link_data})
+                    if modified or not link_data:  # building the container constructs all of its children
+                        self.assertEqual(len(read_training_frames.children), 5)
+                try:
+                    with NWBHDF5IO(export_path, mode="r") as io:
+                        read_nwbfile = io.read()
+                        read_skeleton = read_nwbfile.processing["behavior"]["Skeletons"]["subject1"]
+                        pose_training = read_nwbfile.processing["behavior"]["PoseTraining"]
+                        training_frames = pose_training.training_frames.training_frames
+                        self.assertEqual(list(training_frames), ["frame0", "frame1", "frame2", "frame3", "frame4"])
+                        for expected, read_frame in zip(self.training_frames, training_frames.values()):
+                            self.assertEqual(read_frame.source_video_frame_index, expected.source_video_frame_index)
+                            self.assertIs(read_frame.source_video, pose_training.source_videos["source_video"])
+                            read_instances = read_frame.skeleton_instances.skeleton_instances
+                            expected_instances = expected.skeleton_instances.skeleton_instances
+                            self.assertEqual(list(read_instances), list(expected_instances))
+                            for name, instance in read_instances.items():
+                                self.assertIs(instance.skeleton, read_skeleton)
+                                np.testing.assert_array_equal(
+                                    instance.node_locations[:], expected_instances[name].node_locations
+                                )
+                finally:
+                    remove_test_file(export_path)
+
+
+class TestTrainingFramesTableRoundtrip(TestCase):
+    """Roundtrip test for PoseTraining with a TrainingFramesTable."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        """Write a TrainingFramesTable, read it, and convert it back to TrainingFrame objects."""
+        skeleton1 = mock_Skeleton(name="subject1")
+        skeleton2 = mock_Skeleton(name="subject2")
+        source_video = mock_source_video(name="source_video")
+        training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i,
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[
+                        mock_SkeletonInstance(id=np.uint(j), skeleton=skeleton1 if j == 0 else skeleton2)
+                        for j in range(i + 1)
+                    ]
+                ),
+                source_video=source_video,
+                source_video_frame_index=np.uint(1000 + i),
+            )
+            for i in range(3)
+        ]
+        pose_training = PoseTraining(
+            training_frames_table=TrainingFramesTable.from_training_frames(training_frames),
+            source_videos=SourceVideos(image_series=[source_video]),
+        )
+
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add(Skeletons(skeletons=[skeleton1, skeleton2]))
+        behavior_pm.add(pose_training)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with h5py.File(self.path, "r") as f:
+            table_group = f["processing/behavior/PoseTraining/training_frames_table"]
+            self.assertEqual(table_group.attrs["neurodata_type"], "TrainingFramesTable")
+            self.assertEqual(table_group["skeleton_instances_table/node_locations"].shape, (18, 2))
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_nwbfile = io.read()
+            read_pose_training = read_nwbfile.processing["behavior"]["PoseTraining"]
+            read_skeletons = read_nwbfile.processing["behavior"]["Skeletons"].skeletons
+            read_source_video = read_pose_training.source_videos.image_series["source_video"]
+            read_table = read_pose_training.training_frames_table
+            self.assertIsNone(read_pose_training.training_frames)
+            self.assertEqual(len(read_table), 3)
+            self.assertIs(read_table.skeleton_instances.table, read_table.skeleton_instances_table)
+
+            read_training_frames = read_table.to_training_frames().training_frames
+            self.assertEqual(list(read_training_frames.keys()), ["frame0", "frame1", "frame2"])
+            for frame, read_frame in zip(training_frames, read_training_frames.values()):
+                self.assertEqual(read_frame.annotator, frame.annotator)
+                self.assertIs(read_frame.source_video, read_source_video)
+                self.assertEqual(read_frame.source_video_frame_index, frame.source_video_frame_index)
+                instances = frame.skeleton_instances.skeleton_instances
+                read_instances = read_frame.skeleton_instances.skeleton_instances
+                self.assertEqual(list(read_instances.keys()), list(instances.keys()))
+                for instance, read_instance in zip(instances.values(), read_instances.values()):
+                    self.assertEqual(read_instance.id, instance.id)
+                    self.assertIs(read_instance.skeleton, read_skeletons[instance.skeleton.name])
+                    np.testing.assert_array_equal(read_instance.node_locations, instance.node_locations)
+                    np.testing.assert_array_equal(read_instance.node_visibility, instance.node_visibility)
+
+            read_frames = read_table.get_training_frames([2, 0, 2])
+            self.assertEqual([frame.name for frame in read_frames], ["frame2", "frame0", "frame2"])
+            self.assertEqual([len(frame.skeleton_instances.skeleton_instances) for frame in read_frames], [3, 1, 3])
+            self.assertEqual([frame.source_video_frame_index for frame in read_frames], [1002, 1000, 1002])
+
+    def test_extract_source_frames(self):
+        """Extract the frames of a read TrainingFramesTable from a video stored in the file and write them."""
+        video_data = np.random.default_rng(0).integers(0, 256, size=(10, 4, 5, 3), dtype=np.uint8)
+        source_video = ImageSeries(
+            name="source_video", description="Stored video.", unit="NA", data=video_data, rate=30.0
+        )
+        skeleton = mock_Skeleton(name="subject1")
+        frame_indices = [7, 2, 7]
+        training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i,
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[mock_SkeletonInstance(skeleton=skeleton)]
+                ),
+                source_video=source_video,
+                source_video_frame_index=np.uint(frame),
+            )
+            for i, frame in enumerate(frame_indices)
+        ]
+        pose_training = PoseTraining(
+            training_frames_table=TrainingFramesTable.from_training_frames(training_frames),
+            source_videos=SourceVideos(image_series=[source_video]),
+        )
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([Skeletons(skeletons=[skeleton]), pose_training])
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            read_table = read_nwbfile.processing["behavior"]["PoseTraining"].training_frames_table
+            read_nwbfile.processing["behavior"].add(read_table.extract_source_frames())
+            read_nwbfile.processing["behavior"].add(
+                ImageSeries(
+                    name="training_frame_video",
+                    description="Stacked frames of the training frames.",
+                    unit="NA",
+                    data=H5DataIO(read_table.extract_source_frames(stacked=True, batch_frames=1)),
+                    rate=1.0,
+                )
+            )
+            io.write(read_nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            images = read_nwbfile.processing["behavior"]["training_frame_images"]
+            self.assertEqual([image.name for image in images.order_of_images.data], ["frame0", "frame1", "frame2"])
+            for image, frame in zip(images.order_of_images.data, frame_indices):
+                np.testing.assert_array_equal(image.data[:], video_data[frame])
+            stacked = read_nwbfile.processing["behavior"]["training_frame_video"].data
+            self.assertEqual(stacked.chunks, (1, 4, 5, 3))
+            np.testing.assert_array_equal(stacked[:], video_data[frame_indices])
+
+
+class TestTrainingFramesTableRoundtripPyNWB(NWBH5IOFlexMixin, TestCase):
+    """Roundtrip test for PoseTraining with a TrainingFramesTable using pynwb.testing infrastructure."""
+
+    def getContainerType(self):
+        return "PoseTraining"
+
+    def addContainer(self):
+        """Add the test PoseTraining to the given NWBFile"""
+        skeleton = mock_Skeleton(name="subject1")
+        source_video = mock_source_video(name="source_video")
+        training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i,
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[mock_SkeletonInstance(id=np.uint(i), skeleton=skeleton)]
+                ),
+                source_video=source_video,
+                source_video_frame_index=np.uint(i),
+            )
+            for i in range(2)
+        ]
+        pose_training = PoseTraining(
+            training_frames_table=TrainingFramesTable.from_training_frames(training_frames),
+            source_videos=SourceVideos(image_series=[source_video]),
+        )
+
+        behavior_pm = self.nwbfile.create_processing_module(
+            name="behavior",
+            description="processed behavioral data",
+        )
+        behavior_pm.add(Skeletons(skeletons=[skeleton]))
+        behavior_pm.add(pose_training)
+
+    def getContainer(self, nwbfile: NWBFile):
+        return nwbfile.processing["behavior"]["PoseTraining"]
+
+
 class TestCalibratedCameraRoundtrip(TestCase):
     """Simple roundtrip test for CalibratedCamera."""
 
@@ -641,6 +1297,207 @@ class TestMultiCameraPoseEstimationRoundtrip(TestCase):
             self.assertEqual(len(read_mcpe.pose_estimations), 0)
 
 
+class TestMultiCameraPoseEstimationTriangulateRoundtrip(TestCase):
+    """Test triangulating 3D positions from the 2D series and calibrated cameras read from a file."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_multicamera_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        points = np.random.default_rng(1).normal(scale=50.0, size=(30, 3, 3))
+        pose_estimations = mock_projected_PoseEstimations(nwbfile=self.nwbfile, skeleton=skeleton, points=points)
+        mcpe = MultiCameraPoseEstimation(pose_estimations=pose_estimations, skeleton=skeleton)
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([mcpe, Skeletons(skeletons=[skeleton])])
+        mcpe.add_triangulated_series(unit="millimeters", reference_frame="Origin of the calibration.", chunk_size=8)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_mcpe = io.read().processing["behavior"]["MultiCameraPoseEstimation"]
+            for j, node in enumerate(skeleton.nodes):
+                series = read_mcpe.pose_estimation_series[node]
+                np.testing.assert_allclose(series.data[:], points[:, j], atol=1e-6)
+                np.testing.assert_array_equal(series.timestamps[:], np.arange(30) / 30.0)
+            result = read_mcpe.triangulate(chunk_size=8)
+            np.testing.assert_allclose(result.data, points, atol=1e-6)
+
+            # blocks triangulated in worker processes that open the file give the same result
+            parallel_result = read_mcpe.triangulate(chunk_size=8, num_workers=2)
+            for field, parallel_field in zip(result, parallel_result):
+                np.testing.assert_array_equal(parallel_field, field)
+
+
+class TestMultiCameraPoseEstimationReprojectRoundtrip(TestCase):
+    """Test reprojecting 3D series read from a file into cameras with lens distortion."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_multicamera_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        points = np.random.default_rng(1).normal(scale=50.0, size=(30, 3, 3))
+        pose_estimations = mock_projected_PoseEstimations(
+            nwbfile=self.nwbfile,
+            skeleton=skeleton,
+            points=points,
+            distortion_coefficients=np.array([-0.2, 0.05, 0.001, -0.002]),
+        )
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name=node, data=points[:, j], unit="millimeters")
+            for j, node in enumerate(skeleton.nodes)
+        ]
+        mcpe = MultiCameraPoseEstimation(
+            pose_estimation_series=pose_estimation_series, pose_estimations=pose_estimations, skeleton=skeleton
+        )
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([mcpe, Skeletons(skeletons=[skeleton])])
+        statistics = mcpe.get_reprojection_error_statistics(chunk_size=8).get_statistics()
+        behavior_pm.add(mcpe.get_reprojection_error_statistics(chunk_size=8).to_table())
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_behavior_pm = io.read().processing["behavior"]
+            read_table = read_behavior_pm["reprojection_error"]
+            self.assertEqual(len(read_table), 12)
+            for name, values in statistics.items():
+                np.testing.assert_array_equal(read_table[name].data[:], values)
+
+            read_mcpe = read_behavior_pm["MultiCameraPoseEstimation"]
+            reprojections = read_mcpe.reproject(chunk_size=8)
+            for pose_estimation in pose_estimations:
+                reprojection = reprojections[pose_estimation.name]
+                np.testing.assert_allclose(reprojection.data, pose_estimation.get_stacked_view().data[:], atol=1e-9)
+                np.testing.assert_array_less(reprojection.error, 1e-9)
+
+            parallel_reprojections = read_mcpe.reproject(chunk_size=8, num_workers=2)
+            for name, reprojection in reprojections.items():
+                np.testing.assert_array_equal(parallel_reprojections[name].data, reprojection.data)
+                np.testing.assert_array_equal(parallel_reprojections[name].error, reprojection.error)
+
+
+class TestUndistortedPoseEstimationRoundtrip(TestCase):
+    """Test writing an undistorted copy of a PoseEstimation read from a file to the same file."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        points = np.random.default_rng(1).normal(scale=50.0, size=(30, 3, 3))
+        pose_estimation = mock_projected_PoseEstimations(
+            nwbfile=self.nwbfile,
+            skeleton=skeleton,
+            points=points,
+            num_cameras=2,
+            distortion_coefficients=np.array([-0.3, 0.1, 0.001, -0.002, -0.02, 0.01, 0.0, 0.0]),
+        )[0]
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([pose_estimation, Skeletons(skeletons=[skeleton])])
+        camera = pose_estimation.device
+        expected = project_points(
+            points, camera.intrinsic_matrix @ np.column_stack([camera.rotation_matrix, camera.translation_vector])
+        )
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            read_pe = read_nwbfile.processing["behavior"]["PoseEstimation_camera1"]
+            np.testing.assert_allclose(read_pe.get_undistorted_view()[10:20], expected[10:20], atol=1e-6)
+            undistorted = read_pe.create_undistorted_pose_estimation(name="undistorted", chunk_size=8)
+            read_nwbfile.processing["behavior"].add(undistorted)
+            io.write(read_nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            read_pe = read_nwbfile.processing["behavior"]["undistorted"]
+            self.assertIs(read_pe.device, read_nwbfile.devices["camera1"])
+            np.testing.assert_allclose(read_pe.get_stacked_view().data[:], expected, atol=1e-6)
+            np.testing.assert_array_equal(read_pe.pose_estimation_series["nose"].confidence[:], np.ones(30))
+            np.testing.assert_array_equal(read_pe.pose_estimation_series["nose"].timestamps[:], np.arange(30) / 30.0)
+
+
+class TestResampledPoseEstimationRoundtrip(TestCase):
+    """Test writing camera views resampled onto a common clock and triangulating them after reading."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.path = "test_pose.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_roundtrip(self):
+        skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        points = np.random.default_rng(1).normal(scale=50.0, size=(30, 3, 3))
+        pose_estimations = mock_projected_PoseEstimations(nwbfile=self.nwbfile, skeleton=skeleton, points=points)
+        mcpe = MultiCameraPoseEstimation(pose_estimations=pose_estimations, skeleton=skeleton)
+        behavior_pm = self.nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        behavior_pm.add([mcpe, Skeletons(skeletons=[skeleton])])
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+
+        # a common clock 2 ms after the frames, which the nearest frames match exactly
+        target = np.arange(30) / 30.0 + 0.002
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            read_mcpe = read_nwbfile.processing["behavior"]["MultiCameraPoseEstimation"]
+            views = read_mcpe.get_resampled_views(target, method="nearest")
+            np.testing.assert_array_equal(
+                views["PoseEstimation_camera2"].data[:], pose_estimations[1].get_stacked_view().data[:]
+            )
+            resampled = read_mcpe.create_resampled_pose_estimations(target, method="nearest", chunk_size=8)
+            read_nwbfile.processing["behavior"].add(
+                MultiCameraPoseEstimation(name="resampled", pose_estimations=resampled, skeleton=read_mcpe.skeleton)
+            )
+            io.write(read_nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_mcpe = io.read().processing["behavior"]["resampled"]
+            names = ["PoseEstimation_camera%d_resampled" % i for i in (1, 2, 3)]
+            self.assertEqual(list(read_mcpe.pose_estimations), names)
+            for pose_estimation in read_mcpe.pose_estimations.values():
+                for series in pose_estimation.pose_estimation_series.values():
+                    np.testing.assert_array_equal(series.timestamps[:], target)
+                    np.testing.assert_array_equal(series.confidence[:], np.ones(30))
+            np.testing.assert_allclose(read_mcpe.triangulate().data, points, atol=1e-6)
+
+
 class TestMultiCameraPoseEstimationRoundtripPyNWB(NWBH5IOFlexMixin, TestCase):
     """Full roundtrip test using the pynwb.testing infrastructure."""
 
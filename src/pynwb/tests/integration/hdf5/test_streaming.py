@@ -0,0 +1,176 @@
+import datetime
+
+import h5py
+import numpy as np
+
+from pynwb import NWBHDF5IO, NWBFile
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_pose import Skeletons
+from ndx_pose.streaming import PoseEstimationAppender, create_appendable_pose_estimation
+from ndx_pose.testing.mock.pose import mock_Skeleton
+
+
+class TestPoseEstimationAppender(TestCase):
+    """Test appending batches of frames to a written PoseEstimation."""
+
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.camera = self.nwbfile.create_device(name="camera1")
+        self.skeleton = mock_Skeleton()
+        self.behavior_pm = self.nwbfile.create_processing_module(
+            name="behavior", description="processed behavioral data"
+        )
+        self.behavior_pm.add(Skeletons(skeletons=[self.skeleton]))
+        self.path = "test_streaming.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_append(self):
+        pe = create_appendable_pose_estimation(
+            skeleton=self.skeleton,
+            num_dims=2,
+            device=self.camera,
+            chunk_frames=8,
+            source_software="SLEAP",
+        )
+        self.behavior_pm.add(pe)
+        rng = np.random.default_rng(0)
+        data = rng.random((25, 3, 2))
+        confidence = rng.random((25, 3))
+        timestamps = np.arange(25) / 30.0
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+            with PoseEstimationAppender(pe, flush_every=2) as appender:
+                for batch in (slice(0, 10), slice(10, 20), slice(20, 25)):
+                    appender.append(data=data[batch], confidence=confidence[batch], timestamps=timestamps[batch])
+                self.assertEqual(appender.num_frames, 25)
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_nwbfile = io.read()
+            read_pe = read_nwbfile.processing["behavior"]["PoseEstimation"]
+            self.assertEqual(read_pe.source_software, "SLEAP")
+            view = read_pe.get_stacked_view()
+            np.testing.assert_array_equal(view.data[:], data)
+            np.testing.assert_array_equal(view.confidence[:], confidence)
+            np.testing.assert_array_equal(read_pe.get_timestamps(), timestamps)
+            read_series = list(read_pe.pose_estimation_series.values())
+            self.assertIs(read_series[2].timestamps, read_series[0].timestamps)
+            self.assertEqual(read_series[0].data.maxshape, (None, 2))
+            self.assertEqual(read_series[0].data.chunks, (8, 2))
+
+    def test_interrupted_append(self):
+        pe = create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=2, chunk_frames=4)
+        self.behavior_pm.add(pe)
+        rng = np.random.default_rng(0)
+        data = rng.random((30, 3, 2))
+        confidence = rng.random((30, 3))
+        timestamps = np.arange(30) / 30.0
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+            with PoseEstimationAppender(pe) as appender:
+                appender.append(data=data[:10], confidence=confidence[:10], timestamps=timestamps[:10])
+
+        # a crash while the second batch was written: all datasets were grown, but only some of them were written,
+        # and the 'data' of the first node was grown once more, as a writer that grows one dataset at a time would do
+        with h5py.File(self.path, "r+") as f:
+            group = f["processing/behavior/PoseEstimation"]
+            for node in self.skeleton.nodes:
+                for field in ("data", "confidence", "timestamps"):
+                    if field in group[node] and isinstance(group[node].get(field, getlink=True), h5py.HardLink):
+                        group[node][field].resize(20, axis=0)
+            group["node1/data"][10:20] = data[10:20, 0]
+            group["node1/timestamps"][10:13] = timestamps[10:13]
+            group["node1/data"].resize(25, axis=0)
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            with self.assertWarnsRegex(UserWarning, "Length of data does not match length of timestamps"):
+                read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            with PoseEstimationAppender(read_pe) as appender:
+                self.assertEqual(appender.num_frames, 10)
+                appender.append(data=data[10:30], confidence=confidence[10:30], timestamps=timestamps[10:30])
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            view = read_pe.get_stacked_view()
+            np.testing.assert_array_equal(read_pe.get_timestamps(), timestamps)
+            np.testing.assert_array_equal(view.data[:], data)
+            np.testing.assert_array_equal(view.confidence[:], confidence)
+
+    def test_interrupted_append_rate(self):
+        pe = create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=2, rate=30, chunk_frames=4)
+        self.behavior_pm.add(pe)
+        data = np.arange(60.0).reshape((10, 3, 2))
+        confidence = np.ones((10, 3))
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+            with PoseEstimationAppender(pe) as appender:
+                appender.append(data=data[:4], confidence=confidence[:4])
+
+        # a crash after all datasets were grown for the second batch but before all of them were written
+        with h5py.File(self.path, "r+") as f:
+            group = f["processing/behavior/PoseEstimation"]
+            for node in self.skeleton.nodes:
+                group[node]["data"].resize(8, axis=0)
+                group[node]["confidence"].resize(8, axis=0)
+            group["node1/data"][4:8] = data[4:8, 0]
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            with PoseEstimationAppender(read_pe) as appender:
+                self.assertEqual(appender.num_frames, 4)
+                appender.append(data=data[4:], confidence=confidence[4:])
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            np.testing.assert_array_equal(read_pe.get_stacked_view().data[:], data)
+            self.assertEqual(read_pe.pose_estimation_series["node1"].rate, 30.0)
+
+    def test_append_rate(self):
+        pe = create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=3, rate=100.0, starting_time=5.0)
+        self.behavior_pm.add(pe)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+            appender = PoseEstimationAppender(pe)
+            appender.append(data=np.ones((4, 3, 3)), confidence=np.ones((4, 3)))
+            msg = "'timestamps' cannot be appended because the series were created with a 'rate'."
+            with self.assertRaisesWith(ValueError, msg):
+                appender.append(data=np.ones((4, 3, 3)), confidence=np.ones((4, 3)), timestamps=np.arange(4.0))
+
+        with NWBHDF5IO(self.path, mode="r", load_namespaces=True) as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            self.assertEqual(read_pe.get_stacked_view().shape, (4, 3, 3))
+            np.testing.assert_array_almost_equal(read_pe.get_timestamps(), 5.0 + np.arange(4) / 100.0)
+
+    def test_append_bad_shape_raises(self):
+        pe = create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=2)
+        self.behavior_pm.add(pe)
+
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+            appender = PoseEstimationAppender(pe)
+            with self.assertRaisesWith(ValueError, "'data' must have shape (num_frames, 3, 2), got (4, 2, 2)."):
+                appender.append(data=np.ones((4, 2, 2)), confidence=np.ones((4, 2)), timestamps=np.arange(4.0))
+
+    def test_not_written_raises(self):
+        pe = create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=2)
+        msg = (
+            "The 'data' dataset of PoseEstimationSeries 'node1' has not been written. Create the PoseEstimation with "
+            "create_appendable_pose_estimation() and write the NWBFile before appending."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            PoseEstimationAppender(pe)
+
+    def test_bad_argument_type_raises(self):
+        msg = "create_appendable_pose_estimation: incorrect type for 'num_dims' (got 'float', expected 'int')"
+        with self.assertRaisesWith(TypeError, msg):
+            create_appendable_pose_estimation(skeleton=self.skeleton, num_dims=2.0)
@@ -0,0 +1,344 @@
+import datetime
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from pynwb import NWBHDF5IO, NWBFile
+from pynwb.testing import TestCase
+
+from ndx_pose import PoseEstimation
+from ndx_pose.importers import read_dlc, read_sleap
+
+
+def make_dlc_dataframe(values, bodyparts, individuals=None, scorer="DLC_resnet50_openfieldOct30shuffle1_1600"):
+    """Create a dataframe with the columns of a DeepLabCut output file, holding (num_frames, num_columns) values."""
+    if individuals is None:
+        columns = pd.MultiIndex.from_product(
+            [[scorer], bodyparts, ["x", "y", "likelihood"]], names=["scorer", "bodyparts", "coords"]
+        )
+    else:
+        columns = pd.MultiIndex.from_product(
+            [[scorer], individuals, bodyparts, ["x", "y", "likelihood"]],
+            names=["scorer", "individuals", "bodyparts", "coords"],
+        )
+    return pd.DataFrame(values, columns=columns)
+
+
+class TestReadDLC(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.bodyparts = ["snout", "leftear", "rightear", "tailbase"]
+        self.values = np.random.rand(50, 12)
+        self.values[7, 3:6] = np.nan  # a missing detection of "leftear"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _path(self, filename):
+        return os.path.join(self.tmpdir.name, filename)
+
+    def _check_single_animal(self, result):
+        self.assertEqual(len(result.pose_estimations), 1)
+        pe = result.pose_estimations[0]
+        self.assertIsInstance(pe, PoseEstimation)
+        self.assertEqual(pe.name, "PoseEstimation")
+        self.assertEqual(pe.scorer, "DLC_resnet50_openfieldOct30shuffle1_1600")
+        self.assertEqual(pe.source_software, "DeepLabCut")
+        self.assertEqual(pe.skeleton.name, "subject")
+        self.assertEqual(pe.skeleton.nodes, self.bodyparts)
+        self.assertIs(result.skeletons.skeletons["subject"], pe.skeleton)
+        view = pe.get_stacked_view()
+        np.testing.assert_array_equal(view.data[:], self.values.reshape((50, 4, 3))[:, :, :2])
+        np.testing.assert_array_equal(view.confidence[:], self.values.reshape((50, 4, 3))[:, :, 2])
+        series = pe.pose_estimation_series["rightear"]
+        self.assertEqual(
+            series.confidence_definition, "Likelihood of the estimated position, as computed by DeepLabCut."
+        )
+
+    def test_csv(self):
+        path = self._path("video1DLC_resnet50.csv")
+        make_dlc_dataframe(self.values, self.bodyparts).to_csv(path)
+        result = read_dlc(path, rate=30.0, chunk_size=16)
+        self._check_single_animal(result)
+        # the arrays of each node are filled block by block, not views of an array of the whole file
+        for series in result.pose_estimations[0].pose_estimation_series.values():
+            self.assertIsNone(series.data.base)
+            self.assertIsNone(series.confidence.base)
+        np.testing.assert_array_almost_equal(result.pose_estimations[0].get_timestamps(), np.arange(50) / 30.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("tables"), "PyTables is not installed")
+    def test_h5(self):
+        path = self._path("video1DLC_resnet50.h5")
+        df = make_dlc_dataframe(self.values, self.bodyparts)
+        df.to_hdf(path, key="df_with_missing", format="table", mode="w")
+        timestamps = np.arange(50) / 30.0 + 2.0
+        result = read_dlc(path, timestamps=timestamps, chunk_size=16)
+        self._check_single_animal(result)
+        pose_estimation_series = list(result.pose_estimations[0].pose_estimation_series.values())
+        np.testing.assert_array_equal(pose_estimation_series[0].timestamps, timestamps)
+        self.assertIs(pose_estimation_series[3].timestamps, pose_estimation_series[0].timestamps)
+
+    def test_many_bodyparts(self):
+        path = self._path("video1DLC_resnet50_many.csv")
+        bodyparts = ["bodypart%d" % i for i in range(300)]
+        make_dlc_dataframe(np.random.rand(5, 900), bodyparts).to_csv(path)
+        edges = [("bodypart0", "bodypart255"), ("bodypart255", "bodypart1")]
+        skeleton = read_dlc(path, rate=30.0, edges=edges).pose_estimations[0].skeleton
+        np.testing.assert_array_equal(skeleton.edges, [[0, 255], [255, 1]])
+        self.assertEqual(skeleton.edges.dtype, np.uint8)
+        msg = (
+            "Skeleton edges are stored as uint8 node indices, so they can refer only to the first 256 nodes, but "
+            "edges refer to node index 299."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            read_dlc(path, rate=30.0, edges=[("bodypart0", "bodypart299")])
+
+    def test_multi_animal(self):
+        path = self._path("video1DLC_resnet50_multi.csv")
+        values = np.random.rand(20, 2 * 2 * 3)
+        make_dlc_dataframe(values, ["snout", "tailbase"], individuals=["mouse1", "mouse2"]).to_csv(path)
+        result = read_dlc(path, rate=30.0, edges=[("snout", "tailbase")], description="DLC estimates.")
+        self.assertEqual(
+            [pe.name for pe in result.pose_estimations], ["PoseEstimation_mouse1", "PoseEstimation_mouse2"]
+        )
+        self.assertEqual(list(result.skeletons.skeletons), ["mouse1", "mouse2"])
+        pe = result.pose_estimations[1]
+        self.assertEqual(pe.description, "DLC estimates.")
+        self.assertEqual(pe.skeleton.name, "mouse2")
+        np.testing.assert_array_equal(pe.skeleton.edges, [[0, 1]])
+        np.testing.assert_array_equal(pe.pose_estimation_series["tailbase"].data, values[:, 9:11])
+        np.testing.assert_array_equal(pe.pose_estimation_series["tailbase"].confidence, values[:, 11])
+
+        result = read_dlc(path, rate=30.0, individuals=["mouse2"])
+        self.assertEqual([pe.name for pe in result.pose_estimations], ["PoseEstimation_mouse2"])
+        msg = "The individuals ['mouse3'] are not in '%s'. Available individuals: ['mouse1', 'mouse2']." % path
+        with self.assertRaisesWith(ValueError, msg):
+            read_dlc(path, rate=30.0, individuals=["mouse3"])
+
+    def test_write(self):
+        path = self._path("video1DLC_resnet50.csv")
+        make_dlc_dataframe(self.values, self.bodyparts).to_csv(path)
+        result = read_dlc(path, rate=30.0)
+        nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        result.add_to(behavior_pm)
+        nwb_path = self._path("test_dlc.nwb")
+        with NWBHDF5IO(nwb_path, mode="w") as io:
+            io.write(nwbfile)
+        with NWBHDF5IO(nwb_path, mode="r", load_namespaces=True) as io:
+            read_pe = io.read().processing["behavior"]["PoseEstimation"]
+            self.assertContainerEqual(read_pe, result.pose_estimations[0])
+
+    def test_bad_timing_raises(self):
+        path = self._path("video1DLC_resnet50.csv")
+        make_dlc_dataframe(self.values, self.bodyparts).to_csv(path)
+        with self.assertRaisesWith(ValueError, "Exactly one of 'timestamps' and 'rate' must be given."):
+            read_dlc(path)
+        with self.assertRaisesWith(ValueError, "There are 10 timestamps but 50 frames."):
+            read_dlc(path, timestamps=np.arange(10.0))
+
+    def test_not_dlc_raises(self):
+        path = self._path("other.csv")
+        pd.DataFrame(self.values).to_csv(path)
+        msg = "'%s' is not a DeepLabCut output file: no 'coords' header row was found." % path
+        with self.assertRaisesWith(ValueError, msg):
+            read_dlc(path, rate=30.0)
+
+
+def write_slp(path, user_instances, predicted_instances, num_nodes=3, tracks=("mouse1", "mouse2")):
+    """Write a minimal SLEAP labels file with one skeleton and two videos.
+
+    'user_instances' and 'predicted_instances' are lists of (video, frame_idx, track, points) tuples, where 'points'
+    is a (num_nodes, 2) array, with NaN for invisible nodes, and 'track' is -1 for untracked instances.
+    """
+    node_names = ["head", "thorax", "abdomen", "wing"][:num_nodes]
+    metadata = {
+        "version": "2.0.0",
+        "nodes": [{"name": node, "weight": 1.0} for node in node_names],
+        "skeletons": [
+            {
+                "directed": True,
+                "graph": {"name": "fly", "num_edges_inserted": 2},
+                "links": [
+                    {
+                        "source": 0,
+                        "target": 1,
+                        "type": {"py/reduce": [{"py/type": "sleap.skeleton.EdgeType"}, {"py/tuple": [1]}]},
+                    },
+                    {"source": 1, "target": 2, "type": {"py/id": 1}},
+                    {
+                        "source": 0,
+                        "target": 2,
+                        "type": {"py/reduce": [{"py/type": "sleap.skeleton.EdgeType"}, {"py/tuple": [2]}]},
+                    },
+                ],
+                "multigraph": True,
+                "nodes": [{"id": i} for i in range(num_nodes)],
+            }
+        ],
+        "provenance": {"sleap_version": "1.3.3"},
+    }
+    frame_dtype = np.dtype(
+        [
+            ("frame_id", "<u8"),
+            ("video", "<u4"),
+            ("frame_idx", "<u8"),
+            ("instance_id_start", "<u8"),
+            ("instance_id_end", "<u8"),
+        ]
+    )
+    instance_dtype = np.dtype(
+        [
+            ("instance_id", "<i8"),
+            ("instance_type", "u1"),
+            ("frame_id", "<u8"),
+            ("skeleton", "<u4"),
+            ("track", "<i4"),
+            ("from_predicted", "<i8"),
+            ("score", "<f4"),
+            ("point_id_start", "<u8"),
+            ("point_id_end", "<u8"),
+        ]
+    )
+    point_dtype = np.dtype([("x", "<f8"), ("y", "<f8"), ("visible", "?"), ("complete", "?")])
+    pred_point_dtype = np.dtype([("x", "<f8"), ("y", "<f8"), ("visible", "?"), ("complete", "?"), ("score", "<f8")])
+
+    labeled = sorted({(video, frame_idx) for video, frame_idx, *_ in user_instances + predicted_instances})
+    frame_ids = {key: i for i, key in enumerate(labeled)}
+    frames, instances, points, pred_points = [], [], [], []
+    for key in labeled:
+        start = len(instances)
+        for instance_type, instance_list in ((0, user_instances), (1, predicted_instances)):
+            for video, frame_idx, track, instance_points in instance_list:
+                if (video, frame_idx) != key:
+                    continue
+                target = points if instance_type == 0 else pred_points
+                point_id_start = len(target)
+                for x, y in instance_points:
+                    visible = not np.isnan(x)
+                    if instance_type == 0:
+                        target.append((x, y, visible, True))
+                    else:
+                        target.append((x, y, visible, True, 0.5 + 0.001 * x if visible else 0.0))
+                score = 0.9 if track >= 0 else 0.1 * (len(instances) % 7)
+                instances.append(
+                    (len(instances), instance_type, frame_ids[key], 0, track, -1, score, point_id_start, len(target))
+                )
+        frames.append((frame_ids[key], key[0], key[1], start, len(instances)))
+
+    with h5py.File(path, mode="w") as f:
+        group = f.create_group("metadata")
+        group.attrs["format_id"] = 1.2
+        group.attrs["json"] = np.bytes_(json.dumps(metadata))
+        videos = [json.dumps({"backend": {"filename": "video%d.mp4" % i, "dataset": ""}}) for i in range(2)]
+        f.create_dataset("videos_json", data=np.array(videos, dtype=h5py.string_dtype()))
+        f.create_dataset(
+            "tracks_json", data=np.array([json.dumps([0, track]) for track in tracks], dtype=h5py.string_dtype())
+        )
+        f.create_dataset("frames", data=np.array(frames, dtype=frame_dtype))
+        f.create_dataset("instances", data=np.array(instances, dtype=instance_dtype))
+        f.create_dataset("points", data=np.array(points, dtype=point_dtype))
+        f.create_dataset("pred_points", data=np.array(pred_points, dtype=pred_point_dtype))
+
+
+class TestReadSLEAP(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "labels.v001.slp")
+        rng = np.random.default_rng(0)
+        self.user_instances = [
+            (0, 3, 0, rng.random((3, 2)) * 100),
+            (0, 3, 1, rng.random((3, 2)) * 100),
+            (0, 10, 0, np.array([[1.0, 2.0], [np.nan, np.nan], [5.0, 6.0]])),
+            (1, 4, -1, rng.random((3, 2)) * 100),
+        ]
+        self.predicted_instances = [
+            (0, frame_idx, track, rng.random((3, 2)) * 100) for frame_idx in (0, 1, 2, 5) for track in (0, 1)
+        ][:-1] + [(0, 7, 1, rng.random((3, 2)) * 100)]
+        write_slp(self.path, self.user_instances, self.predicted_instances)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_skeletons_and_videos(self):
+        result = read_sleap(self.path, rate=30.0)
+        skeleton = result.skeletons.skeletons["fly"]
+        self.assertEqual(skeleton.nodes, ["head", "thorax", "abdomen"])
+        np.testing.assert_array_equal(skeleton.edges, [[0, 1], [1, 2]])  # the symmetry edge is not a skeleton edge
+        videos = result.pose_training.source_videos.image_series
+        self.assertEqual(list(videos), ["video_0", "video_1"])
+        self.assertEqual(list(videos["video_1"].external_file), ["video1.mp4"])
+        self.assertEqual(videos["video_1"].rate, 30.0)
+
+    def test_training_frames(self):
+        result = read_sleap(self.path, rate=30.0)
+        training_frames = result.pose_training.training_frames.training_frames
+        self.assertEqual(list(training_frames), ["video_0_frame_3", "video_0_frame_10", "video_1_frame_4"])
+        frame = training_frames["video_0_frame_3"]
+        self.assertIs(frame.source_video, result.pose_training.source_videos.image_series["video_0"])
+        self.assertEqual(frame.source_video_frame_index, 3)
+        instances = frame.skeleton_instances.skeleton_instances
+        self.assertEqual(len(instances), 2)
+        np.testing.assert_array_equal(instances["instance_1"].node_locations, self.user_instances[1][3])
+        self.assertIs(instances["instance_1"].skeleton, result.skeletons.skeletons["fly"])
+        instance = training_frames["video_0_frame_10"].skeleton_instances.skeleton_instances["instance_0"]
+        np.testing.assert_array_equal(instance.node_visibility, [True, False, True])
+        np.testing.assert_array_equal(instance.node_locations, self.user_instances[2][3])
+
+    def test_pose_estimations(self):
+        result = read_sleap(self.path, rate=30.0, description="SLEAP predictions.")
+        pose_estimations = {pe.name: pe for pe in result.pose_estimations}
+        self.assertEqual(list(pose_estimations), ["PoseEstimation_video_0_mouse1", "PoseEstimation_video_0_mouse2"])
+        pe = pose_estimations["PoseEstimation_video_0_mouse2"]
+        self.assertEqual(pe.source_software, "SLEAP")
+        self.assertEqual(pe.source_software_version, "1.3.3")
+        self.assertEqual(pe.description, "SLEAP predictions.")
+        self.assertIs(pe.source_video, result.pose_training.source_videos.image_series["video_0"])
+        np.testing.assert_array_almost_equal(pe.get_timestamps(), np.array([0, 1, 2, 5, 7]) / 30.0)
+        view = pe.get_stacked_view()
+        # mouse2 has no instance in frame 5, and mouse1 has no instance in frame 7
+        expected = [points for _, _, track, points in self.predicted_instances if track == 1]
+        np.testing.assert_array_equal(view.data[[0, 1, 2, 4]], np.stack(expected))
+        self.assertTrue(np.isnan(view.data[3]).all())
+        self.assertTrue(np.isnan(pose_estimations["PoseEstimation_video_0_mouse1"].get_stacked_view().data[4]).all())
+        np.testing.assert_array_almost_equal(view.confidence[0], 0.5 + 0.001 * expected[0][:, 0])
+
+    def test_timestamps(self):
+        timestamps = {0: np.arange(100) / 25.0 + 10.0, 1: np.arange(100) / 25.0 + 20.0}
+        result = read_sleap(self.path, timestamps=timestamps)
+        np.testing.assert_array_equal(result.pose_estimations[0].get_timestamps(), timestamps[0][[0, 1, 2, 5, 7]])
+        with self.assertRaisesWith(
+            ValueError, "Either 'rate' or the timestamps of video 1 in 'timestamps' must be given."
+        ):
+            read_sleap(self.path, timestamps={0: timestamps[0]})
+
+    def test_write(self):
+        result = read_sleap(self.path, rate=30.0)
+        nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        behavior_pm = nwbfile.create_processing_module(name="behavior", description="processed behavioral data")
+        result.add_to(behavior_pm)
+        nwb_path = os.path.join(self.tmpdir.name, "test_sleap.nwb")
+        with NWBHDF5IO(nwb_path, mode="w") as io:
+            io.write(nwbfile)
+        with NWBHDF5IO(nwb_path, mode="r", load_namespaces=True) as io:
+            read_behavior_pm = io.read().processing["behavior"]
+            self.assertContainerEqual(read_behavior_pm["PoseTraining"], result.pose_training)
+            read_pe = read_behavior_pm["PoseEstimation_video_0_mouse1"]
+            pe = result.pose_estimations[0]
+            self.assertContainerEqual(read_pe.source_video, pe.source_video)
+            for node in pe.nodes:
+                self.assertContainerEqual(read_pe.pose_estimation_series[node], pe.pose_estimation_series[node])
@@ -1,6 +1,13 @@
 import datetime
+import importlib.util
+import os
+import tempfile
+import types
+import unittest
+
 import numpy as np
 
+from hdmf.backends.hdf5.h5_utils import H5DataIO
 from pynwb import NWBFile
 from pynwb.device import Device, DeviceModel
 from pynwb.testing import TestCase
@@ -18,6 +25,8 @@ from ndx_pose import (
     SkeletonInstance,
     PoseTraining,
     TrainingFrames,
+    SkeletonInstancesTable,
+    TrainingFramesTable,
     SourceVideos,
 )
 from ndx_pose.testing.mock.pose import (
@@ -25,13 +34,28 @@ from ndx_pose.testing.mock.pose import (
     mock_MultiCameraPoseEstimation,
     mock_PoseEstimation,
     mock_PoseEstimationSeries,
+    mock_projected_PoseEstimations,
     mock_SkeletonInstances,
     mock_source_video,
     mock_source_frame,
     mock_Skeleton,
     mock_SkeletonInstance,
     mock_TrainingFrame,
+    mock_TrainingFramesTable,
+)
+from ndx_pose.dataio import MISSING_POSITION, DecodedArray
+from ndx_pose.kinematics import compute_bone_lengths, compute_joint_angles
+from ndx_pose.multiview import distort_points, project_points, triangulate_points, undistort_normalized_points
+from ndx_pose.resample import merge_counts
+from ndx_pose import video
+from ndx_pose.video import (
+    FrameDataChunkIterator,
+    assign_frame_ranges,
+    extract_training_frames,
+    get_keyframe_interval,
+    get_seeks,
 )
+from ndx_pose.views import get_time_index_bounds
 
 # NOTE Skeletons, TrainingFrames, SourceVideos are tested within PoseTraining but not separately tested
 
@@ -62,6 +86,99 @@ class TestPoseEstimationSeriesConstructor(TestCase):
         self.assertEqual(pes.confidence_definition, "Softmax output of the deep neural network.")
 
 
+class TestPoseEstimationSeriesTimeSlice(TestCase):
+    def test_timestamps(self):
+        pes = mock_PoseEstimationSeries(data=np.random.rand(100, 2), timestamps=np.arange(100) * 0.1)
+        time_slice = pes.get_time_slice(2.0, 3.05)
+        self.assertEqual(pes.get_time_index_bounds(2.0, 3.05), slice(20, 31))
+        np.testing.assert_array_equal(time_slice.timestamps, np.arange(100)[20:31] * 0.1)
+        np.testing.assert_array_equal(time_slice.data, pes.data[20:31])
+        np.testing.assert_array_equal(time_slice.confidence, pes.confidence[20:31])
+
+    def test_out_of_range(self):
+        pes = mock_PoseEstimationSeries(timestamps=np.arange(10.0))
+        self.assertEqual(pes.get_time_index_bounds(-5.0, -1.0), slice(0, 0))
+        self.assertEqual(pes.get_time_index_bounds(20.0, 30.0), slice(10, 10))
+        self.assertEqual(pes.get_time_slice(-5.0, 30.0).data.shape, (10, 3))
+
+    def test_rate(self):
+        pes = mock_PoseEstimationSeries(data=np.random.rand(100, 2), rate=30.0, starting_time=1.0)
+        timestamps = pes.get_timestamps()
+        for start_time, stop_time in [(0.0, 1.0), (1.0, 2.0), (1.5, 1.6), (2.0, 10.0), (timestamps[7], timestamps[9])]:
+            expected = np.flatnonzero((timestamps >= start_time) & (timestamps < stop_time))
+            bounds = pes.get_time_index_bounds(start_time, stop_time)
+            np.testing.assert_array_equal(np.arange(100)[bounds], expected)
+        time_slice = pes.get_time_slice(1.5, 1.6)
+        np.testing.assert_array_almost_equal(time_slice.timestamps, timestamps[15:18])
+        np.testing.assert_array_equal(time_slice.data, pes.data[15:18])
+
+    def test_bisection_reads(self):
+        """Test that the bounds are found by reading O(log n) timestamps from an array that is not in memory."""
+
+        class CountingArray:
+            def __init__(self, array):
+                self.array = array
+                self.shape = array.shape
+                self.num_reads = 0
+
+            def __len__(self):
+                return len(self.array)
+
+            def __getitem__(self, key):
+                self.num_reads += 1
+                return self.array[key]
+
+        timestamps = CountingArray(np.arange(1_000_000) / 200.0)
+        series = types.SimpleNamespace(timestamps=timestamps)
+        self.assertEqual(get_time_index_bounds(series, 100.0, 102.0), slice(20000, 20400))
+        self.assertLessEqual(timestamps.num_reads, 2 * 20)
+
+    def test_bad_window_raises(self):
+        pes = mock_PoseEstimationSeries()
+        with self.assertRaisesWith(ValueError, "'stop_time' (1.0) must not be less than 'start_time' (2.0)."):
+            pes.get_time_slice(2.0, 1.0)
+
+
+class TestPoseEstimationSeriesMasked(TestCase):
+    def setUp(self):
+        self.data = np.arange(20, dtype=np.float64).reshape((10, 2))
+        self.confidence = np.array([0.1, 0.95, 0.5, 0.99, np.nan, 0.91, 0.2, 0.9, 1.0, 0.0])
+        self.pes = mock_PoseEstimationSeries(data=self.data, confidence=self.confidence)
+        self.expected = self.data.copy()
+        self.expected[~(self.confidence >= 0.9)] = np.nan
+
+    def test_masked(self):
+        masked = self.pes.masked(min_confidence=0.9)
+        self.assertEqual(masked.shape, (10, 2))
+        np.testing.assert_array_equal(masked[:], self.expected)
+        np.testing.assert_array_equal(np.asarray(masked), self.expected)
+        # the source data is not modified
+        np.testing.assert_array_equal(self.pes.data, np.arange(20, dtype=np.float64).reshape((10, 2)))
+
+    def test_masked_slicing(self):
+        masked = self.pes.masked(min_confidence=0.9)
+        np.testing.assert_array_equal(masked[2:6], self.expected[2:6])
+        np.testing.assert_array_equal(masked[::2, 1], self.expected[::2, 1])
+        np.testing.assert_array_equal(masked[[8, 0, 3]], self.expected[[8, 0, 3]])
+        np.testing.assert_array_equal(masked[1, 0], self.expected[1, 0])
+        self.assertTrue(np.isnan(masked[0, 0]))
+
+    def test_masked_iter_chunks(self):
+        blocks = [block for _, block in self.pes.masked(min_confidence=0.9).iter_chunks(chunk_size=4)]
+        self.assertEqual([len(block) for block in blocks], [4, 4, 2])
+        np.testing.assert_array_equal(np.concatenate(blocks), self.expected)
+
+    def test_masked_without_confidence_raises(self):
+        pes = PoseEstimationSeries(
+            name="front_left_paw",
+            data=self.data,
+            reference_frame="(0,0,0) corresponds to ...",
+            rate=30.0,
+        )
+        with self.assertRaisesWith(ValueError, "Cannot mask positions by confidence: there are no confidence values."):
+            pes.masked(min_confidence=0.9)
+
+
 class TestSkeleton(TestCase):
     def test_init(self):
         subject = Subject(subject_id="MOUSE001", species="Mus musculus")
@@ -86,6 +203,109 @@ class TestSkeleton(TestCase):
         )
         self.assertIsNone(skeleton.subject)
 
+    def test_edges_converted_to_uint(self):
+        skeleton = Skeleton(name="subject1", nodes=["a", "b", "c"], edges=[[0, 1], [1, 2]])
+        self.assertEqual(skeleton.edges.dtype, np.uint8)
+        np.testing.assert_array_equal(skeleton.edges, [[0, 1], [1, 2]])
+
+        skeleton = Skeleton(name="subject1", nodes=["node%d" % i for i in range(300)], edges=[[0, 255]])
+        self.assertEqual(skeleton.edges.dtype, np.uint8)
+
+    def test_edges_out_of_uint8_range_raises(self):
+        msg = (
+            "Skeleton edges are stored as uint8 node indices, so they can refer only to the first 256 nodes, but "
+            "edges refer to node index 299."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            Skeleton(name="subject1", nodes=["node%d" % i for i in range(300)], edges=[[0, 299]])
+
+    def test_duplicate_nodes_raises(self):
+        msg = "Skeleton nodes must be unique, but these nodes appear more than once: ['a']"
+        with self.assertRaisesWith(ValueError, msg):
+            Skeleton(name="subject1", nodes=["a", "b", "a"])
+
+    def test_bad_edges_raises(self):
+        msg = "Skeleton edges must refer to node indices between 0 and 2, but edges [1, 2] do not: [[1, 3], [-1, 0]]"
+        with self.assertRaisesWith(ValueError, msg):
+            Skeleton(name="subject1", nodes=["a", "b", "c"], edges=[[0, 1], [1, 3], [-1, 0]])
+        msg = "Skeleton edges must connect two different nodes, but edges [1] connect a node to itself."
+        with self.assertRaisesWith(ValueError, msg):
+            Skeleton(name="subject1", nodes=["a", "b", "c"], edges=[[0, 1], [2, 2]])
+
+
+class TestSkeletonGraph(TestCase):
+    def setUp(self):
+        # two components: a tree rooted at "nose" and the pair "tail_base"-"tail_tip", and an unconnected "marker"
+        self.skeleton = Skeleton(
+            name="subject1",
+            nodes=["nose", "neck", "left_ear", "right_ear", "tail_base", "tail_tip", "marker"],
+            edges=np.array([[0, 1], [1, 2], [1, 3], [4, 5], [1, 0]], dtype="uint8"),
+        )
+
+    def test_node_index(self):
+        graph = self.skeleton.graph
+        self.assertEqual(graph.node_index["tail_tip"], 5)
+        np.testing.assert_array_equal(self.skeleton.get_node_indices(["right_ear", "nose"]), [3, 0])
+        msg = (
+            "The skeleton has no node(s) named ['tail']. Its nodes are ['nose', 'neck', 'left_ear', 'right_ear', "
+            "'tail_base', 'tail_tip', 'marker']."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            self.skeleton.get_node_indices(["nose", "tail"])
+
+    def test_adjacency(self):
+        graph = self.skeleton.graph
+        np.testing.assert_array_equal(graph.indptr, [0, 1, 4, 5, 6, 7, 8, 8])
+        np.testing.assert_array_equal(graph.indices, [1, 0, 2, 3, 1, 1, 5, 4])
+        np.testing.assert_array_equal(graph.degree, [1, 3, 1, 1, 1, 1, 0])
+        np.testing.assert_array_equal(graph.get_neighbors("neck"), [0, 2, 3])
+        np.testing.assert_array_equal(graph.get_neighbors(6), [])
+
+    def test_components(self):
+        graph = self.skeleton.graph
+        self.assertEqual(graph.num_components, 3)
+        np.testing.assert_array_equal(graph.component, [0, 0, 0, 0, 1, 1, 2])
+        np.testing.assert_array_equal(graph.roots, [0, 4, 6])
+
+    def test_traversal_order(self):
+        graph = self.skeleton.graph
+        np.testing.assert_array_equal(graph.traversal_order, [0, 4, 6, 1, 5, 2, 3])
+        np.testing.assert_array_equal(graph.parents, [-1, 0, 1, 1, -1, 4, -1])
+        np.testing.assert_array_equal(graph.depth, [0, 1, 2, 2, 0, 1, 0])
+        position = np.argsort(graph.traversal_order)
+        has_parent = graph.parents >= 0
+        self.assertTrue(np.all(position[graph.parents[has_parent]] < position[has_parent]))
+
+    def test_joints(self):
+        np.testing.assert_array_equal(self.skeleton.graph.joints, [[0, 1, 2], [0, 1, 3], [2, 1, 3]])
+
+    def test_no_edges(self):
+        graph = Skeleton(name="subject1", nodes=["a", "b"]).graph
+        self.assertEqual(graph.joints.shape, (0, 3))
+        self.assertEqual(graph.num_components, 2)
+        np.testing.assert_array_equal(graph.traversal_order, [0, 1])
+        np.testing.assert_array_equal(graph.indptr, [0, 0, 0])
+
+    def test_cached(self):
+        self.assertIs(self.skeleton.graph, self.skeleton.graph)
+
+    def test_reset_graph_after_set(self):
+        skeleton = Skeleton(name="subject1", nodes=["a", "b"])
+        graph = skeleton.graph
+        skeleton.edges = np.array([[0, 1]], dtype=np.uint8)
+        skeleton.reset_graph()
+        self.assertIsNot(skeleton.graph, graph)
+        np.testing.assert_array_equal(skeleton.graph.degree, [1, 1])
+
+    def test_reset_graph(self):
+        graph = self.skeleton.graph
+        self.skeleton.edges[0] = [5, 6]
+        self.assertIs(self.skeleton.graph, graph)  # changes made in place are not detected
+        self.skeleton.reset_graph()
+        self.assertIsNot(self.skeleton.graph, graph)
+        self.assertEqual(self.skeleton.graph.num_components, 2)
+        np.testing.assert_array_equal(self.skeleton.graph.get_neighbors("marker"), [5])
+
 
 class TestPoseEstimationConstructor(TestCase):
     def setUp(self):
@@ -440,6 +660,622 @@ class TestPoseEstimationConstructor(TestCase):
         self.assertIsNone(pe.labeled_video)
 
 
+class TestPoseEstimationStackedView(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        self.data = np.random.rand(3, 20, 2)  # num_nodes x num_frames x (x, y)
+        self.confidence = np.random.rand(3, 20)
+        self.timestamps = np.linspace(0, 1, num=20)
+        # add the series out of skeleton order to check that the view follows the skeleton
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=node,
+                data=self.data[i],
+                confidence=self.confidence[i],
+                timestamps=self.timestamps,
+            )
+            for i, node in reversed(list(enumerate(self.skeleton.nodes)))
+        ]
+        self.pe = mock_PoseEstimation(
+            nwbfile=self.nwbfile, skeleton=self.skeleton, pose_estimation_series=pose_estimation_series
+        )
+
+    def test_shape_and_order(self):
+        view = self.pe.get_stacked_view()
+        self.assertEqual(view.nodes, ["nose", "spine", "tail"])
+        self.assertEqual(view.shape, (20, 3, 2))
+        self.assertEqual(view.confidence.shape, (20, 3))
+        np.testing.assert_array_equal(view.data[:], self.data.transpose(1, 0, 2))
+        np.testing.assert_array_equal(view.confidence[:], self.confidence.T)
+        np.testing.assert_array_equal(view.timestamps, self.timestamps)
+
+    def test_slicing(self):
+        view = self.pe.get_stacked_view()
+        expected = self.data.transpose(1, 0, 2)
+        np.testing.assert_array_equal(view.data[5:10, :, :], expected[5:10, :, :])
+        np.testing.assert_array_equal(view.data[5:10, 1], expected[5:10, 1])
+        np.testing.assert_array_equal(view.data[3, :, 0], expected[3, :, 0])
+        np.testing.assert_array_equal(view.data[::-3, [2, 0]], expected[::-3, [2, 0]])
+        np.testing.assert_array_equal(view.data[[7, 2, 2], ..., 1], expected[[7, 2, 2], ..., 1])
+        np.testing.assert_array_equal(view.confidence[-4:], self.confidence.T[-4:])
+
+    def test_iter_chunks(self):
+        view = self.pe.get_stacked_view()
+        blocks = [block for _, block in view.data.iter_chunks(chunk_size=7)]
+        self.assertEqual([len(block) for block in blocks], [7, 7, 6])
+        np.testing.assert_array_equal(np.concatenate(blocks), self.data.transpose(1, 0, 2))
+
+    def test_masked(self):
+        view = self.pe.get_stacked_view()
+        expected = self.data.transpose(1, 0, 2).copy()
+        expected[self.confidence.T < 0.5] = np.nan
+        masked = view.masked(min_confidence=0.5)
+        np.testing.assert_array_equal(masked[:], expected)
+        np.testing.assert_array_equal(masked[4:9, [2, 1], 0], expected[4:9, [2, 1], 0])
+        np.testing.assert_array_equal(np.concatenate([b for _, b in masked.iter_chunks(chunk_size=6)]), expected)
+
+    def test_node_subset(self):
+        view = self.pe.get_stacked_view(nodes=["tail", "nose"])
+        np.testing.assert_array_equal(view.data[:], self.data[[2, 0]].transpose(1, 0, 2))
+
+    def test_missing_node_raises(self):
+        msg = (
+            "PoseEstimation 'PoseEstimation' has no PoseEstimationSeries for the node(s) ['ear']. Each node must have "
+            "a PoseEstimationSeries with the same name."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            self.pe.get_stacked_view(nodes=["nose", "ear"])
+
+    def test_rate_timestamps(self):
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name=node, rate=10.0, starting_time=2.0) for node in self.skeleton.nodes
+        ]
+        pe = mock_PoseEstimation(
+            nwbfile=self.nwbfile,
+            name="rate_pose",
+            skeleton=self.skeleton,
+            pose_estimation_series=pose_estimation_series,
+            add_to_nwbfile=False,
+        )
+        np.testing.assert_array_almost_equal(pe.get_stacked_view().timestamps, 2.0 + np.arange(10) / 10.0)
+
+    def test_time_slice(self):
+        time_slice = self.pe.get_time_slice(0.25, 0.5)
+        frames = np.flatnonzero((self.timestamps >= 0.25) & (self.timestamps < 0.5))
+        np.testing.assert_array_equal(time_slice.timestamps, self.timestamps[frames])
+        np.testing.assert_array_equal(time_slice.data, self.data[:, frames].transpose(1, 0, 2))
+        np.testing.assert_array_equal(time_slice.confidence, self.confidence[:, frames].T)
+
+
+class TestPoseEstimationToTable(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"])
+        self.data = np.random.rand(3, 20, 2)  # num_nodes x num_frames x (x, y)
+        self.confidence = np.random.rand(3, 20)
+        self.timestamps = np.linspace(0, 1, num=20)
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=node,
+                data=self.data[i],
+                confidence=self.confidence[i],
+                timestamps=self.timestamps,
+            )
+            for i, node in enumerate(self.skeleton.nodes)
+        ]
+        self.pe = mock_PoseEstimation(
+            nwbfile=self.nwbfile, skeleton=self.skeleton, pose_estimation_series=pose_estimation_series
+        )
+
+    def test_to_dataframe(self):
+        df = self.pe.to_dataframe()
+        self.assertEqual(df.shape, (20, 9))
+        self.assertEqual(df.index.name, "timestamps")
+        np.testing.assert_array_equal(df.index, self.timestamps)
+        self.assertEqual(df.columns.names, ["node", "coordinate"])
+        self.assertEqual(list(df.columns[:4]), [("nose", "x"), ("nose", "y"), ("nose", "confidence"), ("spine", "x")])
+        np.testing.assert_array_equal(df["spine"][["x", "y"]], self.data[1])
+        np.testing.assert_array_equal(df[("tail", "confidence")], self.confidence[2])
+
+    def test_to_dataframe_nodes(self):
+        df = self.pe.to_dataframe(nodes=["tail", "nose"])
+        self.assertEqual(list(df.columns.get_level_values("node").unique()), ["tail", "nose"])
+        np.testing.assert_array_equal(df["tail"][["x", "y"]], self.data[2])
+
+    def test_to_dataframe_without_confidence(self):
+        pose_estimation_series = [
+            PoseEstimationSeries(
+                name=node,
+                data=self.data[i].astype(np.float32),
+                reference_frame="(0,0) corresponds to ...",
+                rate=30.0,
+            )
+            for i, node in enumerate(self.skeleton.nodes)
+        ]
+        pe = PoseEstimation(pose_estimation_series=pose_estimation_series, skeleton=self.skeleton)
+        df = pe.to_dataframe()
+        self.assertEqual(list(df.columns.get_level_values("coordinate")), ["x", "y"] * 3)
+        self.assertTrue((df.dtypes == np.float32).all())
+        np.testing.assert_array_almost_equal(df.index, np.arange(20) / 30.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_to_arrow(self):
+        table = self.pe.to_arrow()
+        self.assertEqual(table.num_rows, 20)
+        self.assertEqual(table.column_names[:4], ["timestamps", "nose_x", "nose_y", "nose_confidence"])
+        self.assertEqual(table.schema.field("spine_y").metadata, {b"node": b"spine", b"coordinate": b"y"})
+        np.testing.assert_array_equal(table["timestamps"].to_numpy(), self.timestamps)
+        np.testing.assert_array_equal(table["spine_y"].to_numpy(), self.data[1, :, 1])
+        np.testing.assert_array_equal(table["tail_confidence"].to_numpy(), self.confidence[2])
+
+
+class TestPoseEstimationKinematics(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        # "marker" is not part of any edge, so it has no series and is never read
+        self.skeleton = mock_Skeleton(
+            nodes=["nose", "neck", "tail", "ear", "marker"], edges=np.array([[0, 1], [1, 2], [1, 3]], dtype="uint8")
+        )
+        self.data = np.random.rand(4, 20, 3)  # num_nodes x num_frames x (x, y, z)
+        self.confidence = np.random.rand(4, 20)
+        self.timestamps = np.linspace(0, 1, num=20)
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=node, data=self.data[i], confidence=self.confidence[i], timestamps=self.timestamps
+            )
+            for i, node in enumerate(self.skeleton.nodes[:4])
+        ]
+        self.pe = mock_PoseEstimation(
+            nwbfile=self.nwbfile, skeleton=self.skeleton, pose_estimation_series=pose_estimation_series
+        )
+
+    def _get_angle(self, a, vertex, c):
+        u, v = self.data[a] - self.data[vertex], self.data[c] - self.data[vertex]
+        cos = np.sum(u * v, axis=1) / np.linalg.norm(u, axis=1) / np.linalg.norm(v, axis=1)
+        return np.arccos(np.clip(cos, -1, 1))
+
+    def test_bone_lengths(self):
+        expected = np.stack([np.linalg.norm(self.data[b] - self.data[a], axis=1) for a, b in self.skeleton.edges]).T
+        np.testing.assert_allclose(self.pe.get_bone_lengths(), expected)
+        np.testing.assert_allclose(self.pe.get_bone_lengths(chunk_size=3), expected)
+
+    def test_joint_angles(self):
+        np.testing.assert_array_equal(self.skeleton.graph.joints, [[0, 1, 2], [0, 1, 3], [2, 1, 3]])
+        expected = np.stack([self._get_angle(*joint) for joint in self.skeleton.graph.joints]).T
+        np.testing.assert_allclose(self.pe.get_joint_angles(chunk_size=7), expected)
+
+    def test_2d(self):
+        positions = np.array([[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]], [[0.0, 0.0], [2.0, 0.0], [4.0, 0.0]]])
+        np.testing.assert_allclose(compute_bone_lengths(positions, [[0, 1], [1, 2]]), [[1, 1], [2, 2]])
+        np.testing.assert_allclose(compute_joint_angles(positions, [[0, 1, 2]]), [[np.pi / 2], [np.pi]])
+
+    def test_min_confidence(self):
+        lengths = self.pe.get_bone_lengths(min_confidence=0.5, chunk_size=6)
+        angles = self.pe.get_joint_angles(min_confidence=0.5)
+        low = self.confidence < 0.5
+        np.testing.assert_array_equal(np.isnan(lengths), np.stack([low[a] | low[b] for a, b in self.skeleton.edges]).T)
+        np.testing.assert_array_equal(
+            np.isnan(angles), np.stack([low[a] | low[v] | low[c] for a, v, c in self.skeleton.graph.joints]).T
+        )
+
+    def test_no_skeleton_raises(self):
+        pe = PoseEstimation(name="no_skeleton", pose_estimation_series=[mock_PoseEstimationSeries(name="nose")])
+        msg = (
+            "This PoseEstimation object has no Skeleton, so it has no edges or joints. Provide a 'skeleton' argument "
+            "to compute bone lengths and joint angles."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            pe.get_bone_lengths()
+
+    def test_create_series(self):
+        lengths = self.pe.create_bone_lengths_series()
+        self.assertEqual(lengths.name, "bone_lengths")
+        self.assertEqual(lengths.unit, "pixels")
+        self.assertEqual(lengths.data.shape, (20, 3))
+        self.assertIn("Columns: nose-neck, neck-tail, neck-ear.", lengths.description)
+        self.assertIs(lengths.fields["timestamps"], self.pe.pose_estimation_series["nose"])
+        np.testing.assert_array_equal(lengths.timestamps, self.timestamps)
+
+        angles = self.pe.create_joint_angles_series(min_confidence=0.5)
+        self.assertEqual(angles.unit, "radians")
+        self.assertEqual(angles.data.shape, (20, 3))
+        self.assertIn("Columns: nose-neck-tail, nose-neck-ear, tail-neck-ear.", angles.description)
+
+
+class TestPoseEstimationResample(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        rng = np.random.default_rng(0)
+        # a camera at about 30 Hz with jitter, and positions that move linearly in time
+        self.timestamps = np.arange(100) / 30.0 + rng.uniform(-0.003, 0.003, size=100)
+        self.confidence = rng.uniform(0.5, 1.0, size=100)
+        skeleton = mock_Skeleton(nodes=["nose", "tail"])
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(
+                name=node,
+                data=self._positions(self.timestamps, j),
+                confidence=self.confidence,
+                timestamps=self.timestamps,
+            )
+            for j, node in enumerate(skeleton.nodes)
+        ]
+        self.pose_estimation = mock_PoseEstimation(
+            nwbfile=self.nwbfile, skeleton=skeleton, pose_estimation_series=pose_estimation_series
+        )
+
+    @staticmethod
+    def _positions(timestamps, node):
+        return np.column_stack([10.0 * timestamps + node, -5.0 * timestamps])
+
+    def test_merge_counts(self):
+        rng = np.random.default_rng(1)
+        source = np.sort(rng.integers(0, 50, size=200)).astype(float)
+        target = np.sort(rng.integers(-5, 55, size=300)).astype(float)
+        np.testing.assert_array_equal(merge_counts(source, target), np.searchsorted(source, target, side="right"))
+
+    def test_linear(self):
+        target = np.arange(0.1, 3.2, 1 / 25.0)
+        view = self.pose_estimation.get_resampled_view(target)
+        self.assertEqual(view.shape, (len(target), 2, 2))
+        data = view.data[:]
+        for j in range(2):
+            np.testing.assert_allclose(data[:, j], self._positions(target, j), atol=1e-9)
+        np.testing.assert_allclose(view.confidence[:, 0], np.interp(target, self.timestamps, self.confidence))
+        np.testing.assert_allclose(view.data[[7, 3], 1, 0], data[[7, 3], 1, 0])
+        np.testing.assert_allclose(view.data[5], data[5])
+        blocks = list(view.iter_chunks(chunk_size=7))
+        np.testing.assert_allclose(np.concatenate([block for _, block, _ in blocks]), data)
+        np.testing.assert_allclose(np.concatenate([confidence for _, _, confidence in blocks]), view.confidence[:])
+
+    def test_outside_and_max_gap(self):
+        target = np.array([self.timestamps[0] - 0.01, self.timestamps[10], self.timestamps[-1] + 0.01])
+        data = self.pose_estimation.get_resampled_view(target).data[:]
+        self.assertTrue(np.isnan(data[[0, 2]]).all())
+        np.testing.assert_allclose(data[1, 0], self._positions(self.timestamps[10:11], 0)[0])
+        data = self.pose_estimation.get_resampled_view(target, method="nearest").data[:]
+        np.testing.assert_array_equal(data[:, 1], self._positions(self.timestamps[[0, 10, 99]], 1))
+        data = self.pose_estimation.get_resampled_view(target, method="nearest", max_gap=0.005).data[:]
+        self.assertTrue(np.isnan(data[[0, 2]]).all())
+        data = self.pose_estimation.get_resampled_view(target[1:2] + 0.01, max_gap=0.01).data[:]
+        self.assertTrue(np.isnan(data).all())
+
+    def test_nearest_outside(self):
+        """Test that "nearest" takes the first or last frame for target times outside the recording."""
+        target = np.array([self.timestamps[0] - 1.0, self.timestamps[-1] + 1.0])
+        view = self.pose_estimation.get_resampled_view(target, method="nearest")
+        np.testing.assert_array_equal(view.data[:, 0], self._positions(self.timestamps[[0, -1]], 0))
+        np.testing.assert_array_equal(view.confidence[:, 0], self.confidence[[0, -1]])
+        view = self.pose_estimation.get_resampled_view(target, method="nearest", max_gap=0.5)
+        self.assertTrue(np.isnan(view.data[:]).all())
+        self.assertTrue(np.isnan(view.confidence[:]).all())
+        data = self.pose_estimation.get_resampled_view(target, method="nearest", max_gap=1.5).data[:]
+        np.testing.assert_array_equal(data[:, 0], self._positions(self.timestamps[[0, -1]], 0))
+
+    def test_confidence_weighted(self):
+        series = self.pose_estimation.pose_estimation_series["nose"]
+        series.data[20] = np.nan
+        target = np.array([0.3 * self.timestamps[20] + 0.7 * self.timestamps[21]])
+        linear = self.pose_estimation.get_resampled_view(target, nodes=["nose"])
+        self.assertTrue(np.isnan(linear.data[0]).all())
+        weighted = self.pose_estimation.get_resampled_view(target, nodes=["nose"], method="confidence")
+        np.testing.assert_array_equal(weighted.data[0, 0], series.data[21])
+        self.assertAlmostEqual(weighted.confidence[0, 0], 0.7 * self.confidence[21])
+
+    def test_create_resampled_pose_estimation(self):
+        target = np.arange(0.1, 3.2, 1 / 25.0)
+        resampled = self.pose_estimation.create_resampled_pose_estimation("resampled", target, chunk_size=16)
+        nose, tail = resampled.pose_estimation_series["nose"], resampled.pose_estimation_series["tail"]
+        np.testing.assert_array_equal(nose.timestamps, target)
+        self.assertIs(tail.timestamps, nose.timestamps)
+        self.assertIs(resampled.skeleton, self.pose_estimation.skeleton)
+        self.assertIn("Resampled onto new timestamps with linear interpolation.", nose.description)
+        np.testing.assert_allclose(nose.data._get_data((slice(0, 10), slice(None))), self._positions(target[:10], 0))
+
+    def test_invalid_method(self):
+        msg = "'method' must be one of ['nearest', 'linear', 'confidence'], got 'cubic'."
+        with self.assertRaisesWith(ValueError, msg):
+            self.pose_estimation.get_resampled_view(np.arange(3.0), method="cubic")
+        msg = "The target timestamps must be a 1D array in increasing order."
+        with self.assertRaisesWith(ValueError, msg):
+            self.pose_estimation.get_resampled_view(np.array([1.0, 0.5]))
+
+
+class TestPoseEstimationVideoFrameIndex(TestCase):
+    def setUp(self):
+        # a 30 Hz video of 100 frames split across two files, and pose estimates 1 ms after each video frame
+        self.source_video = ImageSeries(
+            name="source_video",
+            description="Video split across two files.",
+            unit="NA",
+            format="external",
+            external_file=["path/to/part1.mp4", "path/to/part2.mp4"],
+            starting_frame=[0, 50],
+            rate=30.0,
+            num_samples=100,
+        )
+        self.timestamps = np.arange(-2, 103) / 30.0 + 0.001
+        self.pose_estimation = self._create_pose_estimation(self.source_video)
+
+    def _create_pose_estimation(self, source_video):
+        pose_estimation_series = mock_PoseEstimationSeries(
+            name="nose", data=np.zeros((105, 2)), confidence=np.ones(105), timestamps=self.timestamps
+        )
+        return PoseEstimation(
+            name="PoseEstimation",
+            pose_estimation_series=[pose_estimation_series],
+            skeleton=mock_Skeleton(nodes=["nose"]),
+            source_video=source_video,
+        )
+
+    def test_rate(self):
+        index = self.pose_estimation.get_video_frame_index()
+        self.assertIs(self.pose_estimation.get_video_frame_index(), index)
+        self.assertEqual(len(index), 105)
+        expected = np.arange(-2, 103)
+        expected[(expected < 0) | (expected >= 100)] = -1
+        np.testing.assert_array_equal(index.get_video_frames(slice(None)), expected)
+        file_indices, frames = index.get_file_frames([2, 51, 52, 101, 0])
+        np.testing.assert_array_equal(file_indices, [0, 0, 1, 1, -1])
+        np.testing.assert_array_equal(frames, [0, 49, 0, 49, -1])
+        np.testing.assert_array_equal(
+            index.get_file_names(file_indices), ["path/to/part1.mp4"] * 2 + ["path/to/part2.mp4"] * 2 + [None]
+        )
+        np.testing.assert_array_equal(index.get_rows([0, 0, 1, 1, 1], [0, 49, 0, 49, 50]), [2, 51, 52, 101, -1])
+        np.testing.assert_array_equal(index.get_rows(0, [-1, 50]), [-1, -1])
+        np.testing.assert_array_equal(index.get_rows_from_video_frames([99, 100]), [101, -1])
+
+    def test_tolerance(self):
+        index = self.pose_estimation.get_video_frame_index(tolerance=0.0005)
+        self.assertIsNot(self.pose_estimation.get_video_frame_index(), index)
+        np.testing.assert_array_equal(index.get_video_frames(slice(None)), -1)
+        np.testing.assert_array_equal(index.get_rows_from_video_frames([0, 1]), [-1, -1])
+
+    def test_video_timestamps(self):
+        rng = np.random.default_rng(0)
+        video_timestamps = np.arange(100) / 30.0 + rng.uniform(-0.005, 0.005, size=100)
+        video_timestamps[60] += 0.02  # a late frame, so that no pose estimate is within half a frame period
+        source_video = ImageSeries(
+            name="jittered_video",
+            description="Video with timestamps.",
+            unit="NA",
+            format="external",
+            external_file=["path/to/part1.mp4", "path/to/part2.mp4"],
+            starting_frame=[0, 50],
+            timestamps=video_timestamps,
+        )
+        index = self._create_pose_estimation(source_video).get_video_frame_index()
+        expected = np.arange(100)
+        expected[60] = -1
+        np.testing.assert_array_equal(index.get_video_frames(np.arange(2, 102)), expected)
+        np.testing.assert_array_equal(index.get_rows([1, 1], [9, 10]), [61, -1])
+
+    def test_no_source_video(self):
+        msg = "PoseEstimation 'PoseEstimation' has no source video, so its rows cannot be mapped to video frames."
+        with self.assertRaisesWith(ValueError, msg):
+            self._create_pose_estimation(None).get_video_frame_index()
+
+
+class TestPoseEstimationShareTimestamps(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+
+    def test_share_timestamps(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        first, second, third = pe.pose_estimation_series.values()
+        pe.share_timestamps()
+        self.assertEqual(list(pe.pose_estimation_series), ["node1", "node2", "node3"])
+        self.assertIs(pe.pose_estimation_series["node1"], first)
+        new_second, new_third = pe.pose_estimation_series["node2"], pe.pose_estimation_series["node3"]
+        self.assertEqual(first.timestamp_link, {new_second, new_third})
+        self.assertIs(new_third.timestamps, first.timestamps)
+        self.assertIs(new_third.parent, pe)
+        self.assertIsNone(third.parent)
+        self.assertIs(new_third.data, third.data)
+        self.assertIs(new_third.confidence, third.confidence)
+        for attr in ("reference_frame", "unit", "description", "confidence_definition", "conversion", "offset"):
+            self.assertEqual(getattr(new_third, attr), getattr(third, attr))
+        np.testing.assert_array_equal(new_third.timestamps, np.linspace(0, 10, num=10))
+
+        pe.share_timestamps()  # the series already link to the first series, so they are kept
+        self.assertIs(pe.pose_estimation_series["node3"], new_third)
+
+    def test_share_timestamps_relinks(self):
+        """Test that a series that links to the timestamps of another series is relinked to the first series."""
+        first = mock_PoseEstimationSeries(name="node1")
+        second = mock_PoseEstimationSeries(name="node2", timestamps=first)
+        third = mock_PoseEstimationSeries(name="node3", timestamps=second)
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile, pose_estimation_series=[first, second, third])
+        pe.share_timestamps()
+        self.assertIs(pe.pose_estimation_series["node2"], second)
+        new_third = pe.pose_estimation_series["node3"]
+        self.assertIsNot(new_third, third)
+        self.assertEqual(first.timestamp_link, {second, new_third})
+
+    def test_share_timestamps_external_link_raises(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        mock_PoseEstimationSeries(name="other", timestamps=pe.pose_estimation_series["node2"])
+        msg = (
+            "Cannot share timestamps in PoseEstimation 'PoseEstimation': PoseEstimationSeries 'node2' would be "
+            "replaced, but other TimeSeries link to its timestamps or data."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            pe.share_timestamps()
+
+    def test_share_different_timestamps_raises(self):
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name="node1"),
+            mock_PoseEstimationSeries(name="node2"),
+            mock_PoseEstimationSeries(name="node3", timestamps=np.linspace(1, 11, num=10)),
+        ]
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile, pose_estimation_series=pose_estimation_series)
+        msg = (
+            "Cannot share timestamps in PoseEstimation 'PoseEstimation': the timestamps of PoseEstimationSeries "
+            "'node3' differ from those of PoseEstimationSeries 'node1'."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            pe.share_timestamps()
+
+    def test_get_timestamps_cached(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        timestamps = pe.get_timestamps()
+        np.testing.assert_array_equal(timestamps, np.linspace(0, 10, num=10))
+        self.assertIs(pe.get_timestamps(), timestamps)
+
+
+class TestPoseEstimationDatasetIOPreset(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+
+    def test_set_preset(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        pe.set_dataset_io_preset("random-window")
+        for series in pe.pose_estimation_series.values():
+            self.assertIsInstance(series.data, H5DataIO)
+            self.assertEqual(series.data.io_settings["chunks"], (10, 3))
+            self.assertEqual(series.data.io_settings["compression_opts"], 1)
+            self.assertTrue(series.data.io_settings["shuffle"])
+            self.assertEqual(series.confidence.io_settings["chunks"], (10,))
+            self.assertEqual(series.timestamps.io_settings["chunks"], (10,))
+            np.testing.assert_array_equal(series.timestamps.data, np.linspace(0, 10, num=10))
+
+    def test_set_preset_keeps_timestamp_links(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        pe.share_timestamps()
+        first, second, _ = pe.pose_estimation_series.values()
+        pe.set_dataset_io_preset("archive")
+        self.assertIn(second, first.timestamp_link)
+        self.assertIs(second.timestamps, first.timestamps)
+        self.assertEqual(first.timestamps.io_settings["compression_opts"], 9)
+
+    def test_set_preset_merges_io_settings(self):
+        series = mock_PoseEstimationSeries(data=H5DataIO(np.ones((10, 3)), maxshape=(None, 3)))
+        series.set_dataset_io_preset("sequential-scan")
+        self.assertEqual(series.data.io_settings["maxshape"], (None, 3))
+        self.assertEqual(series.data.io_settings["chunks"], (32768, 3))
+        self.assertEqual(series.data.io_settings["compression"], "gzip")
+
+    def test_unknown_preset_raises(self):
+        series = mock_PoseEstimationSeries()
+        msg = "Unknown dataset I/O preset 'fast'. Available presets: ['sequential-scan', 'random-window', 'archive']."
+        with self.assertRaisesWith(ValueError, msg):
+            series.set_dataset_io_preset("fast")
+
+
+class TestPoseEstimationStoragePrecision(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+
+    def test_float32(self):
+        pe = mock_PoseEstimation(nwbfile=self.nwbfile)
+        pe.set_storage_precision()
+        for series in pe.pose_estimation_series.values():
+            self.assertEqual(series.data.data.dtype, np.float32)
+            self.assertEqual(series.confidence.data.dtype, np.float32)
+            self.assertNotIn("scaleoffset", series.data.io_settings)
+            self.assertEqual(series.timestamps.dtype, np.float64)
+
+    def test_quantized(self):
+        series = mock_PoseEstimationSeries()
+        confidence = np.asarray(series.confidence)
+        series.set_storage_precision(data_decimals=2, confidence_dtype="uint8")
+        self.assertIsInstance(series.data, DecodedArray)
+        self.assertEqual(series.data.dataset.io_settings["scaleoffset"], 2)
+        self.assertEqual(series.data.dataset.io_settings["fillvalue"], MISSING_POSITION)
+        self.assertEqual(series.confidence.dataset.data.dtype, np.uint8)
+        self.assertEqual(series.confidence_scale, 1 / 254)
+        self.assertEqual(series.confidence.dtype, np.float32)
+        np.testing.assert_allclose(series.confidence[:], confidence, rtol=0, atol=1 / 508)
+
+    def test_missing_values(self):
+        data = np.arange(20.0).reshape((10, 2))
+        data[3] = np.nan
+        confidence = np.linspace(0, 1, 10)
+        confidence[[0, 5]] = np.nan
+        series = mock_PoseEstimationSeries(data=data, confidence=confidence)
+        series.set_storage_precision(data_decimals=2, confidence_dtype="uint16")
+        self.assertEqual(series.data.dataset.data[3].tolist(), [MISSING_POSITION] * 2)
+        np.testing.assert_array_equal(series.data[:], data)
+        self.assertEqual(series.confidence.dataset.data[[0, 5]].tolist(), [65535, 65535])
+        np.testing.assert_allclose(series.confidence[:], confidence, rtol=0, atol=1e-5)
+
+    def test_combine_with_preset(self):
+        series = mock_PoseEstimationSeries()
+        series.set_storage_precision(data_decimals=2)
+        series.set_dataset_io_preset("archive")
+        self.assertEqual(series.data.dataset.io_settings["scaleoffset"], 2)
+        self.assertEqual(series.data.dataset.io_settings["fillvalue"], MISSING_POSITION)
+        self.assertEqual(series.data.dataset.io_settings["compression_opts"], 9)
+        self.assertEqual(series.data.dataset.data.dtype, np.float32)
+
+    def test_set_twice(self):
+        series = mock_PoseEstimationSeries()
+        data = np.asarray(series.data)
+        series.set_storage_precision(data_decimals=2, confidence_dtype="uint8")
+        series.set_storage_precision(dtype="float64")
+        self.assertNotIn("scaleoffset", series.data.io_settings)
+        self.assertNotIn("fillvalue", series.data.io_settings)
+        self.assertEqual(series.data.data.dtype, np.float64)
+        np.testing.assert_allclose(series.data.data, data, rtol=0, atol=0.005)
+        self.assertIsNone(series.confidence_scale)
+
+    def test_empty_dataset(self):
+        series = mock_PoseEstimationSeries(
+            name="nose", data=H5DataIO(shape=(0, 2), dtype=np.dtype("float64"), maxshape=(None, 2))
+        )
+        series.set_storage_precision()
+        self.assertEqual(series.data.io_settings["dtype"], np.float32)
+        self.assertEqual(series.data.io_settings["maxshape"], (None, 2))
+        msg = (
+            "Cannot encode the 'data' of PoseEstimationSeries 'nose' with reduced precision because it is an empty "
+            "dataset to be appended to after writing."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            series.set_storage_precision(data_decimals=1)
+
+    def test_bad_arguments_raise(self):
+        series = mock_PoseEstimationSeries()
+        with self.assertRaisesWith(ValueError, "'dtype' must be 'float32' or 'float64', got 'float16'."):
+            series.set_storage_precision(dtype="float16")
+        with self.assertRaisesWith(ValueError, "'data_decimals' must be a non-negative integer, got -1."):
+            series.set_storage_precision(data_decimals=-1)
+        with self.assertRaisesWith(ValueError, "'confidence_dtype' must be 'uint8' or 'uint16', got 'int8'."):
+            series.set_storage_precision(confidence_dtype="int8")
+
+    def test_confidence_out_of_range_raises(self):
+        series = mock_PoseEstimationSeries(confidence=np.array([0.5, 1.5] + [1.0] * 8))
+        with self.assertRaisesWith(ValueError, "Confidence values must be between 0 and 1 to be stored as uint8."):
+            series.set_storage_precision(confidence_dtype="uint8")
+
+
 class TestSkeletonInstance(TestCase):
     def test_constructor(self):
         skeleton = mock_Skeleton(
@@ -589,6 +1425,258 @@ class TestPoseTrainingImages(TestCase):
         self.assertIsNone(pose_training.source_videos)
 
 
+class TestTrainingFramesTable(TestCase):
+    def setUp(self):
+        self.skeleton = mock_Skeleton(name="subject1")
+        self.source_video = mock_source_video(name="source_video")
+        self.training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i,
+                skeleton_instances=mock_SkeletonInstances(
+                    skeleton_instances=[
+                        mock_SkeletonInstance(
+                            id=np.uint(j),
+                            node_locations=np.full((3, 2), 10.0 * i + j),
+                            node_visibility=[True, j == 0, False],
+                            skeleton=self.skeleton,
+                        )
+                        for j in range(i)
+                    ]
+                ),
+                source_video=self.source_video,
+                source_video_frame_index=np.uint(100 * i),
+            )
+            for i in range(4)
+        ]
+
+    def assertTrainingFramesEqual(self, training_frames, expected_training_frames):
+        self.assertEqual(len(training_frames), len(expected_training_frames))
+        for frame, expected in zip(training_frames, expected_training_frames):
+            self.assertEqual(frame.name, expected.name)
+            self.assertEqual(frame.annotator, expected.annotator)
+            self.assertIs(frame.source_video, expected.source_video)
+            self.assertEqual(frame.source_video_frame_index, expected.source_video_frame_index)
+            instances = frame.skeleton_instances.skeleton_instances
+            expected_instances = expected.skeleton_instances.skeleton_instances
+            self.assertEqual(list(instances.keys()), list(expected_instances.keys()))
+            for instance, expected_instance in zip(instances.values(), expected_instances.values()):
+                self.assertEqual(instance.id, expected_instance.id)
+                self.assertIs(instance.skeleton, expected_instance.skeleton)
+                np.testing.assert_array_equal(instance.node_locations, expected_instance.node_locations)
+                np.testing.assert_array_equal(instance.node_visibility, expected_instance.node_visibility)
+
+    def test_from_training_frames(self):
+        table = TrainingFramesTable.from_training_frames(TrainingFrames(training_frames=self.training_frames))
+        self.assertEqual(table.name, "training_frames_table")
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.frame_name.data, ["frame0", "frame1", "frame2", "frame3"])
+        np.testing.assert_array_equal(table.skeleton_instances_index.data, [0, 1, 3, 6])
+        self.assertEqual(table.source_video.data, [self.source_video] * 4)
+        np.testing.assert_array_equal(table.source_video_frame_index.data, [0, 100, 200, 300])
+        self.assertIsNone(table.source_frame)
+
+        instances_table = table.skeleton_instances_table
+        self.assertIs(table.skeleton_instances.table, instances_table)
+        self.assertEqual(len(instances_table), 6)
+        self.assertEqual(instances_table.node_locations.data.shape, (18, 2))
+        np.testing.assert_array_equal(instances_table.node_locations_index.data, np.arange(3, 19, 3))
+        np.testing.assert_array_equal(instances_table.instance_id.data, [0, 0, 1, 0, 1, 2])
+        self.assertEqual(instances_table.skeleton.data, [self.skeleton] * 6)
+
+    def test_to_training_frames(self):
+        table = TrainingFramesTable.from_training_frames(self.training_frames)
+        training_frames = table.to_training_frames()
+        self.assertEqual(training_frames.name, "training_frames")
+        self.assertTrainingFramesEqual(list(training_frames.training_frames.values()), self.training_frames)
+
+    def test_get_training_frames(self):
+        table = TrainingFramesTable.from_training_frames(self.training_frames)
+        training_frames = table.get_training_frames([3, 1])
+        self.assertTrainingFramesEqual(training_frames, [self.training_frames[3], self.training_frames[1]])
+        self.assertTrainingFramesEqual([table.get_training_frame(2)], [self.training_frames[2]])
+
+    def test_get_skeleton_instances_scattered_rows(self):
+        """Test reading rows that are far apart, which are read in separate blocks, in any order and repeated."""
+        instances = [
+            mock_SkeletonInstance(
+                name="instance%d" % i,
+                id=np.uint(i % 256),
+                node_locations=np.full((3, 2), float(i)),
+                skeleton=self.skeleton,
+            )
+            for i in range(1000)
+        ]
+        table = SkeletonInstancesTable.from_skeleton_instances(instances)
+        rows = [999, 0, 500, 0, 1, 998]
+        read_instances = table.get_skeleton_instances(rows)
+        self.assertEqual([instance.name for instance in read_instances], ["instance%d" % row for row in rows])
+        self.assertIsNot(read_instances[1], read_instances[3])
+        for row, instance in zip(rows, read_instances):
+            self.assertEqual(instance.id, row % 256)
+            self.assertIs(instance.skeleton, self.skeleton)
+            np.testing.assert_array_equal(instance.node_locations, np.full((3, 2), float(row)))
+
+    def test_some_optional_values_raises(self):
+        self.training_frames[1].fields.pop("annotator")
+        msg = (
+            "Cannot store 'annotator' in a TrainingFramesTable because 1 of 4 TrainingFrame objects have no "
+            "'annotator'. Either all or none of them must have a value for it."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            TrainingFramesTable.from_training_frames(self.training_frames)
+
+    def test_2d_and_3d_raises(self):
+        self.training_frames.append(
+            mock_TrainingFrame(
+                skeleton_instances=mock_SkeletonInstances(
+                    mock_SkeletonInstance(node_locations=np.zeros((3, 3)), skeleton=self.skeleton)
+                )
+            )
+        )
+        msg = "Cannot store SkeletonInstance objects with both 2D and 3D node locations in one SkeletonInstancesTable."
+        with self.assertRaisesWith(ValueError, msg):
+            TrainingFramesTable.from_training_frames(self.training_frames)
+
+    def test_pose_training(self):
+        table = mock_TrainingFramesTable()
+        pose_training = PoseTraining(training_frames_table=table)
+        self.assertIs(pose_training.training_frames_table, table)
+        self.assertIsNone(pose_training.training_frames)
+
+
+def fill_from_chunks(frames):
+    """Fill an array with the DataChunk objects of a FrameDataChunkIterator."""
+    array = np.zeros(frames.maxshape, dtype=frames.dtype)
+    for chunk in frames:
+        array[chunk.selection] = chunk.data
+    return array
+
+
+class TestTrainingFrameExtraction(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.video_data = rng.integers(0, 256, size=(2, 10, 4, 5, 3), dtype=np.uint8)
+        self.source_videos = [
+            ImageSeries(name="video%d" % i, description="Stored video.", unit="NA", data=data, rate=30.0)
+            for i, data in enumerate(self.video_data)
+        ]
+        # frames requested out of order and more than once, from two videos
+        self.requests = [(0, 7), (1, 2), (0, 2), (0, 7), (1, 9)]
+        self.training_frames = [
+            mock_TrainingFrame(
+                name="frame%d" % i, source_video=self.source_videos[video], source_video_frame_index=np.uint(frame)
+            )
+            for i, (video, frame) in enumerate(self.requests)
+        ]
+        self.expected = np.stack([self.video_data[video, frame] for video, frame in self.requests])
+
+    def test_images(self):
+        images = extract_training_frames(self.training_frames, name="images")
+        self.assertEqual(images.name, "images")
+        names = ["frame%d" % i for i in range(len(self.requests))]
+        self.assertEqual([image.name for image in images.order_of_images.data], names)
+        for image, expected in zip(images.order_of_images.data, self.expected):
+            self.assertEqual(image.neurodata_type, "RGBImage")
+            np.testing.assert_array_equal(image.data, expected)
+
+    def test_stacked(self):
+        frames = extract_training_frames(self.training_frames, stacked=True, batch_frames=1)
+        self.assertIsInstance(frames, FrameDataChunkIterator)
+        self.assertEqual(frames.maxshape, self.expected.shape)
+        self.assertEqual(frames.dtype, np.uint8)
+        self.assertEqual(frames.recommended_chunk_shape(), (1, 4, 5, 3))
+        np.testing.assert_array_equal(fill_from_chunks(frames), self.expected)
+        table = TrainingFramesTable.from_training_frames(self.training_frames)
+        np.testing.assert_array_equal(fill_from_chunks(table.extract_source_frames(stacked=True)), self.expected)
+
+    def test_no_source_video(self):
+        training_frame = mock_TrainingFrame(
+            name="frame", source_frame=mock_source_frame(), source_video_frame_index=None
+        )
+        msg = "TrainingFrame 'frame' must have a 'source_video' and a 'source_video_frame_index' to extract its frame."
+        with self.assertRaisesWith(ValueError, msg):
+            extract_training_frames([training_frame])
+
+    def test_get_seeks(self):
+        np.testing.assert_array_equal(get_seeks([0, 1, 5, 70, 71, 200, 210], max_skip=64), [0, 0, 0, 0, 0, 1, 0])
+        np.testing.assert_array_equal(get_seeks([65, 66], max_skip=64), [1, 0])
+        # the first frame is sought if it is before the position, or more than max_skip frames after it
+        np.testing.assert_array_equal(get_seeks([10, 11], max_skip=64, position=20), [1, 0])
+        np.testing.assert_array_equal(get_seeks([84, 200], max_skip=64, position=20), [0, 1])
+
+    def test_assign_frame_ranges(self):
+        tasks = [("a", np.arange(5)), ("b", np.arange(2)), ("c", np.arange(3))]
+        # whole files, the longest first to the worker with the fewest frames
+        self.assertEqual(
+            [[(path, frames.tolist()) for path, frames in ranges] for ranges in assign_frame_ranges(tasks, 2)],
+            [[("a", [0, 1, 2, 3, 4])], [("b", [0, 1]), ("c", [0, 1, 2])]],
+        )
+        # a file with more than an even share of the frames is split into contiguous ranges
+        ranges = assign_frame_ranges([("a", np.arange(0, 20, 2))], 3)
+        self.assertEqual(
+            [[frames.tolist() for _, frames in worker] for worker in ranges],
+            [[[0, 2, 4, 6]], [[8, 10, 12, 14]], [[16, 18]]],
+        )
+        self.assertEqual(len(assign_frame_ranges([("a", np.arange(2))], 4)), 2)
+        self.assertEqual(assign_frame_ranges([], 4), [])
+
+    @unittest.skipUnless(importlib.util.find_spec("cv2"), "OpenCV is not installed")
+    def test_video_files(self):
+        import cv2
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # two video files of 60 frames of one gray level each, for frames 0 to 59 and 60 to 119 of the ImageSeries
+            levels = np.arange(120) * 2
+            files = [os.path.join(tmpdir, "part%d.avi" % i) for i in range(2)]
+            for i, file in enumerate(files):
+                writer = cv2.VideoWriter(file, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (32, 24))
+                for level in levels[60 * i : 60 * (i + 1)]:
+                    writer.write(np.full((24, 32, 3), level, dtype=np.uint8))
+                writer.release()
+            source_video = ImageSeries(
+                name="source_video",
+                description="Video split across two files.",
+                unit="NA",
+                format="external",
+                external_file=files,
+                starting_frame=[0, 60],
+                rate=30.0,
+                num_samples=120,
+            )
+            frame_indices = [100, 3, 59, 60, 3, 119, 40]
+            training_frames = [
+                mock_TrainingFrame(
+                    name="frame%d" % i, source_video=source_video, source_video_frame_index=np.uint(frame)
+                )
+                for i, frame in enumerate(frame_indices)
+            ]
+            self.assertEqual(get_keyframe_interval(files[0]), 1)  # every frame of a Motion JPEG video is a keyframe
+            for num_workers, max_skip, batch_frames in ((1, 64, 256), (1, None, 256), (2, 0, 256), (3, None, 2)):
+                frames = extract_training_frames(
+                    training_frames,
+                    stacked=True,
+                    num_workers=num_workers,
+                    max_skip=max_skip,
+                    batch_frames=batch_frames,
+                )
+                self.assertEqual(frames.maxshape, (7, 24, 32, 3))
+                frames = fill_from_chunks(frames)
+                np.testing.assert_allclose(frames.mean(axis=(1, 2, 3)), levels[frame_indices], atol=3)
+
+            # the reader of a worker continues from the end of the previous batch of the same file
+            np.testing.assert_allclose(
+                video._read_video_batch(files[0], [3, 10], None).mean(axis=(1, 2, 3)), [6, 20], atol=3
+            )
+            reader = video._worker_reader
+            self.assertEqual(reader.max_skip, 1)
+            np.testing.assert_allclose(video._read_video_batch(files[0], [40], None).mean(axis=(1, 2, 3)), [80], atol=3)
+            self.assertIs(video._worker_reader, reader)
+            video._read_video_batch(files[1], [0], None)
+            self.assertIsNot(video._worker_reader, reader)
+            video._worker_reader.close()
+            video._worker_reader = None
+
+
 class TestCalibratedCameraConstructor(TestCase):
     def test_constructor_full(self):
         K = np.eye(3, dtype="float32")
@@ -636,6 +1724,48 @@ class TestCalibratedCameraConstructor(TestCase):
         self.assertIs(nwbfile.devices["camera1"], camera)
 
 
+class TestCalibratedCameraGeometry(TestCase):
+    def setUp(self):
+        self.camera = CalibratedCamera(
+            name="camera1",
+            intrinsic_matrix=np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]], dtype="float32"),
+            rotation_matrix=np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]),
+            translation_vector=np.array([10.0, 20.0, 1000.0]),
+            distortion_coefficients=np.zeros(5),
+        )
+
+    def test_geometry(self):
+        geometry = self.camera.geometry
+        self.assertEqual(geometry.intrinsic_matrix.dtype, np.float64)
+        self.assertIsNone(geometry.distortion_coefficients)
+        np.testing.assert_array_equal(geometry.extrinsic_matrix[:, 3], [10.0, 20.0, 1000.0])
+        np.testing.assert_allclose(geometry.projection_matrix, self.camera.intrinsic_matrix @ geometry.extrinsic_matrix)
+        # the camera center projects to nothing, and the pseudo-inverse maps pixels back onto their rays
+        np.testing.assert_allclose(geometry.projection_matrix @ np.append(geometry.center, 1.0), 0.0, atol=1e-9)
+        np.testing.assert_allclose(geometry.projection_matrix @ geometry.projection_matrix_pinv, np.eye(3), atol=1e-9)
+        with self.assertRaises(ValueError):
+            geometry.intrinsic_matrix[0, 0] = 1.0
+
+    def test_intrinsics_only(self):
+        geometry = CalibratedCamera(name="camera1", intrinsic_matrix=np.eye(3)).geometry
+        self.assertFalse(geometry.is_posed)
+        self.assertIsNone(geometry.projection_matrix)
+        self.assertIsNone(geometry.center)
+
+    def test_cached(self):
+        self.assertIs(self.camera.geometry, self.camera.geometry)
+
+    def test_invalidated_on_change(self):
+        geometry = self.camera.geometry
+        self.camera.translation_vector[2] = 500.0
+        self.assertIsNot(self.camera.geometry, geometry)
+        np.testing.assert_array_equal(self.camera.geometry.center, [-20.0, 10.0, -500.0])
+        geometry = self.camera.geometry
+        self.camera.distortion_coefficients[0] = -0.1
+        self.assertIsNot(self.camera.geometry, geometry)
+        np.testing.assert_array_equal(self.camera.geometry.distortion_coefficients, [-0.1, 0, 0, 0, 0])
+
+
 class TestMultiCameraPoseEstimationConstructor(TestCase):
     def setUp(self):
         self.nwbfile = NWBFile(
@@ -707,3 +1837,292 @@ class TestMultiCameraPoseEstimationConstructor(TestCase):
         for pe in mcpe.pose_estimations.values():
             self.assertIsNotNone(pe.device)
             self.assertIsInstance(pe.device, CalibratedCamera)
+
+
+class TestMultiCameraPoseEstimationTriangulate(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"], edges=np.array([[0, 1], [1, 2]], dtype="uint8"))
+        self.points = np.random.default_rng(0).normal(scale=50.0, size=(40, 3, 3))
+        self.pose_estimations = mock_projected_PoseEstimations(
+            nwbfile=self.nwbfile, skeleton=self.skeleton, points=self.points
+        )
+        self.mcpe = MultiCameraPoseEstimation(pose_estimations=self.pose_estimations, skeleton=self.skeleton)
+
+    def _set_view(self, camera, node, frames, data=None, confidence=None):
+        series = self.pose_estimations[camera].pose_estimation_series[node]
+        if data is not None:
+            series.data[frames] = data
+        if confidence is not None:
+            series.confidence[frames] = confidence
+
+    def test_triangulate(self):
+        result = self.mcpe.triangulate(chunk_size=16)
+        np.testing.assert_allclose(result.data, self.points, atol=1e-6)
+        np.testing.assert_array_less(result.reprojection_error, 1e-6)
+        np.testing.assert_allclose(result.confidence, 1.0)
+        np.testing.assert_array_equal(result.num_views, 3)
+
+    def test_missing_views(self):
+        self._set_view(0, "nose", slice(0, 10), data=np.nan)
+        self._set_view(1, "tail", slice(5, 10), data=np.nan)
+        self._set_view(2, "tail", slice(5, 10), data=np.nan)
+        result = self.mcpe.triangulate(chunk_size=7)
+        np.testing.assert_array_equal(result.num_views[:10, 0], 2)
+        np.testing.assert_allclose(result.data[:10, 0], self.points[:10, 0], atol=1e-6)
+        np.testing.assert_array_equal(result.num_views[5:10, 2], 1)
+        self.assertTrue(np.isnan(result.data[5:10, 2]).all())
+        self.assertTrue(np.isnan(result.confidence[5:10, 2]).all())
+        np.testing.assert_allclose(result.data[10:], self.points[10:], atol=1e-6)
+
+    def test_confidence_weighting(self):
+        offset = np.array([15.0, -10.0])
+        spine = self.pose_estimations[2].pose_estimation_series["spine"]
+        self._set_view(2, "spine", slice(None), data=spine.data + offset)
+        unweighted_error = np.linalg.norm(self.mcpe.triangulate().data[:, 1] - self.points[:, 1], axis=1)
+
+        self._set_view(2, "spine", slice(None), confidence=0.01)
+        result = self.mcpe.triangulate()
+        weighted_error = np.linalg.norm(result.data[:, 1] - self.points[:, 1], axis=1)
+        np.testing.assert_array_less(weighted_error, unweighted_error / 10)
+        np.testing.assert_array_less(result.confidence[:, 1], 1.0)
+
+        result = self.mcpe.triangulate(min_confidence=0.5)
+        np.testing.assert_array_equal(result.num_views[:, 1], 2)
+        np.testing.assert_allclose(result.data[:, 1], self.points[:, 1], atol=1e-6)
+
+    def test_singular_normal_matrix(self):
+        # the squares of tiny weights underflow to 0, so the normal matrices of these positions are 0
+        for camera in range(3):
+            self._set_view(camera, "nose", slice(0, 5), confidence=1e-200)
+        result = self.mcpe.triangulate(chunk_size=16)
+        np.testing.assert_array_equal(result.num_views[:5, 0], 3)
+        self.assertTrue(np.isnan(result.data[:5, 0]).all())
+        self.assertTrue(np.isnan(result.confidence[:5, 0]).all())
+        np.testing.assert_allclose(result.data[5:, 0], self.points[5:, 0], atol=1e-6)
+        np.testing.assert_allclose(result.data[:, 1:], self.points[:, 1:], atol=1e-6)
+
+        # two camera views from the same pose see a point along the same ray, which does not determine its depth
+        extrinsic_matrix = np.column_stack([np.eye(3), [0.0, 0.0, 100.0]])
+        points = np.array([[[0.1, -0.2]], [[0.1, -0.2]]])
+        triangulated, num_views = triangulate_points(points, [extrinsic_matrix, extrinsic_matrix], np.ones((2, 1)))
+        np.testing.assert_array_equal(num_views, [2])
+        self.assertTrue(np.isnan(triangulated).all())
+
+    def test_add_triangulated_series(self):
+        result = self.mcpe.add_triangulated_series(unit="millimeters", reference_frame="Origin of the calibration.")
+        self.assertEqual(list(self.mcpe.pose_estimation_series), ["nose", "spine", "tail"])
+        series = self.mcpe.pose_estimation_series["spine"]
+        np.testing.assert_array_equal(series.data, result.data[:, 1])
+        np.testing.assert_array_equal(series.confidence, result.confidence[:, 1])
+        self.assertEqual(series.unit, "millimeters")
+        self.assertIs(series.fields["timestamps"], self.pose_estimations[0].pose_estimation_series["nose"])
+
+    def test_uncalibrated_camera_raises(self):
+        pose_estimation = mock_PoseEstimation(nwbfile=self.nwbfile, skeleton=self.skeleton, add_to_nwbfile=False)
+        mcpe = MultiCameraPoseEstimation(
+            pose_estimations=[self.pose_estimations[0], pose_estimation], skeleton=self.skeleton
+        )
+        msg = "PoseEstimation 'PoseEstimation' must link to a CalibratedCamera to triangulate 3D positions."
+        with self.assertRaisesWith(ValueError, msg):
+            mcpe.triangulate()
+
+    def test_camera_rig(self):
+        rig = self.mcpe.camera_rig
+        self.assertIs(self.mcpe.camera_rig, rig)
+        self.assertEqual(rig.names, [pe.name for pe in self.pose_estimations])
+        self.assertIs(rig.cameras[1], self.pose_estimations[1].device.geometry)
+        np.testing.assert_array_equal(rig.fundamental_matrices[0, 0], 0.0)
+        # the projections of the same 3D point satisfy the epipolar constraint x_j^T F x_i = 0 for every pair
+        ones = np.ones((40, 3, 1))
+        points = [np.append(pe.get_stacked_view().data[:], ones, axis=-1) for pe in self.pose_estimations]
+        for i, j in [(0, 1), (1, 0), (0, 2), (2, 1)]:
+            fundamental_matrix = rig.get_fundamental_matrix(self.pose_estimations[i].name, j)
+            residuals = np.einsum("...i,ij,...j->...", points[j], fundamental_matrix, points[i])
+            np.testing.assert_allclose(residuals, 0.0, atol=1e-6)
+            normalized = [points[k] @ np.linalg.inv(rig.cameras[k].intrinsic_matrix).T for k in (i, j)]
+            residuals = np.einsum("...i,ij,...j->...", normalized[1], rig.get_essential_matrix(i, j), normalized[0])
+            np.testing.assert_allclose(residuals, 0.0, atol=1e-9)
+
+        # changing the calibration of a camera rebuilds the rig
+        self.pose_estimations[2].device.translation_vector[0] = 5.0
+        self.assertIsNot(self.mcpe.camera_rig, rig)
+
+    def test_num_workers_in_memory_raises(self):
+        msg = (
+            "MultiCameraPoseEstimation 'MultiCameraPoseEstimation' must be read from an NWB file to be processed by "
+            "more than one worker. Set 'num_workers' to 1 to process it in this process."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            self.mcpe.triangulate(num_workers=2)
+        msg = "'num_workers' must be a positive integer or None, got 0."
+        with self.assertRaisesWith(ValueError, msg):
+            self.mcpe.triangulate(num_workers=0)
+
+
+class TestMultiCameraPoseEstimationReproject(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"], edges=np.array([[0, 1], [1, 2]], dtype="uint8"))
+        self.points = np.random.default_rng(0).normal(scale=50.0, size=(40, 3, 3))
+        self.pose_estimations = mock_projected_PoseEstimations(
+            nwbfile=self.nwbfile,
+            skeleton=self.skeleton,
+            points=self.points,
+            distortion_coefficients=np.array([-0.2, 0.05, 0.001, -0.002, 0.01]),
+        )
+        pose_estimation_series = [
+            mock_PoseEstimationSeries(name=node, data=self.points[:, j], unit="millimeters")
+            for j, node in enumerate(self.skeleton.nodes)
+        ]
+        self.mcpe = MultiCameraPoseEstimation(
+            pose_estimation_series=pose_estimation_series,
+            pose_estimations=self.pose_estimations,
+            skeleton=self.skeleton,
+        )
+
+    def test_distort_points(self):
+        points = np.array([[0.1, -0.2], [0.0, 0.0]])
+        np.testing.assert_array_equal(distort_points(points, None), points)
+        np.testing.assert_allclose(distort_points(points, [0.0, 0.0, 0.0, 0.0, 0.0]), points)
+        # k1 only: (x, y) * (1 + k1 * r^2) with r^2 = 0.05
+        np.testing.assert_allclose(distort_points(points, [0.5, 0.0, 0.0, 0.0]), points * 1.025)
+        # p1 only: x + 2 * p1 * x * y, y + p1 * (r^2 + 2 * y^2)
+        np.testing.assert_allclose(distort_points(points, [0.0, 0.0, 0.1, 0.0, 0.0]), [[0.096, -0.187], [0, 0]])
+        # rational model: k4 divides the radial factor
+        np.testing.assert_allclose(distort_points(points, [0, 0, 0, 0, 0, 1.0, 0, 0]), points / 1.05)
+        msg = "The radial-tangential distortion model takes 4, 5, or 8 distortion coefficients, got 3."
+        with self.assertRaisesWith(ValueError, msg):
+            distort_points(points, [0.1, 0.0, 0.0])
+
+    def test_reproject(self):
+        reprojections = self.mcpe.reproject(chunk_size=16)
+        self.assertEqual(list(reprojections), [pe.name for pe in self.pose_estimations])
+        for pose_estimation in self.pose_estimations:
+            reprojection = reprojections[pose_estimation.name]
+            np.testing.assert_allclose(reprojection.data, pose_estimation.get_stacked_view().data[:], atol=1e-9)
+            np.testing.assert_array_less(reprojection.error, 1e-9)
+
+    def test_reprojection_error(self):
+        self.pose_estimations[1].pose_estimation_series["tail"].data[5] += [3.0, 4.0]
+        self.pose_estimations[2].pose_estimation_series["nose"].data[7] = np.nan
+        error = self.mcpe.reproject()["PoseEstimation_camera2"].error
+        self.assertAlmostEqual(error[5, 2], 5.0)
+        error[5, 2] = 0.0
+        np.testing.assert_array_less(error, 1e-9)
+        error = self.mcpe.reproject()["PoseEstimation_camera3"].error
+        self.assertTrue(np.isnan(error[7, 0]))
+
+    def test_iter_reprojections(self):
+        blocks = list(self.mcpe.iter_reprojections(nodes=["tail", "nose"], chunk_size=15))
+        self.assertEqual([frames for frames, _ in blocks], [slice(0, 15), slice(15, 30), slice(30, 40)])
+        self.assertEqual(len(blocks[0][1]), 3)
+        expected = self.pose_estimations[0].get_stacked_view(nodes=["tail", "nose"]).data[15:30]
+        np.testing.assert_allclose(blocks[1][1][0].data, expected, atol=1e-9)
+
+    def test_reprojection_error_statistics(self):
+        rng = np.random.default_rng(2)
+        for pose_estimation in self.pose_estimations:
+            for series in pose_estimation.pose_estimation_series.values():
+                series.data[:] += rng.normal(scale=2.0, size=series.data.shape)
+        self.pose_estimations[1].pose_estimation_series["tail"].data[5] += [30.0, 40.0]
+        self.pose_estimations[2].pose_estimation_series["nose"].data[7] = np.nan
+        errors = np.stack([reprojection.error for reprojection in self.mcpe.reproject().values()])
+
+        statistics = self.mcpe.get_reprojection_error_statistics(chunk_size=16, percentiles=(50, 90))
+        columns = statistics.get_statistics()
+        self.assertEqual(columns["camera"][:4], ["PoseEstimation_camera1"] * 3 + ["PoseEstimation_camera2"])
+        self.assertEqual(columns["camera"][-3:], ["all"] * 3)
+        self.assertEqual(columns["node"][-3:], ["nose", "spine", "tail"])
+        np.testing.assert_array_equal(columns["num_frames"], [40] * 9 + [120] * 3)
+        np.testing.assert_array_equal(columns["num_missing"], [0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0])
+        # only the shifted tail in camera 2, frame 5 is more than 10 pixels off
+        np.testing.assert_array_equal(columns["num_outliers"], [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1])
+        cell_errors = [errors[c, :, j] for c in range(3) for j in range(3)]
+        all_errors = [errors[:, :, j] for j in range(3)]
+        for name, function in (("mean", np.nanmean), ("max", np.nanmax)):
+            np.testing.assert_allclose(columns[name], [function(e) for e in cell_errors + all_errors])
+        np.testing.assert_allclose(columns["rms"], [np.sqrt(np.nanmean(e**2)) for e in cell_errors + all_errors])
+        for q in (50, 90):
+            expected = [np.nanpercentile(e, q) for e in cell_errors + all_errors]
+            np.testing.assert_allclose(columns["percentile_%d" % q], expected, rtol=0.1)
+
+        table = statistics.to_table()
+        self.assertEqual(table.name, "reprojection_error")
+        self.assertEqual(len(table), 12)
+        self.assertEqual(table.colnames[-2:], ("percentile_50", "percentile_90"))
+
+
+class TestUndistortion(TestCase):
+    def setUp(self):
+        self.nwbfile = NWBFile(
+            session_description="session_description",
+            identifier="identifier",
+            session_start_time=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.skeleton = mock_Skeleton(nodes=["nose", "spine", "tail"], edges=np.array([[0, 1], [1, 2]], dtype="uint8"))
+        self.points = np.random.default_rng(0).normal(scale=50.0, size=(40, 3, 3))
+        self.distortion_coefficients = np.array([-0.3, 0.1, 0.001, -0.002, -0.02])
+        self.pose_estimations = mock_projected_PoseEstimations(
+            nwbfile=self.nwbfile,
+            skeleton=self.skeleton,
+            points=self.points,
+            distortion_coefficients=self.distortion_coefficients,
+        )
+        self.pose_estimation = self.pose_estimations[0]
+        camera = self.pose_estimation.device
+        self.expected = project_points(
+            self.points, camera.intrinsic_matrix @ np.column_stack([camera.rotation_matrix, camera.translation_vector])
+        )
+
+    def test_undistort_normalized_points(self):
+        points = np.random.default_rng(1).uniform(-0.6, 0.6, size=(100, 2))
+        for coefficients in (
+            [-0.3, 0.1, 0.001, -0.002],
+            [-0.3, 0.1, 0.001, -0.002, -0.02],
+            [0.1, 0.0, 0.0, 0.0, 0.0, 0.3, 0.05, 0.0],
+        ):
+            distorted = distort_points(points, coefficients)
+            np.testing.assert_allclose(undistort_normalized_points(distorted, coefficients), points, atol=1e-10)
+
+    def test_not_invertible_is_nan(self):
+        # with k1 = -1, the distorted radius r * (1 - r^2) is at most 0.385, so larger radii cannot be undistorted
+        undistorted = undistort_normalized_points(np.array([[0.2, 0.0], [0.5, 0.0], [np.nan, 0.0]]), [-1.0, 0, 0, 0])
+        self.assertAlmostEqual(undistorted[0, 0] * (1 - undistorted[0, 0] ** 2), 0.2)
+        self.assertTrue(np.isnan(undistorted[1:]).all())
+
+    def test_camera_undistort_points(self):
+        camera = self.pose_estimation.device
+        data = self.pose_estimation.pose_estimation_series["spine"].data
+        np.testing.assert_allclose(camera.undistort_points(data), self.expected[:, 1], atol=1e-6)
+        camera = mock_CalibratedCamera(nwbfile=self.nwbfile)  # all distortion coefficients are 0
+        np.testing.assert_array_equal(camera.undistort_points(data), data)
+
+    def test_undistorted_view(self):
+        view = self.pose_estimation.get_undistorted_view()
+        self.assertEqual(view.shape, (40, 3, 2))
+        np.testing.assert_allclose(view[:], self.expected, atol=1e-6)
+        np.testing.assert_allclose(view[5:10, 1, 0], self.expected[5:10, 1, 0], atol=1e-6)
+        np.testing.assert_allclose(view[[30, 2], ..., 1], self.expected[[30, 2], ..., 1], atol=1e-6)
+        blocks = [block for _, block in view.iter_chunks(chunk_size=16)]
+        np.testing.assert_allclose(np.concatenate(blocks), self.expected, atol=1e-6)
+
+    def test_uncalibrated_camera_raises(self):
+        pose_estimation = mock_PoseEstimation(nwbfile=self.nwbfile, add_to_nwbfile=False)
+        msg = "PoseEstimation 'PoseEstimation' must link to a CalibratedCamera to undistort its positions."
+        with self.assertRaisesWith(ValueError, msg):
+            pose_estimation.get_undistorted_view()
+
+    def test_triangulate_with_distortion(self):
+        mcpe = MultiCameraPoseEstimation(pose_estimations=self.pose_estimations, skeleton=self.skeleton)
+        result = mcpe.triangulate()
+        np.testing.assert_allclose(result.data, self.points, atol=1e-6)
+        np.testing.assert_array_less(result.reprojection_error, 1e-6)
@@ -8,6 +8,7 @@ from pynwb.spec import (
     NWBGroupSpec,
     NWBLinkSpec,
     NWBNamespaceBuilder,
+    NWBRefSpec,
 )
 
 
@@ -126,8 +127,11 @@ def main():
             ),
             NWBDatasetSpec(
                 name="confidence",
-                doc="Confidence or likelihood of the estimated positions, scaled to be between 0 and 1.",
-                dtype="float32",
+                doc=(
+                    "Confidence or likelihood of the estimated positions, scaled to be between 0 and 1. The values "
+                    "are floating point numbers, or unsigned integers if the 'scale' attribute is set."
+                ),
+                dtype="numeric",
                 dims=["num_frames"],
                 shape=[None],
                 attributes=[
@@ -140,6 +144,16 @@ def main():
                         ),
                         required=False,
                     ),
+                    NWBAttributeSpec(
+                        name="scale",
+                        dtype="float64",
+                        doc=(
+                            "Scale of confidence values stored as unsigned integers. The confidence is the stored "
+                            "value multiplied by 'scale'. The largest value of the integer type marks a missing "
+                            "(NaN) confidence value."
+                        ),
+                        required=False,
+                    ),
                 ],
             ),
         ],
@@ -408,6 +422,171 @@ def main():
         ],
     )
 
+    skeleton_instances_table = NWBGroupSpec(
+        neurodata_type_def="SkeletonInstancesTable",
+        neurodata_type_inc="DynamicTable",
+        doc=(
+            "Table that holds ground-truth pose data for many instances of skeletons, one instance per row. This "
+            "stores the same data as many SkeletonInstance groups in a few large datasets. This is meant to be "
+            "used within a TrainingFramesTable."
+        ),
+        default_name="skeleton_instances_table",
+        datasets=[
+            NWBDatasetSpec(
+                name="skeleton",
+                neurodata_type_inc="VectorData",
+                doc="Reference to the Skeleton that defines the layout of the nodes of each instance.",
+                dtype=NWBRefSpec(target_type="Skeleton", reftype="object"),
+                dims=["num_instances"],
+                shape=[None],
+            ),
+            NWBDatasetSpec(
+                name="node_locations",
+                neurodata_type_inc="VectorData",
+                doc=(
+                    "Locations (x, y) or (x, y, z) of the nodes of all instances, concatenated in row order. The "
+                    "locations of the nodes of each instance are indexed by 'node_locations_index'."
+                ),
+                dtype="float",
+                dims=[["num_nodes", "x, y"], ["num_nodes", "x, y, z"]],
+                shape=[[None, 2], [None, 3]],
+            ),
+            NWBDatasetSpec(
+                name="node_locations_index",
+                neurodata_type_inc="VectorIndex",
+                doc="Index into the 'node_locations' dataset.",
+                dims=["num_instances"],
+                shape=[None],
+            ),
+            NWBDatasetSpec(
+                name="node_visibility",
+                neurodata_type_inc="VectorData",
+                doc=(
+                    "Markers for node visibility of all instances, concatenated in row order, where true "
+                    "corresponds to a visible node and false corresponds to an occluded node."
+                ),
+                dtype="bool",
+                dims=["num_nodes"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="node_visibility_index",
+                neurodata_type_inc="VectorIndex",
+                doc="Index into the 'node_visibility' dataset.",
+                dims=["num_instances"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="instance_id",
+                neurodata_type_inc="VectorData",
+                doc="ID used to differentiate skeleton instances.",
+                dtype="uint8",
+                dims=["num_instances"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="instance_name",
+                neurodata_type_inc="VectorData",
+                doc="Name of each instance, unique within its training frame.",
+                dtype="text",
+                dims=["num_instances"],
+                shape=[None],
+                quantity="?",
+            ),
+        ],
+    )
+
+    training_frames_table = NWBGroupSpec(
+        neurodata_type_def="TrainingFramesTable",
+        neurodata_type_inc="DynamicTable",
+        doc=(
+            "Table that holds ground-truth position data for many training frames, one frame per row. This stores "
+            "the same data as a TrainingFrames group in a few large datasets, which is much faster to write and "
+            "read when there are many training frames."
+        ),
+        default_name="training_frames_table",
+        groups=[
+            NWBGroupSpec(
+                name="skeleton_instances_table",
+                neurodata_type_inc="SkeletonInstancesTable",
+                doc="Position data for the instances of skeletons in all training frames.",
+            ),
+        ],
+        datasets=[
+            NWBDatasetSpec(
+                name="skeleton_instances",
+                neurodata_type_inc="DynamicTableRegion",
+                doc=(
+                    "Rows of the 'skeleton_instances_table' table that hold the instances of skeletons in each "
+                    "training frame."
+                ),
+                dims=["num_instances"],
+                shape=[None],
+            ),
+            NWBDatasetSpec(
+                name="skeleton_instances_index",
+                neurodata_type_inc="VectorIndex",
+                doc="Index into the 'skeleton_instances' dataset.",
+                dims=["num_frames"],
+                shape=[None],
+            ),
+            NWBDatasetSpec(
+                name="frame_name",
+                neurodata_type_inc="VectorData",
+                doc="Name of each training frame.",
+                dtype="text",
+                dims=["num_frames"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="annotator",
+                neurodata_type_inc="VectorData",
+                doc="Name of annotator who labeled each training frame.",
+                dtype="text",
+                dims=["num_frames"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="source_video",
+                neurodata_type_inc="VectorData",
+                doc=(
+                    "Reference to the ImageSeries representing a video of training frames (stored internally or "
+                    "externally). Required if 'source_video_frame_index' is provided."
+                ),
+                dtype=NWBRefSpec(target_type="ImageSeries", reftype="object"),
+                dims=["num_frames"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="source_video_frame_index",
+                neurodata_type_inc="VectorData",
+                doc="Frame index of each training frame in 'source_video'.",
+                dtype="uint32",
+                dims=["num_frames"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="source_frame",
+                neurodata_type_inc="VectorData",
+                doc=(
+                    "Reference to an internally stored image representing each training frame. The target Image "
+                    "should be stored in an Images type in the file."
+                ),
+                dtype=NWBRefSpec(target_type="Image", reftype="object"),
+                dims=["num_frames"],
+                shape=[None],
+                quantity="?",
+            ),
+        ],
+    )
+
     pose_training = NWBGroupSpec(
         neurodata_type_def="PoseTraining",
         neurodata_type_inc="NWBDataInterface",
@@ -420,6 +599,15 @@ def main():
                 doc="Organizational group to hold training frames.",
                 quantity="?",
             ),
+            NWBGroupSpec(
+                name="training_frames_table",
+                neurodata_type_inc="TrainingFramesTable",
+                doc=(
+                    "Table of training frames. Use this instead of 'training_frames' to store many training frames "
+                    "compactly."
+                ),
+                quantity="?",
+            ),
             NWBGroupSpec(
                 name="source_videos",
                 neurodata_type_inc="SourceVideos",
@@ -558,6 +746,8 @@ def main():
         skeleton_instances,
         source_videos,
         skeletons,
+        skeleton_instances_table,
+        training_frames_table,
         pose_training,
         calibrated_camera,
         multi_camera_pose_estimation,